@@ -0,0 +1,249 @@
+"""전략 생성 HTTP API (Streamlit 없이 표준 라이브러리 http.server 로 실행)
+
+CRM 등 외부 시스템이 설문 응답(UserProfile JSON)을 보내면 StrategyEngine.match_strategy 결과를 바로 돌려줍니다.
+Streamlit 의 스크립트 리런을 거치지 않으므로 요청당 비용은 JSON 파싱, 검증, 전략 매칭 수준입니다.
+
+- POST /strategy            본문: profile_from_dict 형식의 JSON -> {"profile": ..., "strategy": ...}
+- POST /strategy?guide=md   가이드(txt/md/html/json)를 렌더링해 "guide" 로 함께 반환 (내용 해시 기준 캐시)
+- GET  /health              상태와 참조 데이터 버전
+
+검증에 실패하면 400 과 함께 {"errors": ["필드: 메시지", ...]} 를 반환합니다.
+연결은 HTTP/1.1 keep-alive 로 유지하고, 연결마다 스레드를 새로 만드는 대신 고정 크기 스레드 풀(워커)에서 처리합니다.
+워커 하나가 keep-alive 연결 하나를 맡으므로 워커 수가 동시 연결 수의 상한이고,
+KEEPALIVE_TIMEOUT 동안 요청이 없는 연결은 닫아 다음 연결에 워커를 넘깁니다.
+
+    python api.py --port 8600 --workers 32
+    python benchmarks/bench_api.py --connections 16      # 부하 테스트 (requests/sec, p99)
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import reference
+from core import (
+    BUDGET_OPTIONS, DIFFERENTIATION_OPTIONS, GENDER_OPTIONS, SURVEY_DATA, TIME_OPTIONS, TONE_KEYS, TOOL_OPTIONS,
+    StrategyEngine, profile_from_dict, profile_to_dict, strategy_to_dict
+)
+from guide import GUIDE_FORMATS, render_guide
+from telemetry import span
+
+DEFAULT_HOST = os.environ.get("BRANDING_API_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.environ.get("BRANDING_API_PORT", "8600"))
+DEFAULT_WORKERS = int(os.environ.get("BRANDING_API_WORKERS", "32"))
+KEEPALIVE_TIMEOUT = float(os.environ.get("BRANDING_API_KEEPALIVE", "15"))
+MAX_BODY_BYTES = 64 * 1024
+
+# 설문 화면(app.py)과 같은 제한
+MAX_PRIMARY_GOALS = 3
+MAX_COMPETITORS = 3
+TONE_RANGE = (1, 10)
+
+# 필드 -> (선택지, 필수 여부)
+CHOICE_FIELDS = {
+    "business_stage": (SURVEY_DATA["business_stages"], True),
+    "business_type": (SURVEY_DATA["business_types"], True),
+    "target_age_group": (SURVEY_DATA["age_groups"], True),
+    "brand_archetype": (SURVEY_DATA["brand_archetypes"], True),
+    "instagram_status": (SURVEY_DATA["instagram_statuses"], False),
+    "target_gender": (GENDER_OPTIONS, False),
+    "time_available": (TIME_OPTIONS, False),
+    "budget": (BUDGET_OPTIONS, False)
+}
+# 필드 -> (선택지, 최대 개수)
+MULTI_CHOICE_FIELDS = {
+    "primary_goals": (SURVEY_DATA["primary_goals"], MAX_PRIMARY_GOALS),
+    "differentiation": (DIFFERENTIATION_OPTIONS, None),
+    "tools_available": (TOOL_OPTIONS, None)
+}
+
+class ApiError(Exception):
+    def __init__(self, status: int, errors: List[str]):
+        super().__init__(status, errors)
+        self.status = status
+        self.errors = errors
+
+def _is_strings(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def validate_profile_data(data) -> List[str]:
+    """설문 응답 JSON 을 SURVEY_DATA 선택지와 대조해 오류 목록을 반환 (빈 목록이면 통과)"""
+    if not isinstance(data, dict):
+        return ["본문: JSON 객체여야 합니다"]
+    errors = []
+    for field, (options, required) in CHOICE_FIELDS.items():
+        if field not in data:
+            if required:
+                errors.append(f"{field}: 필수 항목입니다")
+        elif not isinstance(data[field], str):
+            errors.append(f"{field}: 문자열이어야 합니다")
+        elif data[field] not in options:
+            errors.append(f"{field}: 허용되지 않는 값 {data[field]!r} (선택지: {', '.join(options)})")
+
+    for field, (options, limit) in MULTI_CHOICE_FIELDS.items():
+        value = data.get(field, [])
+        if not _is_strings(value):
+            errors.append(f"{field}: 문자열 배열이어야 합니다")
+            continue
+        unknown = [item for item in value if item not in options]
+        if unknown:
+            errors.append(f"{field}: 허용되지 않는 값 {', '.join(map(repr, unknown))}")
+        if limit is not None and len(value) > limit:
+            errors.append(f"{field}: 최대 {limit}개까지 선택할 수 있습니다")
+
+    competitors = data.get("competitors", [])
+    if not _is_strings(competitors) or len(competitors) > MAX_COMPETITORS:
+        errors.append(f"competitors: 문자열 {MAX_COMPETITORS}개 이하의 배열이어야 합니다")
+
+    tone_scores = data.get("tone_scores", {})
+    if not isinstance(tone_scores, dict):
+        errors.append("tone_scores: 객체여야 합니다")
+    else:
+        low, high = TONE_RANGE
+        for key, score in tone_scores.items():
+            if key not in TONE_KEYS:
+                errors.append(f"tone_scores.{key}: 알 수 없는 항목 (항목: {', '.join(TONE_KEYS)})")
+            elif not isinstance(score, int) or isinstance(score, bool) or not low <= score <= high:
+                errors.append(f"tone_scores.{key}: {low}-{high} 사이의 정수여야 합니다")
+
+    for field in ("id", "created_at"):
+        if field in data and not (isinstance(data[field], str) and data[field]):
+            errors.append(f"{field}: 비어 있지 않은 문자열이어야 합니다")
+    return errors
+
+_engine = StrategyEngine()
+
+def generate(data: Dict, guide_format: str = None) -> Dict:
+    """검증된 설문 응답 -> 응답 본문 (프로필, 전략, 선택 시 가이드)"""
+    profile = profile_from_dict(data)
+    strategy = _engine.match_strategy(profile)
+    result = {"profile": profile_to_dict(profile), "strategy": strategy_to_dict(strategy)}
+    if guide_format:
+        with span(f"api.guide.{guide_format}"):
+            result["guide"] = {"format": guide_format, "content": render_guide(profile, strategy, guide_format)}
+    return result
+
+class PooledHTTPServer(HTTPServer):
+    """연결을 고정 크기 스레드 풀에서 처리하는 HTTP 서버 (ThreadingHTTPServer 는 연결마다 스레드 생성)"""
+    request_queue_size = 256
+
+    def __init__(self, address: Tuple[str, int], handler, workers: int = DEFAULT_WORKERS):
+        super().__init__(address, handler)
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+class StrategyRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server_version = "BrandingAPI/1.0"
+    timeout = KEEPALIVE_TIMEOUT
+    # 헤더와 본문을 따로 보내므로 Nagle 지연(keep-alive 에서 요청당 수십 ms)을 끔
+    disable_nagle_algorithm = True
+    access_log = False
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            return self._send_errors(ApiError(404, [f"{self.path}: 없는 경로입니다"]))
+        self._send_json(200, {"status": "ok", "reference_version": reference.current().version})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            # keep-alive 연결에 본문이 남지 않도록 경로와 관계없이 본문부터 읽음
+            data = self._read_json()
+            if url.path != "/strategy":
+                raise ApiError(404, [f"{url.path}: 없는 경로입니다"])
+            guide_format = parse_qs(url.query).get("guide", [None])[-1]
+            if guide_format is not None and guide_format not in GUIDE_FORMATS:
+                raise ApiError(400, [f"guide: 지원하지 않는 형식 {guide_format!r} (형식: {', '.join(GUIDE_FORMATS)})"])
+            errors = validate_profile_data(data)
+            if errors:
+                raise ApiError(400, errors)
+            with span("api.strategy"):
+                body = generate(data, guide_format)
+        except ApiError as e:
+            return self._send_errors(e)
+        except Exception as e:
+            self.log_error("전략 생성 실패: %s: %s", type(e).__name__, e)
+            return self._send_json(500, {"errors": [f"내부 오류: {type(e).__name__}"]})
+        self._send_json(200, body)
+
+    def _read_json(self):
+        # 본문을 읽지 못하면 연결을 재사용할 수 없으므로 응답 후 닫음
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.close_connection = True
+            raise ApiError(411, ["Content-Length 헤더가 필요합니다"])
+        if int(length) > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, [f"본문은 {MAX_BODY_BYTES:,}바이트 이하여야 합니다"])
+        try:
+            return json.loads(self.rfile.read(int(length)))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiError(400, [f"본문: JSON 을 해석할 수 없습니다 ({e})"])
+
+    def _send_errors(self, error: ApiError):
+        self._send_json(error.status, {"errors": error.errors})
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        # keep-alive 연결의 유휴 시간 초과("Request timed out")는 정상 종료이므로 기록하지 않음
+        if not format.startswith("Request timed out"):
+            super().log_message(format, *args)
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+                access_log: bool = False) -> PooledHTTPServer:
+    handler = type("Handler", (StrategyRequestHandler,), {"access_log": access_log})
+    return PooledHTTPServer((host, port), handler, workers)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="설문 응답으로 브랜딩 전략을 생성하는 HTTP API 를 실행합니다.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="워커 스레드 수 (동시 연결 상한)")
+    parser.add_argument("--access-log", action="store_true", help="요청마다 접근 로그 출력")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.access_log)
+    print(f"http://{args.host}:{server.server_address[1]} (워커 {args.workers}개)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,26 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+import importlib.util
+import sqlite3
 import uuid
 
-# Plotly import with fallback
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    st.warning("Plotly is not available. Some charts will be replaced with simple metrics.")
-
-# 페이지 설정
-st.set_page_config(
-    page_title="Instagram Branding Expert",
-    page_icon="📸",
-    layout="wide",
-    initial_sidebar_state="expanded"
+from core import (
+    UserProfile, SURVEY_DATA, STRATEGY_DEFINITIONS, StrategyEngine,
+    GENDER_OPTIONS, DIFFERENTIATION_OPTIONS, TIME_OPTIONS, BUDGET_OPTIONS, TOOL_OPTIONS, TONE_KEYS,
+    performance_standards_rows
 )
+from guide import GUIDE_FORMATS, render_guide
+import reference
+from store import ProfileStore
+import telemetry
+from telemetry import span, timed
+
+# pandas, plotly, numpy(scoring) 는 무거우므로 필요한 페이지에서만 임포트
+# (콜드 스타트 측정: python benchmarks/import_time.py)
+PLOTLY_AVAILABLE = importlib.util.find_spec("plotly") is not None
 
 # CSS 스타일링
-st.markdown("""
+APP_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #833AB4, #FD1D1D, #FCB045);
@@ -65,222 +62,124 @@ st.markdown("""
         border-left: 4px solid #FCB045;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# 데이터 클래스 정의
-@dataclass
-class UserProfile:
-    id: str
-    business_stage: str
-    business_type: str
-    instagram_status: str
-    target_age_group: str
-    target_gender: str
-    primary_goals: List[str]
-    brand_archetype: str
-    tone_scores: Dict[str, int]
-    competitors: List[str]
-    differentiation: List[str]
-    time_available: str
-    budget: str
-    tools_available: List[str]
-    created_at: str
+@st.cache_resource
+def get_store() -> ProfileStore:
+    # 모든 세션이 공유하는 영구 저장소 (연결은 스레드별로 열림)
+    return ProfileStore()
 
-@dataclass
-class BrandStrategy:
-    brand_type: str
-    strategy_name: str
-    content_pillars: List[str]
-    posting_frequency: Dict[str, int]
-    content_mix: Dict[str, int]
-    recommended_tools: List[str]
-    kpi_targets: Dict[str, float]
-    weekly_plans: List[Dict]
+# 성과 기준표는 KPI 평가(kpi.py)와 같은 등급 하한값에서 생성 (참조 데이터 팩의 performance 섹션, 재시작 시 반영)
+PERFORMANCE_STANDARDS = performance_standards_rows()
 
-# 설문 데이터 정의
-SURVEY_DATA = {
-    "business_stages": {
-        "idea": "아이디어 단계 (아직 런칭 전)",
-        "startup": "스타트업 (운영 1년 미만)", 
-        "growth": "성장기 (운영 1-3년)",
-        "mature": "안정기 (운영 3년 이상)"
-    },
-    
-    "business_types": {
-        "product": "제품 기반 비즈니스",
-        "service": "서비스 기반 비즈니스",
-        "digital": "디지털 제품/서비스",
-        "creator": "크리에이터/인플루언서",
-        "b2b": "B2B 비즈니스"
-    },
-    
-    "instagram_statuses": {
-        "none": "아직 계정이 없음",
-        "personal": "개인 계정 보유",
-        "business_small": "비즈니스 계정 (팔로워 100명 미만)",
-        "business_medium": "비즈니스 계정 (팔로워 100-1000명)",
-        "business_large": "비즈니스 계정 (팔로워 1000명 이상)"
-    },
-    
-    "age_groups": {
-        "18-24": "18-24세 (Gen Z)",
-        "25-34": "25-34세 (젊은 밀레니얼)",
-        "35-44": "35-44세 (기성 밀레니얼)",
-        "45-54": "45-54세 (Gen X)",
-        "55+": "55세 이상"
-    },
-    
-    "primary_goals": {
-        "awareness": "브랜드 인지도 향상",
-        "traffic": "웹사이트 트래픽 증가",
-        "leads": "리드 생성 및 잠재고객 확보",
-        "sales": "직접 판매 증대",
-        "community": "커뮤니티 구축 및 고객 충성도 향상",
-        "expertise": "산업 내 전문성 인정",
-        "partnerships": "인플루언서/파트너십 기회 창출"
-    },
-    
-    "brand_archetypes": {
-        "innocent": "The Innocent (순수함, 정직함)",
-        "sage": "The Sage (지혜로움, 전문성)",
-        "explorer": "The Explorer (모험적, 혁신적)",
-        "outlaw": "The Outlaw (반항적, 혁명적)",
-        "magician": "The Magician (변화 창조, 혁신)",
-        "hero": "The Hero (용기있는, 결단력)",
-        "lover": "The Lover (열정적, 로맨틱)",
-        "jester": "The Jester (재미있는, 유머러스)",
-        "everyman": "The Everyman (친근한, 접근 가능한)",
-        "caregiver": "The Caregiver (보살피는, 돌보는)",
-        "ruler": "The Ruler (권위적, 리더십)",
-        "creator": "The Creator (창의적, 예술적)"
-    }
-}
+# 정적 차트는 참조 데이터 팩 버전(내용 해시)당 한 번만 만들어 모든 세션이 같은 Figure 객체를 공유
+# 팩이 다시 읽히면 해시가 바뀌어 새 차트가 생성되고, 오래된 버전은 max_entries 로 밀려남
+@st.cache_resource(max_entries=4)
+@timed("chart.format_engagement")
+def format_engagement_figure(data_version: str, _pack: reference.ReferencePack):
+    import plotly.express as px
+    data = _pack.benchmarks["format_engagement"]
+    fig = px.bar(
+        x=list(data["포맷"]),
+        y=list(data["참여율"]),
+        title="콘텐츠 포맷별 평균 참여율",
+        color=list(data["참여율"]),
+        color_continuous_scale="Viridis"
+    )
+    fig.update_layout(height=300)
+    return fig
 
-# 전략 매칭 엔진
-class StrategyEngine:
-    def __init__(self):
-        self.strategies = {
-            "product_awareness": {
-                "brand_type": "Product-First Visual Brand",
-                "strategy_name": "인지도 우선 제품 브랜딩 전략",
-                "content_pillars": ["제품 소개", "고객 사용 사례", "비하인드 스토리", "교육적 콘텐츠", "브랜드 스토리"],
-                "posting_frequency": {"총_게시물": 12, "릴스": 8, "캐러셀": 3, "싱글포스트": 1},
-                "content_mix": {"릴스": 70, "캐러셀": 25, "싱글포스트": 5},
-                "recommended_tools": ["캔바 프로", "인스타그램 릴스", "해시태그 리서치 도구"],
-                "kpi_targets": {"팔로워_증가율": 15.0, "참여율": 0.8, "도달률": 25.0}
-            },
-            "service_expertise": {
-                "brand_type": "Expertise-Driven Authority Brand", 
-                "strategy_name": "전문성 중심 권위 브랜딩 전략",
-                "content_pillars": ["전문 지식 공유", "케이스 스터디", "업계 인사이트", "Q&A", "개인 스토리"],
-                "posting_frequency": {"총_게시물": 10, "릴스": 4, "캐러셀": 5, "싱글포스트": 1},
-                "content_mix": {"캐러셀": 50, "릴스": 40, "싱글포스트": 10},
-                "recommended_tools": ["링크드인 연동", "캔바", "스토리 하이라이트"],
-                "kpi_targets": {"팔로워_증가율": 10.0, "참여율": 1.2, "도달률": 20.0}
-            },
-            "creator_community": {
-                "brand_type": "Personal Storytelling Brand",
-                "strategy_name": "커뮤니티 중심 개인 브랜딩 전략", 
-                "content_pillars": ["일상 공유", "팔로워 인터랙션", "라이브 콘텐츠", "협업", "개인 성장"],
-                "posting_frequency": {"총_게시물": 14, "릴스": 6, "캐러셀": 4, "스토리": 20},
-                "content_mix": {"릴스": 45, "캐러셀": 30, "스토리": 25},
-                "recommended_tools": ["인스타그램 라이브", "스토리 인터랙션", "DM 자동화"],
-                "kpi_targets": {"팔로워_증가율": 20.0, "참여율": 1.5, "커뮤니티_활동": 30.0}
-            }
-        }
-    
-    def match_strategy(self, profile: UserProfile) -> BrandStrategy:
-        # 비즈니스 타입과 주요 목표를 기반으로 전략 매칭
-        key = f"{profile.business_type}_{profile.primary_goals[0] if profile.primary_goals else 'awareness'}"
-        
-        if key in self.strategies:
-            strategy_data = self.strategies[key]
-        else:
-            # 기본 전략
-            strategy_data = self.strategies["product_awareness"]
-        
-        # 주간 계획 생성
-        weekly_plans = self.generate_weekly_plans(profile, strategy_data)
-        
-        return BrandStrategy(
-            brand_type=strategy_data["brand_type"],
-            strategy_name=strategy_data["strategy_name"],
-            content_pillars=strategy_data["content_pillars"],
-            posting_frequency=strategy_data["posting_frequency"],
-            content_mix=strategy_data["content_mix"],
-            recommended_tools=strategy_data["recommended_tools"],
-            kpi_targets=strategy_data["kpi_targets"],
-            weekly_plans=weekly_plans
-        )
-    
-    def generate_weekly_plans(self, profile: UserProfile, strategy_data: Dict) -> List[Dict]:
-        plans = []
-        for week in range(1, 13):  # 12주 계획
-            if week <= 2:
-                phase = "브랜드 파운데이션"
-                tasks = [
-                    "인스타그램 비즈니스 계정 설정 및 최적화",
-                    "브랜드 아이덴티티 가이드 문서 작성",
-                    "경쟁사 분석 및 벤치마킹",
-                    "콘텐츠 필러 정의 및 스타일 가이드 작성"
-                ]
-            elif week <= 8:
-                phase = "콘텐츠 전략 실행"
-                tasks = [
-                    f"{strategy_data['posting_frequency']['총_게시물']}개 포스트 제작 및 게시",
-                    "스토리 인터랙티브 콘텐츠 일일 게시",
-                    "댓글 및 DM 응답 (24시간 내)",
-                    "주간 성과 분석 및 최적화"
-                ]
-            else:
-                phase = "성장 가속화"
-                tasks = [
-                    "유료 광고 캠페인 테스트 런칭",
-                    "인플루언서 협업 기획",
-                    "UGC 캠페인 실행",
-                    "크로스 플랫폼 콘텐츠 전략 구현"
-                ]
-            
-            plans.append({
-                "week": week,
-                "phase": phase,
-                "tasks": tasks,
-                "kpi_focus": list(strategy_data["kpi_targets"].keys())[0] if strategy_data["kpi_targets"] else "팔로워 증가"
-            })
-        
-        return plans
+@st.cache_resource(max_entries=4)
+@timed("chart.industry_engagement")
+def industry_engagement_figure(data_version: str, _pack: reference.ReferencePack):
+    import plotly.express as px
+    data = _pack.benchmarks["industries"]
+    return px.bar(
+        x=list(data["업계"]),
+        y=list(data["평균_참여율"]),
+        title="업계별 평균 참여율",
+        labels={'x': '업계', 'y': '참여율 (%)'}
+    )
 
-# 세션 상태 초기화
-if 'survey_completed' not in st.session_state:
-    st.session_state.survey_completed = False
-if 'user_profile' not in st.session_state:
-    st.session_state.user_profile = None
-if 'strategy' not in st.session_state:
-    st.session_state.strategy = None
+@st.cache_resource(max_entries=4)
+@timed("chart.followers_engagement")
+def followers_engagement_figure(data_version: str, _pack: reference.ReferencePack):
+    import plotly.express as px
+    data = _pack.benchmarks["industries"]
+    fig = px.scatter(
+        x=list(data["평균_팔로워"]),
+        y=list(data["평균_참여율"]),
+        text=list(data["업계"]),
+        title="팔로워 수 vs 참여율",
+        labels={'x': '평균 팔로워 수', 'y': '참여율 (%)'}
+    )
+    fig.update_traces(textposition="top center")
+    return fig
+
+@st.cache_resource
+def performance_standards_table(data_version: str):
+    import pandas as pd
+    return pd.DataFrame(PERFORMANCE_STANDARDS)
+
+def init_session_state():
+    # 세션 상태 초기화
+    if 'survey_completed' not in st.session_state:
+        st.session_state.survey_completed = False
+    if 'user_profile' not in st.session_state:
+        st.session_state.user_profile = None
+    if 'strategy' not in st.session_state:
+        st.session_state.strategy = None
+    
+    # 새로고침이나 서버 재시작 후에는 URL 의 프로필 ID 로 저장된 결과를 복원
+    if st.session_state.user_profile is None and "pid" in st.query_params:
+        saved = get_store().get(st.query_params["pid"])
+        if saved is not None and saved[1] is not None:
+            st.session_state.user_profile, st.session_state.strategy = saved
+            st.session_state.survey_completed = True
 
 # 메인 앱
 def main():
+    # 페이지 설정 (가장 먼저 호출되어야 하는 Streamlit 명령)
+    st.set_page_config(
+        page_title="Instagram Branding Expert",
+        page_icon="📸",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+    init_session_state()
+    
+    if not PLOTLY_AVAILABLE:
+        st.warning("Plotly is not available. Some charts will be replaced with simple metrics.")
+    
     st.markdown('<h1 class="main-header">📸 Instagram Branding Expert</h1>', unsafe_allow_html=True)
     st.markdown("### 🚀 세계 최고의 SNS 브랜딩 전문가가 당신의 인스타그램 브랜딩을 도와드립니다")
     
     # 사이드바 네비게이션
     st.sidebar.title("📋 Navigation")
-    page = st.sidebar.selectbox(
-        "페이지 선택",
-        ["🏠 홈", "📝 브랜딩 설문조사", "📊 결과 및 전략", "📈 성과 대시보드", "📚 리소스"]
-    )
+    pages = ["🏠 홈", "📝 브랜딩 설문조사", "📊 결과 및 전략", "📈 성과 대시보드", "🗂️ 포트폴리오", "📚 리소스"]
+    # 진단 페이지는 계측이 켜져 있을 때만 노출 (BRANDING_TELEMETRY=1)
+    if telemetry.ENABLED:
+        pages.append("🩺 진단")
+    page = st.sidebar.selectbox("페이지 선택", pages)
     
-    if page == "🏠 홈":
-        show_home()
-    elif page == "📝 브랜딩 설문조사":
-        show_survey()
-    elif page == "📊 결과 및 전략":
-        show_results()
-    elif page == "📈 성과 대시보드":
-        show_dashboard()
-    elif page == "📚 리소스":
-        show_resources()
+    with span("main.dispatch"):
+        if page == "🏠 홈":
+            show_home()
+        elif page == "📝 브랜딩 설문조사":
+            show_survey()
+        elif page == "📊 결과 및 전략":
+            show_results()
+        elif page == "📈 성과 대시보드":
+            show_dashboard()
+        elif page == "🗂️ 포트폴리오":
+            show_portfolio()
+        elif page == "📚 리소스":
+            show_resources()
+        elif page == "🩺 진단":
+            show_diagnostics()
 
+@timed("page.show_home")
 def show_home():
     col1, col2 = st.columns([2, 1])
     
@@ -307,21 +206,11 @@ def show_home():
         st.markdown("### 📊 플랫폼 현황 (2024-2025)")
         
         # 성과 지표 시각화
-        metrics_data = {
-            "포맷": ["캐러셀", "릴스", "스토리", "싱글포스트"],
-            "참여율": [0.55, 0.50, 0.35, 0.25]
-        }
+        pack = reference.current()
+        metrics_data = pack.benchmarks["format_engagement"]
         
         if PLOTLY_AVAILABLE:
-            fig = px.bar(
-                x=metrics_data["포맷"],
-                y=metrics_data["참여율"],
-                title="콘텐츠 포맷별 평균 참여율",
-                color=metrics_data["참여율"],
-                color_continuous_scale="Viridis"
-            )
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(format_engagement_figure(pack.digest, pack), use_container_width=True)
         else:
             st.markdown("#### 📊 콘텐츠 포맷별 평균 참여율")
             for format_type, rate in zip(metrics_data["포맷"], metrics_data["참여율"]):
@@ -329,184 +218,283 @@ def show_home():
         
         st.info("💡 **인사이트**: 캐러셀 포스트가 가장 높은 참여율을 보여주며, 스토리텔링에 최적화된 포맷입니다.")
 
-def show_survey():
-    st.markdown('<div class="section-header"><h2>📝 인스타그램 브랜딩 정밀 진단</h2></div>', unsafe_allow_html=True)
+# 설문 문항별 선택지와 기본값 (초안 복원 시 저장된 값이 아직 유효한지 확인하는 데도 사용)
+SURVEY_OPTIONS = {
+    "business_stage": list(SURVEY_DATA["business_stages"]),
+    "business_type": list(SURVEY_DATA["business_types"]),
+    "instagram_status": list(SURVEY_DATA["instagram_statuses"]),
+    "primary_goals": list(SURVEY_DATA["primary_goals"]),
+    "target_age_group": list(SURVEY_DATA["age_groups"]),
+    "target_gender": GENDER_OPTIONS,
+    "brand_archetype": list(SURVEY_DATA["brand_archetypes"]),
+    "differentiation": DIFFERENTIATION_OPTIONS,
+    "time_available": TIME_OPTIONS,
+    "budget": BUDGET_OPTIONS,
+    "tools_available": TOOL_OPTIONS
+}
+SURVEY_DEFAULTS = {
+    **{key: options[0] for key, options in SURVEY_OPTIONS.items()},
+    "primary_goals": [],
+    "target_gender": "균등 분포",
+    "differentiation": [],
+    "tools_available": [],
+    **{key: 5 for key in TONE_KEYS},
+    **{f"competitor_{i}": "" for i in range(3)}
+}
+MAX_PRIMARY_GOALS = 3
+
+def _survey_basics():
+    st.selectbox(
+        "현재 비즈니스 단계는?",
+        options=SURVEY_OPTIONS["business_stage"],
+        format_func=lambda x: SURVEY_DATA["business_stages"][x],
+        key="business_stage"
+    )
+    st.selectbox(
+        "주요 사업 분야는?",
+        options=SURVEY_OPTIONS["business_type"],
+        format_func=lambda x: SURVEY_DATA["business_types"][x],
+        key="business_type"
+    )
+    st.selectbox(
+        "인스타그램 계정 현재 상태는?",
+        options=SURVEY_OPTIONS["instagram_status"],
+        format_func=lambda x: SURVEY_DATA["instagram_statuses"][x],
+        key="instagram_status"
+    )
+
+def _survey_goals():
+    st.multiselect(
+        "인스타그램을 통해 달성하고 싶은 주요 목표는? (우선순위별로 3개 선택)",
+        options=SURVEY_OPTIONS["primary_goals"],
+        format_func=lambda x: SURVEY_DATA["primary_goals"][x],
+        max_selections=MAX_PRIMARY_GOALS,
+        key="primary_goals"
+    )
+
+def _survey_audience():
+    st.selectbox(
+        "주요 타겟 고객의 연령대는?",
+        options=SURVEY_OPTIONS["target_age_group"],
+        format_func=lambda x: SURVEY_DATA["age_groups"][x],
+        key="target_age_group"
+    )
+    st.select_slider("타겟 고객의 성별 분포는?", options=GENDER_OPTIONS, key="target_gender")
+
+def _survey_identity():
+    st.selectbox(
+        "브랜드가 속하는 아키타입은?",
+        options=SURVEY_OPTIONS["brand_archetype"],
+        format_func=lambda x: SURVEY_DATA["brand_archetypes"][x],
+        key="brand_archetype"
+    )
+    
+    # 브랜드 톤앤보이스 슬라이더
+    st.markdown("**브랜드 톤앤보이스의 특성을 설정해주세요:**")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.slider("공식적 ↔ 캐주얼", 1, 10, key="formal_casual")
+        st.slider("진지함 ↔ 재미있음", 1, 10, key="serious_fun")
+    with col2:
+        st.slider("정중함 ↔ 과감함", 1, 10, key="polite_bold")
+        st.slider("사실적 ↔ 열정적", 1, 10, key="factual_passionate")
+
+def _survey_competitors():
+    for i in range(3):
+        st.text_input(f"주요 경쟁사 {i+1}의 인스타그램 계정명", key=f"competitor_{i}")
+    st.multiselect("경쟁사 대비 차별화 포인트는?", DIFFERENTIATION_OPTIONS, key="differentiation")
+
+def _survey_resources():
+    st.selectbox("주간 인스타그램 콘텐츠 제작에 투입 가능한 시간은?", TIME_OPTIONS, key="time_available")
+    st.selectbox("월간 인스타그램 마케팅 예산은?", BUDGET_OPTIONS, key="budget")
+    st.multiselect("현재 보유한 콘텐츠 제작 도구는?", TOOL_OPTIONS, key="tools_available")
+
+# (제목, 그리는 함수, 해당 단계의 위젯 키)
+SURVEY_STEPS = [
+    ("🏢 섹션 1: 브랜드 기본 정보", _survey_basics, ("business_stage", "business_type", "instagram_status")),
+    ("🎯 섹션 2: 목표 및 우선순위", _survey_goals, ("primary_goals",)),
+    ("👥 섹션 3: 타겟 오디언스 분석", _survey_audience, ("target_age_group", "target_gender")),
+    ("🎨 섹션 4: 브랜드 아이덴티티", _survey_identity, ("brand_archetype",) + TONE_KEYS),
+    ("🏆 섹션 5: 경쟁사 및 차별화", _survey_competitors, ("competitor_0", "competitor_1", "competitor_2", "differentiation")),
+    ("💼 섹션 6: 리소스 및 실행 역량", _survey_resources, ("time_available", "budget", "tools_available"))
+]
+
+@st.cache_resource
+def get_draft_autosaver():
+    # 모든 세션의 초안 변경을 모아 주기적으로 한 번에 기록 (오래된 초안은 시작 시 정리)
+    from store import DraftAutosaver
+    store = get_store()
+    store.purge_drafts()
+    return DraftAutosaver(store)
+
+def _valid_answer(key: str, value) -> bool:
+    default = SURVEY_DEFAULTS[key]
+    if type(value) is not type(default):
+        return False
+    if key in TONE_KEYS:
+        return 1 <= value <= 10
+    options = SURVEY_OPTIONS.get(key)
+    if options is None:
+        return True
+    if isinstance(value, list):
+        return all(item in options for item in value) and (key != "primary_goals" or len(value) <= MAX_PRIMARY_GOALS)
+    return value in options
+
+def init_survey_draft():
+    """설문 초안 상태 준비 (URL 의 ?draft= 로 저장된 초안이 있으면 이어서 작성)"""
+    if "survey_draft" in st.session_state:
+        return
+    
+    draft_id, step, answers = st.query_params.get("draft"), 0, {}
+    saved = None
+    if draft_id:
+        try:
+            saved = get_draft_autosaver().get(draft_id)
+        except sqlite3.Error:
+            saved = None
+    if saved is not None:
+        step, data = saved
+        answers = {key: value for key, value in data.items() if key in SURVEY_DEFAULTS and _valid_answer(key, value)}
+    else:
+        draft_id = str(uuid.uuid4())
+    
+    st.session_state.survey_draft_id = draft_id
+    st.session_state.survey_step = min(max(int(step), 0), len(SURVEY_STEPS) - 1)
+    st.session_state.survey_draft = {**SURVEY_DEFAULTS, **answers}
+    st.session_state.survey_saved = (st.session_state.survey_step, dict(st.session_state.survey_draft))
+
+def _sync_survey_step(step: int):
+    # 위젯 값을 초안으로 옮김 (다른 단계로 가면 이 단계의 위젯 상태는 Streamlit 이 지움)
+    draft = st.session_state.survey_draft
+    for key in SURVEY_STEPS[step][2]:
+        if key in st.session_state:
+            value = st.session_state[key]
+            draft[key] = list(value) if isinstance(value, list) else value
+
+def _go_to_step(current: int, target: int):
+    _sync_survey_step(current)
+    st.session_state.survey_step = target
+
+def _autosave_survey_draft():
+    """바뀐 내용이 있을 때만 자동 저장 대기열에 넣음 (실제 기록은 백그라운드에서 모아서)"""
+    snapshot = (st.session_state.survey_step, dict(st.session_state.survey_draft))
+    if snapshot == st.session_state.survey_saved:
+        return
+    try:
+        get_draft_autosaver().put(st.session_state.survey_draft_id, *snapshot)
+    except sqlite3.Error:
+        return
+    st.session_state.survey_saved = snapshot
+    if st.query_params.get("draft") != st.session_state.survey_draft_id:
+        st.query_params["draft"] = st.session_state.survey_draft_id
+
+def submit_survey():
+    draft = st.session_state.survey_draft
+    
+    # 필수 필드 검증
+    if not all(draft[key] for key in ("business_stage", "business_type", "target_age_group", "brand_archetype")):
+        st.error("모든 필수 항목을 입력해주세요.")
+        return
+    
+    # 사용자 프로필 생성
+    user_profile = UserProfile(
+        id=str(uuid.uuid4()),
+        business_stage=draft["business_stage"],
+        business_type=draft["business_type"],
+        instagram_status=draft["instagram_status"],
+        target_age_group=draft["target_age_group"],
+        target_gender=draft["target_gender"],
+        primary_goals=draft["primary_goals"],
+        brand_archetype=draft["brand_archetype"],
+        tone_scores={key: draft[key] for key in TONE_KEYS},
+        competitors=[draft[f"competitor_{i}"] for i in range(3) if draft[f"competitor_{i}"]],
+        differentiation=draft["differentiation"],
+        time_available=draft["time_available"],
+        budget=draft["budget"],
+        tools_available=draft["tools_available"],
+        created_at=datetime.now().isoformat()
+    )
+    
+    # 전략 생성
+    engine = StrategyEngine()
+    with span("engine.match_strategy"):
+        strategy = engine.match_strategy(user_profile)
+    
+    # 세션에 저장
+    st.session_state.user_profile = user_profile
+    st.session_state.strategy = strategy
+    st.session_state.survey_completed = True
+    
+    # 저장소에 기록하고 URL 에 프로필 ID 를 남겨 다시 열 수 있게 함
+    try:
+        get_store().save(user_profile, strategy)
+        st.query_params["pid"] = user_profile.id
+    except sqlite3.Error as e:
+        st.warning(f"결과를 저장하지 못했습니다. 이 세션에서만 확인할 수 있습니다. ({e})")
+    else:
+        # 유사 브랜드 색인에 바로 추가 (다음 고객의 결과 페이지부터 비교 대상)
+        get_similarity_index().add([user_profile])
+    
+    # 제출한 초안은 지우고, 이후 수정은 새 초안으로 저장
+    try:
+        get_draft_autosaver().discard(st.session_state.survey_draft_id)
+    except sqlite3.Error:
+        pass
+    st.query_params.pop("draft", None)
+    st.session_state.survey_draft_id = str(uuid.uuid4())
+    
+    st.success("🎉 브랜딩 전략이 성공적으로 생성되었습니다!")
+    st.info("📊 '결과 및 전략' 페이지에서 맞춤형 가이드를 확인하세요.")
+
+@st.fragment
+@timed("fragment.survey_step")
+def survey_wizard():
+    """현재 단계만 그리는 설문 조각 (단계 안의 입력과 이동은 이 조각만 다시 실행)"""
+    step = st.session_state.survey_step
+    title, render, keys = SURVEY_STEPS[step]
     
     # 진행률 표시
-    progress = st.progress(0)
-    progress_text = st.empty()
+    st.progress((step + 1) / len(SURVEY_STEPS), text=f"{step + 1} / {len(SURVEY_STEPS)} 단계 · {title}")
     
-    with st.form("branding_survey"):
-        # 섹션 1: 브랜드 기본 정보
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 🏢 섹션 1: 브랜드 기본 정보")
-        
-        business_stage = st.selectbox(
-            "현재 비즈니스 단계는?",
-            options=list(SURVEY_DATA["business_stages"].keys()),
-            format_func=lambda x: SURVEY_DATA["business_stages"][x],
-            key="business_stage"
-        )
-        
-        business_type = st.selectbox(
-            "주요 사업 분야는?",
-            options=list(SURVEY_DATA["business_types"].keys()),
-            format_func=lambda x: SURVEY_DATA["business_types"][x],
-            key="business_type"
-        )
-        
-        instagram_status = st.selectbox(
-            "인스타그램 계정 현재 상태는?",
-            options=list(SURVEY_DATA["instagram_statuses"].keys()),
-            format_func=lambda x: SURVEY_DATA["instagram_statuses"][x],
-            key="instagram_status"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # 섹션 2: 목표 및 우선순위
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 🎯 섹션 2: 목표 및 우선순위")
-        
-        primary_goals = st.multiselect(
-            "인스타그램을 통해 달성하고 싶은 주요 목표는? (우선순위별로 3개 선택)",
-            options=list(SURVEY_DATA["primary_goals"].keys()),
-            format_func=lambda x: SURVEY_DATA["primary_goals"][x],
-            max_selections=3,
-            key="primary_goals"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # 섹션 3: 타겟 오디언스
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 👥 섹션 3: 타겟 오디언스 분석")
-        
-        target_age_group = st.selectbox(
-            "주요 타겟 고객의 연령대는?",
-            options=list(SURVEY_DATA["age_groups"].keys()),
-            format_func=lambda x: SURVEY_DATA["age_groups"][x],
-            key="target_age_group"
-        )
-        
-        target_gender = st.select_slider(
-            "타겟 고객의 성별 분포는?",
-            options=["주로 여성", "여성 중심", "균등 분포", "남성 중심", "주로 남성"],
-            value="균등 분포",
-            key="target_gender"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # 섹션 4: 브랜드 아이덴티티
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 🎨 섹션 4: 브랜드 아이덴티티")
-        
-        brand_archetype = st.selectbox(
-            "브랜드가 속하는 아키타입은?",
-            options=list(SURVEY_DATA["brand_archetypes"].keys()),
-            format_func=lambda x: SURVEY_DATA["brand_archetypes"][x],
-            key="brand_archetype"
-        )
-        
-        # 브랜드 톤앤보이스 슬라이더
-        st.markdown("**브랜드 톤앤보이스의 특성을 설정해주세요:**")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            formal_casual = st.slider("공식적 ↔ 캐주얼", 1, 10, 5, key="formal_casual")
-            serious_fun = st.slider("진지함 ↔ 재미있음", 1, 10, 5, key="serious_fun")
-        with col2:
-            polite_bold = st.slider("정중함 ↔ 과감함", 1, 10, 5, key="polite_bold")
-            factual_passionate = st.slider("사실적 ↔ 열정적", 1, 10, 5, key="factual_passionate")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # 섹션 5: 경쟁사 분석
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 🏆 섹션 5: 경쟁사 및 차별화")
-        
-        competitors = []
-        for i in range(3):
-            competitor = st.text_input(f"주요 경쟁사 {i+1}의 인스타그램 계정명", key=f"competitor_{i}")
-            if competitor:
-                competitors.append(competitor)
-        
-        differentiation = st.multiselect(
-            "경쟁사 대비 차별화 포인트는?",
-            ["더 나은 품질/성능", "더 저렴한 가격", "더 우수한 고객 서비스", 
-             "더 혁신적인 기술/접근법", "더 강한 브랜드 스토리", "더 전문적인 expertise",
-             "더 개인적인/친근한 접근", "더 지속가능한/윤리적 접근"],
-            key="differentiation"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # 섹션 6: 리소스 평가
-        st.markdown('<div class="survey-question">', unsafe_allow_html=True)
-        st.markdown("### 💼 섹션 6: 리소스 및 실행 역량")
-        
-        time_available = st.selectbox(
-            "주간 인스타그램 콘텐츠 제작에 투입 가능한 시간은?",
-            ["2시간 미만", "2-5시간", "5-10시간", "10-20시간", "20시간 이상"],
-            key="time_available"
-        )
-        
-        budget = st.selectbox(
-            "월간 인스타그램 마케팅 예산은?",
-            ["예산 없음", "10만원 미만", "10-30만원", "30-50만원", "50-100만원", "100만원 이상"],
-            key="budget"
-        )
-        
-        tools_available = st.multiselect(
-            "현재 보유한 콘텐츠 제작 도구는?",
-            ["스마트폰 카메라", "전문 카메라", "조명 장비", "편집 소프트웨어", 
-             "디자인 도구", "비디오 편집 도구"],
-            key="tools_available"
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
-        
+    # 위젯 상태가 없으면(처음이거나 다른 단계에서 돌아옴) 초안 값으로 채움
+    draft = st.session_state.survey_draft
+    for key in keys:
+        if key not in st.session_state:
+            st.session_state[key] = draft[key]
+    
+    st.markdown('<div class="survey-question">', unsafe_allow_html=True)
+    st.markdown(f"### {title}")
+    render()
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    _sync_survey_step(step)
+    _autosave_survey_draft()
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.button("◀ 이전", disabled=step == 0, on_click=_go_to_step, args=(step, step - 1), key="survey_prev")
+    with col2:
+        if step < len(SURVEY_STEPS) - 1:
+            st.button("다음 ▶", on_click=_go_to_step, args=(step, step + 1), key="survey_next")
+    with col3:
         # 제출 버튼
-        submitted = st.form_submit_button("🎯 브랜딩 전략 생성하기", type="primary")
-        
-        if submitted:
-            # 필수 필드 검증
-            if not all([business_stage, business_type, target_age_group, brand_archetype]):
-                st.error("모든 필수 항목을 입력해주세요.")
-                return
-            
-            # 사용자 프로필 생성
-            user_profile = UserProfile(
-                id=str(uuid.uuid4()),
-                business_stage=business_stage,
-                business_type=business_type,
-                instagram_status=instagram_status,
-                target_age_group=target_age_group,
-                target_gender=target_gender,
-                primary_goals=primary_goals,
-                brand_archetype=brand_archetype,
-                tone_scores={
-                    "formal_casual": formal_casual,
-                    "serious_fun": serious_fun,
-                    "polite_bold": polite_bold,
-                    "factual_passionate": factual_passionate
-                },
-                competitors=competitors,
-                differentiation=differentiation,
-                time_available=time_available,
-                budget=budget,
-                tools_available=tools_available,
-                created_at=datetime.now().isoformat()
-            )
-            
-            # 전략 생성
-            engine = StrategyEngine()
-            strategy = engine.match_strategy(user_profile)
-            
-            # 세션에 저장
-            st.session_state.user_profile = user_profile
-            st.session_state.strategy = strategy
-            st.session_state.survey_completed = True
-            
-            st.success("🎉 브랜딩 전략이 성공적으로 생성되었습니다!")
-            st.info("📊 '결과 및 전략' 페이지에서 맞춤형 가이드를 확인하세요.")
+        if step == len(SURVEY_STEPS) - 1 and st.button("🎯 브랜딩 전략 생성하기", type="primary"):
+            submit_survey()
+
+@timed("page.show_survey")
+def show_survey():
+    st.markdown('<div class="section-header"><h2>📝 인스타그램 브랜딩 정밀 진단</h2></div>', unsafe_allow_html=True)
+    init_survey_draft()
+    survey_wizard()
+
+@st.cache_resource
+def get_strategy_scorer():
+    # 가중치 행렬은 프로세스당 한 번만 컴파일해 모든 세션이 공유
+    from scoring import StrategyScorer
+    return StrategyScorer()
 
+@timed("page.show_results")
 def show_results():
     if not st.session_state.survey_completed:
         st.warning("먼저 브랜딩 설문조사를 완료해주세요.")
@@ -531,12 +519,14 @@ def show_results():
     with col2:
         st.markdown("### 📊 콘텐츠 믹스 비율")
         if PLOTLY_AVAILABLE:
-            fig = px.pie(
-                values=list(strategy.content_mix.values()),
-                names=list(strategy.content_mix.keys()),
-                title="권장 콘텐츠 구성"
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
+            import plotly.express as px
+            with span("chart.content_mix"):
+                fig = px.pie(
+                    values=list(strategy.content_mix.values()),
+                    names=list(strategy.content_mix.keys()),
+                    title="권장 콘텐츠 구성"
+                )
+                fig.update_traces(textposition='inside', textinfo='percent+label')
             st.plotly_chart(fig, use_container_width=True)
         else:
             for content_type, percentage in strategy.content_mix.items():
@@ -545,15 +535,45 @@ def show_results():
     # KPI 목표 설정
     st.markdown("### 🎯 주요 성과 지표 (KPI) 목표")
     
+    # 12주 계획을 시뮬레이션한 목표 달성 확률 (인사이트 데이터가 있으면 계정의 과거 변동성 반영)
+    probability = account_projection(profile, strategy).target_probability
     kpi_cols = st.columns(len(strategy.kpi_targets))
     for i, (kpi, target) in enumerate(strategy.kpi_targets.items()):
         with kpi_cols[i]:
             st.metric(
                 label=kpi.replace("_", " ").title(),
                 value=f"{target}{'%' if kpi != '참여율' else '%'}",
-                delta="목표값"
+                delta=f"목표값 · 달성 확률 {probability[kpi]:.0%}" if kpi in probability else "목표값"
             )
     
+    # 목표 수준을 같은 업종·규모 계정과 비교
+    st.markdown("### 🏅 업계 벤치마크 대비 목표 수준")
+    st.caption("전략의 KPI 목표와 게시 계획이 같은 비즈니스 유형·팔로워 규모 계정들 사이에서 어느 위치인지 보여줍니다.")
+    from industry_benchmarks import profile_band, strategy_metrics
+    show_benchmark_ranks(strategy_metrics(strategy), profile.business_type, profile_band(profile))
+    
+    # 다요인 전략 적합도
+    st.markdown("### 🧭 전략 적합도 분석")
+    st.caption("비즈니스 단계, 아키타입, 예산, 가용 시간, 톤앤보이스까지 반영한 전략별 적합도 점수입니다.")
+    
+    ranked = get_strategy_scorer().rank([profile], k=3)[0]
+    fit_cols = st.columns(len(ranked))
+    for i, (strategy_key, score) in enumerate(ranked):
+        with fit_cols[i]:
+            st.metric(
+                label=f"{i + 1}위",
+                value=STRATEGY_DEFINITIONS[strategy_key]["strategy_name"],
+                delta=f"적합도 {score:.2f}",
+                delta_color="off"
+            )
+    
+    # 비슷한 프로필의 이전 고객 사례
+    show_similar_brands(profile)
+    
+    # 경쟁사 비교
+    if profile.competitors:
+        show_competitor_analysis(profile)
+    
     # 주간 실행 계획
     st.markdown("### 📅 12주 실행 로드맵")
     
@@ -561,28 +581,55 @@ def show_results():
     tab1, tab2, tab3 = st.tabs(["🏗️ 파운데이션 (1-2주)", "🚀 실행 (3-8주)", "📈 성장 (9-12주)"])
     
     with tab1:
-        foundation_weeks = [plan for plan in strategy.weekly_plans if plan["week"] <= 2]
+        foundation_weeks = [plan for plan in strategy.weekly_plans if plan.week <= 2]
         for week_plan in foundation_weeks:
-            with st.expander(f"Week {week_plan['week']}: {week_plan['phase']}"):
-                for task in week_plan['tasks']:
+            with st.expander(f"Week {week_plan.week}: {week_plan.phase}"):
+                for task in week_plan.tasks:
                     st.markdown(f"- [ ] {task}")
-                st.markdown(f"**🎯 주요 KPI**: {week_plan['kpi_focus']}")
+                st.markdown(f"**🎯 주요 KPI**: {week_plan.kpi_focus}")
     
     with tab2:
-        execution_weeks = [plan for plan in strategy.weekly_plans if 3 <= plan["week"] <= 8]
+        execution_weeks = [plan for plan in strategy.weekly_plans if 3 <= plan.week <= 8]
         for week_plan in execution_weeks:
-            with st.expander(f"Week {week_plan['week']}: {week_plan['phase']}"):
-                for task in week_plan['tasks']:
+            with st.expander(f"Week {week_plan.week}: {week_plan.phase}"):
+                for task in week_plan.tasks:
                     st.markdown(f"- [ ] {task}")
-                st.markdown(f"**🎯 주요 KPI**: {week_plan['kpi_focus']}")
+                st.markdown(f"**🎯 주요 KPI**: {week_plan.kpi_focus}")
     
     with tab3:
-        growth_weeks = [plan for plan in strategy.weekly_plans if plan["week"] >= 9]
+        growth_weeks = [plan for plan in strategy.weekly_plans if plan.week >= 9]
         for week_plan in growth_weeks:
-            with st.expander(f"Week {week_plan['week']}: {week_plan['phase']}"):
-                for task in week_plan['tasks']:
+            with st.expander(f"Week {week_plan.week}: {week_plan.phase}"):
+                for task in week_plan.tasks:
                     st.markdown(f"- [ ] {task}")
-                st.markdown(f"**🎯 주요 KPI**: {week_plan['kpi_focus']}")
+                st.markdown(f"**🎯 주요 KPI**: {week_plan.kpi_focus}")
+    
+    # 날짜가 붙은 게시 일정 (주간 게시 수와 콘텐츠 필러를 설문 제출 다음 날부터 배치)
+    st.markdown("### 📆 콘텐츠 캘린더")
+    from content_calendar import build_calendar, calendar_csv, calendar_ics
+    calendar = build_calendar(profile, strategy)
+    first_week = [row for row in calendar.rows() if row[0] == 1]
+    st.caption(f"12주 동안 {len(calendar)}개의 게시 슬롯 · 첫 주 일정")
+    st.dataframe(
+        [{"날짜": f"{date} ({weekday})", "시간": slot_time, "포맷": content_format, "콘텐츠 필러": pillar}
+         for _, date, slot_time, weekday, content_format, pillar in first_week],
+        hide_index=True, use_container_width=True
+    )
+    cal_col1, cal_col2 = st.columns(2)
+    with cal_col1:
+        st.download_button(
+            label="📅 캘린더 앱으로 가져오기 (ICS)",
+            data=lambda: calendar_ics(calendar),
+            file_name=f"content_calendar_{profile.id[:8]}.ics",
+            mime="text/calendar"
+        )
+    with cal_col2:
+        st.download_button(
+            label="📊 스프레드시트로 받기 (CSV)",
+            data=lambda: "\ufeff" + calendar_csv(calendar),
+            file_name=f"content_calendar_{profile.id[:8]}.csv",
+            mime="text/csv"
+        )
     
     # 권장 도구 및 리소스
     st.markdown("### 🛠️ 권장 도구 및 리소스")
@@ -595,213 +642,514 @@ def show_results():
     # 개인화된 브랜드 가이드 다운로드
     st.markdown("### 📄 브랜드 가이드 문서")
     
-    brand_guide = generate_brand_guide(profile, strategy)
+    guide_format = st.radio(
+        "문서 형식",
+        options=list(GUIDE_FORMATS),
+        format_func=lambda x: GUIDE_FORMATS[x][0],
+        horizontal=True,
+        key="guide_format"
+    )
+    _, mime, extension = GUIDE_FORMATS[guide_format]
+    
+    # 가이드는 다운로드를 누를 때만 생성 (내용 해시 기준으로 캐시됨)
+    def build_guide_file():
+        with span(f"guide.render.{guide_format}"):
+            return render_guide(profile, strategy, guide_format)
     
     st.download_button(
         label="📥 맞춤형 브랜드 가이드 다운로드",
-        data=brand_guide,
-        file_name=f"instagram_brand_guide_{profile.id[:8]}.txt",
-        mime="text/plain"
+        data=build_guide_file,
+        file_name=f"instagram_brand_guide_{profile.id[:8]}.{extension}",
+        mime=mime
     )
 
-def generate_brand_guide(profile: UserProfile, strategy: BrandStrategy) -> str:
-    """브랜드 가이드 문서 생성"""
-    guide = f"""
-📸 INSTAGRAM 브랜딩 가이드
-생성일: {datetime.now().strftime('%Y-%m-%d')}
-브랜드 ID: {profile.id[:8]}
-
-{'='*50}
-🎯 브랜드 전략 개요
-{'='*50}
-
-브랜드 타입: {strategy.brand_type}
-전략명: {strategy.strategy_name}
-비즈니스 단계: {SURVEY_DATA['business_stages'][profile.business_stage]}
-사업 분야: {SURVEY_DATA['business_types'][profile.business_type]}
-
-{'='*50}
-👥 타겟 오디언스
-{'='*50}
-
-연령대: {SURVEY_DATA['age_groups'][profile.target_age_group]}
-성별 분포: {profile.target_gender}
-주요 목표: {', '.join([SURVEY_DATA['primary_goals'][goal] for goal in profile.primary_goals])}
-
-{'='*50}
-🎨 브랜드 아이덴티티
-{'='*50}
-
-브랜드 아키타입: {SURVEY_DATA['brand_archetypes'][profile.brand_archetype]}
-
-브랜드 톤앤보이스:
-- 공식적(1) ←→ 캐주얼(10): {profile.tone_scores['formal_casual']}/10
-- 진지함(1) ←→ 재미있음(10): {profile.tone_scores['serious_fun']}/10  
-- 정중함(1) ←→ 과감함(10): {profile.tone_scores['polite_bold']}/10
-- 사실적(1) ←→ 열정적(10): {profile.tone_scores['factual_passionate']}/10
-
-{'='*50}
-📋 콘텐츠 전략
-{'='*50}
-
-콘텐츠 필러:
-{chr(10).join([f"{i+1}. {pillar}" for i, pillar in enumerate(strategy.content_pillars)])}
+SIMILAR_CANDIDATES = 30
+SIMILAR_SHOWN = 5
 
-콘텐츠 믹스 비율:
-{chr(10).join([f"- {format}: {ratio}%" for format, ratio in strategy.content_mix.items()])}
+@st.cache_resource
+def get_similarity_index():
+    # 저장된 모든 프로필을 한 번 벡터화해 모든 세션이 공유 (이후 설문 제출은 증분 추가)
+    from similarity import build_index
+    return build_index(get_store().iter_profiles(5000))
 
-월간 게시 빈도:
-{chr(10).join([f"- {format}: {freq}개" for format, freq in strategy.posting_frequency.items()])}
-
-{'='*50}
-🎯 성과 목표 (KPI)
-{'='*50}
-
-{chr(10).join([f"- {kpi.replace('_', ' ').title()}: {target}%" for kpi, target in strategy.kpi_targets.items()])}
-
-{'='*50}
-🛠️ 권장 도구
-{'='*50}
-
-{chr(10).join([f"- {tool}" for tool in strategy.recommended_tools])}
+def show_similar_brands(profile):
+    """설문 응답이 비슷한 이전 고객이 받은 전략과 성과 (성과 데이터가 있는 고객 우선)"""
+    from collections import Counter
+    from portfolio import tier_label
+    
+    st.markdown("### 🤝 비슷한 브랜드 사례")
+    index = get_similarity_index()
+    with span("similarity.search"):
+        found = index.similar([profile], k=SIMILAR_CANDIDATES)[0]
+    outcomes = get_store().profile_outcomes([profile_id for profile_id, _ in found])
+    matches = [(score, outcomes[profile_id]) for profile_id, score in found if profile_id in outcomes]
+    if not matches:
+        st.caption("아직 비교할 다른 고객 프로필이 없습니다.")
+        return
+    
+    tracked = [(score, outcome) for score, outcome in matches if outcome["attainment"] is not None]
+    shown = (tracked or matches)[:SIMILAR_SHOWN]
+    st.caption(
+        f"설문 응답이 가장 비슷한 고객 {len(matches)}명 중 "
+        + (f"성과 데이터가 있는 {len(tracked)}명을 유사도 순으로 보여줍니다." if tracked
+           else "아직 성과 데이터가 있는 고객이 없어 유사도 순으로 보여줍니다.")
+    )
+    st.dataframe(
+        [
+            {
+                "유사도": f"{score:.0%}",
+                "비즈니스 유형": SURVEY_DATA["business_types"].get(outcome["business_type"], outcome["business_type"]),
+                "단계": SURVEY_DATA["business_stages"].get(outcome["business_stage"], outcome["business_stage"]),
+                "아키타입": SURVEY_DATA["brand_archetypes"].get(outcome["brand_archetype"], outcome["brand_archetype"]),
+                "받은 전략": outcome["strategy_name"] or "-",
+                "KPI 달성률": "-" if outcome["attainment"] is None else f"{outcome['attainment']:.0f}%",
+                "성과 등급": tier_label(outcome["tier"]),
+                "팔로워 증가율": "-" if outcome["follower_growth"] is None else f"{outcome['follower_growth']:.1f}%"
+            }
+            for score, outcome in shown
+        ],
+        hide_index=True, use_container_width=True
+    )
+    # 우수/양호 등급 유사 고객이 가장 많이 받은 전략
+    successful = Counter(outcome["strategy_name"] for _, outcome in tracked
+                         if outcome["tier"] is not None and outcome["tier"] <= 1 and outcome["strategy_name"])
+    if successful:
+        name, count = successful.most_common(1)[0]
+        st.info(f"💡 성과가 좋은 유사 고객 {sum(successful.values())}명 중 {count}명이 **{name}** 을(를) 받았습니다.")
 
-{'='*50}
-💼 리소스 현황
-{'='*50}
+@st.cache_resource
+def get_benchmark_index():
+    # 세그먼트별 정렬 배열과 분위수는 프로세스당 한 번 적재해 모든 세션이 공유
+    from industry_benchmarks import load_index
+    return load_index()
 
-가용 시간: {profile.time_available}/주
-예산: {profile.budget}/월
-보유 도구: {', '.join(profile.tools_available) if profile.tools_available else '없음'}
+def benchmark_band_figure(index, ranks, industry, band):
+    """지표별 p10-p90 / p25-p75 밴드와 중앙값, 사용자 위치를 백분위 축에 표시 (분위수는 색인에 미리 계산됨)"""
+    import plotly.graph_objects as go
+    from industry_benchmarks import METRIC_UNITS
+    labels = [rank.metric.replace("_", " ") for rank in ranks]
+    quantiles = [index.bands(rank.metric, industry, band) for rank in ranks]
+    band_text = [
+        f"p10 {q[10]:.1f}{METRIC_UNITS[r.metric]} · p25 {q[25]:.1f} · 중앙값 {q[50]:.1f} · p75 {q[75]:.1f} · p90 {q[90]:.1f}"
+        for r, q in zip(ranks, quantiles)
+    ]
+    fig = go.Figure()
+    fig.add_bar(y=labels, x=[80] * len(ranks), base=10, orientation="h", name="p10-p90",
+                marker_color="rgba(131, 58, 180, 0.18)", hovertext=band_text, hoverinfo="text")
+    fig.add_bar(y=labels, x=[50] * len(ranks), base=25, orientation="h", name="p25-p75",
+                marker_color="rgba(131, 58, 180, 0.40)", hovertext=band_text, hoverinfo="text")
+    fig.add_scatter(y=labels, x=[50] * len(ranks), mode="markers", name="중앙값",
+                    marker=dict(symbol="line-ns-open", size=22, color="#833AB4"), hoverinfo="skip")
+    fig.add_scatter(
+        y=labels, x=[rank.percentile for rank in ranks], mode="markers+text", name="내 위치",
+        marker=dict(symbol="diamond", size=14, color="#FCB045"),
+        text=[f"{round(rank.value, 1):g}{METRIC_UNITS[rank.metric]}" for rank in ranks], textposition="top center",
+        hovertext=[f"백분위 {rank.percentile:.1f} ({rank.segment}, {rank.peers:,}개 계정)" for rank in ranks],
+        hoverinfo="text"
+    )
+    fig.update_layout(barmode="overlay", height=90 + 60 * len(ranks), margin=dict(t=30, b=30),
+                      xaxis=dict(range=[0, 100], title="백분위"), legend=dict(orientation="h", y=-0.35))
+    return fig
 
-{'='*50}
-🏆 경쟁사 분석
-{'='*50}
+def show_benchmark_ranks(metrics, industry, band):
+    """지표 값들의 업계 백분위와 백분위 밴드 차트"""
+    from industry_benchmarks import METRIC_UNITS, QUANTILES
+    index = get_benchmark_index()
+    with span("benchmarks.rank"):
+        ranks = index.rank_metrics(metrics, industry, band)
+    if not ranks:
+        st.caption("비교할 벤치마크 데이터가 없습니다.")
+        return
+    
+    for col, rank in zip(st.columns(len(ranks)), ranks):
+        with col:
+            st.metric(
+                label=rank.metric.replace("_", " "),
+                value=f"상위 {rank.top:.0f}%",
+                delta=f"{round(rank.value, 1):g}{METRIC_UNITS[rank.metric]} · 백분위 {rank.percentile:.0f}",
+                delta_color="off"
+            )
+            st.caption(f"{rank.segment} · {rank.peers:,}개 계정")
+    
+    if PLOTLY_AVAILABLE:
+        with span("chart.benchmark_bands"):
+            fig = benchmark_band_figure(index, ranks, industry, band)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.dataframe(
+            [{"지표": rank.metric.replace("_", " "), "내 값": rank.value,
+              **{f"p{q}": round(value, 2) for q, value in index.bands(rank.metric, industry, band).items()}}
+             for rank in ranks],
+            hide_index=True, use_container_width=True
+        )
+    st.caption(f"벤치마크 데이터: {index.source} · 밴드는 p{QUANTILES[0]}-p{QUANTILES[-1]}, p25-p75 구간")
 
-주요 경쟁사: {', '.join(profile.competitors) if profile.competitors else '미지정'}
-차별화 포인트: {', '.join(profile.differentiation) if profile.differentiation else '미지정'}
+@st.cache_resource
+def get_competitor_fetcher():
+    # 속도 제한기와 TTL 캐시를 모든 세션이 공유 (공급원이 설정되지 않았으면 None)
+    from competitors import CompetitorFetcher, source_from_env
+    source = source_from_env()
+    return CompetitorFetcher(source) if source is not None else None
 
-{'='*50}
-📅 주간 실행 계획 (처음 4주)
-{'='*50}
+@st.fragment
+@timed("fragment.competitor_analysis")
+def show_competitor_analysis(profile):
+    """설문에서 입력한 경쟁사 계정의 공개 프로필 지표 (모든 계정을 동시에 조회)"""
+    st.markdown("### 🏆 경쟁사 비교")
+    
+    fetcher = get_competitor_fetcher()
+    if fetcher is None:
+        st.caption(f"입력한 경쟁사: {', '.join(profile.competitors)} "
+                   "(지표 조회는 BRANDING_COMPETITOR_SOURCE 에 데이터 공급원을 설정하면 표시됩니다)")
+        return
+    
+    with span("competitors.fetch"):
+        results = fetcher.fetch_all(profile.competitors)
+    rows = [
+        {
+            "계정": f"@{stats.handle}",
+            "팔로워": stats.followers,
+            "게시물": stats.posts,
+            "평균 좋아요": stats.avg_likes,
+            "평균 댓글": stats.avg_comments,
+            "참여율 (%)": stats.engagement_rate
+        }
+        for stats in results if stats.ok
+    ]
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    for stats in results:
+        if not stats.ok:
+            st.caption(f"⚠️ @{stats.handle}: {stats.error}")
+    if not results:
+        st.caption("인스타그램 계정명 형식의 경쟁사가 없습니다.")
 
-{chr(10).join([f"""
-Week {plan['week']}: {plan['phase']}
-목표: {plan['kpi_focus']}
-할 일:
-{chr(10).join([f"  - {task}" for task in plan['tasks']])}
-""" for plan in strategy.weekly_plans[:4]])}
+@st.cache_resource
+def get_insights_store():
+    from insights import InsightsStore
+    return InsightsStore()
 
-{'='*50}
-💡 성공을 위한 핵심 팁
-{'='*50}
+@st.cache_resource
+def get_recommendation_engine():
+    from recommend import RecommendationEngine
+    return RecommendationEngine()
 
-1. 일관성 유지: 시각적 스타일과 브랜드 보이스를 모든 콘텐츠에서 일관되게 유지하세요.
+# 가져온 인사이트 데이터가 없을 때 보여주는 예시 권장사항
+SAMPLE_RECOMMENDATIONS = [
+    {
+        "우선순위": "높음",
+        "영역": "콘텐츠 최적화", 
+        "권장사항": "릴스 콘텐츠 비중을 50%로 확대하여 도달률 20% 향상 예상",
+        "예상효과": "+20% 도달률"
+    },
+    {
+        "우선순위": "중간",
+        "영역": "참여 증대",
+        "권장사항": "캐러셀 포스트에 인터랙티브 요소 추가 (폴, 퀴즈 등)",
+        "예상효과": "+15% 참여율"
+    },
+    {
+        "우선순위": "중간", 
+        "영역": "트래픽 전환",
+        "권장사항": "스토리 하이라이트에 링크 추가 및 바이오 링크 최적화",
+        "예상효과": "+25% 웹사이트 클릭"
+    }
+]
 
-2. 참여 우선: 좋아요보다는 댓글, 저장, 공유를 유도하는 콘텐츠에 집중하세요.
+@st.cache_resource
+def get_rollup_engine():
+    from rollup import RollupEngine
+    return RollupEngine(get_insights_store())
 
-3. 스토리 활용: 일상적이고 진정성 있는 모습을 스토리로 꾸준히 공유하세요.
+@st.cache_resource
+def get_projection_engine():
+    # (프로필, 전략, 시드, 과거 통계)별 전망을 모든 세션이 공유하는 LRU 캐시에 보관
+    from projection import ProjectionEngine
+    return ProjectionEngine()
 
-4. 데이터 기반 의사결정: 주간 인사이트를 반드시 확인하고 전략을 조정하세요.
+def account_projection(profile, strategy):
+    """계정의 주별 롤업(없으면 설문 기반 사전값)으로 12주 전망"""
+    from projection import history_from_series
+    account = profile.id
+    weekly = get_rollup_engine().series(account, "week") if get_insights_store().has_data(account, "daily") else None
+    history = history_from_series(weekly, profile)
+    with span("projection.simulate"):
+        return get_projection_engine().project(profile, strategy, history)
 
-5. 커뮤니티 중심: 팔로워와의 진정한 소통과 관계 구축에 집중하세요.
+def projection_band_figure(projection, metric: str, title: str, unit: str, target: float = None):
+    """p10-p90 밴드 + 중앙값 선 (목표가 있으면 점선으로 표시)"""
+    import plotly.graph_objects as go
+    band = projection.band(metric)
+    weeks = [f"{week}주" for week in projection.weeks]
+    fig = go.Figure()
+    fig.add_scatter(x=weeks, y=band[90], mode="lines", line=dict(width=0), name="p90", hoverinfo="skip", showlegend=False)
+    fig.add_scatter(x=weeks, y=band[10], mode="lines", line=dict(width=0), fill="tonexty",
+                    fillcolor="rgba(131, 58, 180, 0.2)", name="p10-p90")
+    fig.add_scatter(x=weeks, y=band[50], mode="lines+markers", line=dict(color="#833AB4"), name="중앙값")
+    if target is not None:
+        fig.add_hline(y=target, line_dash="dot", line_color="#FCB045", annotation_text=f"목표 {target:g}{unit}")
+    fig.update_layout(title=title, height=320, margin=dict(t=50, b=30), hovermode="x unified",
+                      yaxis_title=unit, legend=dict(orientation="h", y=-0.2))
+    return fig
 
-{'='*50}
-📞 지원 및 문의
-{'='*50}
+def show_projection(profile, strategy):
+    import pandas as pd
+    from projection import QUANTILES
+    
+    projection = account_projection(profile, strategy)
+    history = projection.history
+    st.markdown("### 🔮 12주 성장 전망")
+    source = (f"최근 {history.weeks}주 인사이트의 변동성" if history.weeks
+              else "설문 응답 기반 사전값 (인사이트를 가져오면 계정의 실제 변동성으로 바뀝니다)")
+    st.caption(f"게시 계획, 콘텐츠 믹스, 12주 단계와 {source}으로 {projection.simulations:,}개 궤적을 시뮬레이션한 "
+               f"p{QUANTILES[0]} / p{QUANTILES[1]} / p{QUANTILES[2]} 범위입니다.")
+    
+    # 계정이 아직 없으면 팔로워 전망 없이 참여율만 표시
+    metrics = ["followers", "engagement"] if projection.has_followers else ["engagement"]
+    if not projection.has_followers:
+        st.info("아직 인스타그램 계정이 없어 팔로워 전망은 표시하지 않습니다. "
+                "계정을 만들고 인사이트를 가져오면 실제 팔로워 수에서 시작하는 전망으로 바뀝니다.")
+    cols = iter(st.columns(2 * projection.has_followers + len(projection.target_probability) or 1))
+    if projection.has_followers:
+        followers_end = projection.followers[:, -1]
+        with next(cols):
+            st.metric("12주 후 팔로워 (중앙값)", f"{followers_end[1]:,.0f}",
+                      delta=f"{followers_end[1] - history.followers:+,.0f}")
+        with next(cols):
+            st.metric("12주 후 팔로워 범위", f"{followers_end[0]:,.0f} - {followers_end[2]:,.0f}")
+    for col, (kpi, probability) in zip(cols, projection.target_probability.items()):
+        with col:
+            st.metric(f"{kpi.replace('_', ' ')} 목표 달성 확률", f"{probability:.0%}",
+                      delta=f"목표 {strategy.kpi_targets[kpi]:g}%", delta_color="off")
+    
+    charts = {
+        "followers": ("팔로워 전망", "명", None),
+        "engagement": ("주간 참여율 전망", "%", strategy.kpi_targets.get("참여율"))
+    }
+    for col, metric in zip(st.columns(2), metrics):
+        title, unit, target = charts[metric]
+        with col:
+            if PLOTLY_AVAILABLE:
+                with span("chart.projection"):
+                    fig = projection_band_figure(projection, metric, title, unit, target)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.markdown(f"#### {title}")
+                st.line_chart(pd.DataFrame({f"p{q}": values for q, values in projection.band(metric).items()},
+                                           index=projection.weeks))
 
-이 가이드는 Instagram Branding Expert 시스템에서 생성되었습니다.
-추가 문의사항이나 전략 조정이 필요한 경우 언제든 새로운 분석을 실행하세요.
+def _format_change(current: float, previous: float, unit: str = "", precision: int = 0) -> str:
+    diff = current - previous
+    pct = (diff / previous * 100) if previous else 0.0
+    return f"{diff:,.{precision}f}{unit} ({pct:+.1f}%)"
 
-생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-    return guide
+def dashboard_kpis(series):
+    """롤업 시계열의 마지막 버킷과 직전 버킷을 비교한 KPI (라벨, 값, 변화량) 목록"""
+    # 마지막 버킷이 아직 채워지는 중이면(직전 버킷보다 일수가 적음) 완료된 버킷끼리 비교
+    if len(series) > 2 and series["days"].iloc[-1] < series["days"].iloc[-2]:
+        series = series.iloc[:-1]
+    current = series.iloc[-1]
+    previous = series.iloc[-2] if len(series) > 1 else current
+    
+    followers_now, followers_before = int(current["followers"]), int(previous["followers"])
+    rate_now, rate_before = float(current["engagement_rate"]), float(previous["engagement_rate"])
+    reach_now, reach_before = int(current["reach"]), int(previous["reach"])
+    clicks_now, clicks_before = int(current["website_clicks"]), int(previous["website_clicks"])
+    return [
+        ("팔로워 수", f"{followers_now:,}", _format_change(followers_now, followers_before)),
+        ("참여율", f"{rate_now:.1f}%", _format_change(rate_now, rate_before, "%", 1)),
+        ("도달률", f"{reach_now:,}", _format_change(reach_now, reach_before)),
+        ("웹사이트 클릭", f"{clicks_now:,}", _format_change(clicks_now, clicks_before))
+    ]
 
+@timed("page.show_dashboard")
 def show_dashboard():
+    import pandas as pd
+    if PLOTLY_AVAILABLE:
+        import plotly.express as px
+    
     st.markdown('<div class="section-header"><h2>📈 성과 대시보드</h2></div>', unsafe_allow_html=True)
     
     if not st.session_state.survey_completed:
         st.warning("먼저 브랜딩 설문조사를 완료해주세요.")
         return
     
-    # 가상 성과 데이터 (실제 구현시 Instagram API 연동)
+    profile = st.session_state.user_profile
+    insights = get_insights_store()
+    rollups = get_rollup_engine()
+    # 인사이트 데이터는 프로필 ID 를 계정 키로 저장
+    account = profile.id
+    
+    with st.expander("📥 인스타그램 인사이트 데이터 가져오기"):
+        kind = st.radio(
+            "데이터 종류",
+            options=["daily", "posts"],
+            format_func=lambda x: {"daily": "일별 계정 지표", "posts": "게시물별 지표"}[x],
+            horizontal=True,
+            key="insights_kind"
+        )
+        uploaded = st.file_uploader("인사이트 내보내기 파일 (CSV / JSON Lines / JSON 배열)", type=["csv", "jsonl", "json"])
+        if uploaded is not None and st.button("가져오기", key="insights_ingest"):
+            try:
+                rows = insights.ingest(account, uploaded, kind)
+                if kind == "daily":
+                    rollups.refresh(account)
+                    # 포트폴리오의 성과 요약도 이 고객만 바로 갱신
+                    from portfolio import refresh_accounts
+                    refresh_accounts(get_store(), insights, rollups, [account])
+                st.success(f"{rows:,}행을 가져왔습니다.")
+            except ValueError as e:
+                st.error(f"파일을 읽을 수 없습니다: {e}")
+    
+    # 일별 지표는 전체 이력 대신 증분 롤업 버킷만 읽는다
+    series = None
+    date_range = rollups.date_range(account) if insights.has_data(account, "daily") else None
+    if date_range is not None:
+        from rollup import RESOLUTIONS
+        from downsample import resolution_for_range
+        first, last = date_range
+        range_col, resolution_col = st.columns([3, 1])
+        with range_col:
+            start, end = st.slider(
+                "조회 기간",
+                min_value=first,
+                max_value=max(last, first + timedelta(days=1)),
+                value=(first, last),
+                format="YYYY-MM-DD",
+                key="dashboard_range"
+            )
+        with resolution_col:
+            resolution = st.selectbox(
+                "집계 단위",
+                options=["auto"] + list(RESOLUTIONS),
+                format_func=lambda x: "자동" if x == "auto" else RESOLUTIONS[x],
+                key="dashboard_resolution"
+            )
+        # 자동: 보이는 기간이 길수록 큰 버킷을 사용
+        if resolution == "auto":
+            resolution = resolution_for_range(start, end)
+        series = rollups.series(account, resolution, start, end)
+        if not len(series):
+            series = None
+    posts = insights.load_frame(account, "posts") if insights.has_data(account, "posts") else None
+    
     st.markdown("### 📊 실시간 성과 모니터링")
+    if series is None:
+        st.info("💡 아직 가져온 인사이트 데이터가 없어 샘플 데이터를 표시합니다. 위에서 인사이트 내보내기 파일을 가져오세요.")
+        kpis = [
+            ("팔로워 수", "1,234", "156 (+14.5%)"),
+            ("참여율", "2.3%", "0.5% (+27.8%)"),
+            ("도달률", "15,678", "2,345 (+17.6%)"),
+            ("웹사이트 클릭", "89", "23 (+34.8%)")
+        ]
+    else:
+        kpis = dashboard_kpis(series)
     
     # KPI 메트릭
-    col1, col2, col3, col4 = st.columns(4)
+    for col, (label, value, delta) in zip(st.columns(4), kpis):
+        with col:
+            st.metric(
+                label=label,
+                value=value,
+                delta=delta,
+                delta_color="normal"
+            )
     
-    with col1:
-        st.metric(
-            label="팔로워 수", 
-            value="1,234", 
-            delta="156 (+14.5%)",
-            delta_color="normal"
-        )
+    # KPI 달성도와 권장사항이 함께 쓰는 계정 지표 (최근 월 롤업 + 최근 게시물)
+    actual = None
+    if series is not None or posts is not None:
+        from recommend import account_metrics
+        month_series = rollups.series(account, "month", start, end) if series is not None else None
+        actual = account_metrics(month_series, posts, st.session_state.strategy)
     
-    with col2:
-        st.metric(
-            label="참여율", 
-            value="2.3%", 
-            delta="0.5% (+27.8%)",
-            delta_color="normal"
-        )
+    # 전략 KPI 목표 대비 달성도 (최근 월 기준)
+    if actual is not None:
+        from kpi import evaluate
+        metrics = [metric for metric in st.session_state.strategy.kpi_targets if metric in actual]
+        if metrics:
+            st.markdown("#### 🎯 KPI 목표 달성 현황 (최근 월)")
+            evaluation = evaluate({metric: [actual[metric]] for metric in metrics}, [st.session_state.strategy])
+            tiers = evaluation.tier_labels()[0]
+            for j, (col, metric) in enumerate(zip(st.columns(len(metrics)), metrics)):
+                with col:
+                    st.metric(
+                        label=metric.replace("_", " "),
+                        value=f"{evaluation.actual[0, j]:.1f}%",
+                        delta=f"목표 {evaluation.targets[0, j]:g}% 대비 {evaluation.attainment[0, j]:.0f}%",
+                        delta_color="off"
+                    )
+                    st.caption(f"성과 등급: {tiers[j]}")
     
-    with col3:
-        st.metric(
-            label="도달률", 
-            value="15,678", 
-            delta="2,345 (+17.6%)",
-            delta_color="normal"
-        )
+    # 같은 업종·팔로워 구간 계정 대비 백분위 (팔로워 수는 롤업의 최근 값, 게시 빈도는 최근 게시물 기준)
+    if actual is not None:
+        from industry_benchmarks import follower_band, monthly_posts, profile_band
+        current = dict(actual)
+        posts_per_month = monthly_posts(posts)
+        if posts_per_month is not None:
+            current["월간_게시물"] = posts_per_month
+        band = int(follower_band([series["followers"].iloc[-1]])[0]) if series is not None else profile_band(profile)
+        st.markdown("#### 🏅 업계 벤치마크 대비 위치")
+        show_benchmark_ranks(current, profile.business_type, band)
     
-    with col4:
-        st.metric(
-            label="웹사이트 클릭", 
-            value="89", 
-            delta="23 (+34.8%)",
-            delta_color="normal"
-        )
+    # 12주 계획 몬테카를로 전망
+    show_projection(profile, st.session_state.strategy)
     
     # 성과 차트
     col1, col2 = st.columns(2)
     
     with col1:
         # 팔로워 성장 추이
-        if PLOTLY_AVAILABLE:
+        if series is not None:
+            # 화면 폭에 맞는 점 수로 줄인 뒤 그림을 만든다 (웹소켓 페이로드 절감)
+            from downsample import downsample
+            dates, followers = downsample(series["bucket"].to_numpy(), series["followers"].to_numpy())
+        else:
             dates = pd.date_range(start='2024-01-01', end='2024-07-24', freq='W')
             followers = [1000 + i*15 + (i%4)*10 for i in range(len(dates))]
-            
-            fig = px.line(
-                x=dates, 
-                y=followers,
-                title="팔로워 성장 추이",
-                labels={'x': '날짜', 'y': '팔로워 수'}
-            )
-            fig.update_traces(line_color='#833AB4')
+        
+        if PLOTLY_AVAILABLE:
+            with span("chart.followers"):
+                fig = px.line(
+                    x=dates, 
+                    y=followers,
+                    title="팔로워 성장 추이",
+                    labels={'x': '날짜', 'y': '팔로워 수'}
+                )
+                fig.update_traces(line_color='#833AB4')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.markdown("#### 📈 팔로워 성장 추이")
-            st.line_chart([1000, 1200, 1500, 1800, 2100, 2400])
+            st.line_chart(pd.DataFrame({'팔로워 수': list(followers)}, index=dates))
     
     with col2:
         # 콘텐츠 성과 분석
-        if PLOTLY_AVAILABLE:
+        if posts is not None and len(posts):
+            engagement = posts[["likes", "comments", "saves", "shares"]].sum(axis=1)
+            by_type = pd.DataFrame({"engagement": engagement, "reach": posts["reach"], "media_type": posts["media_type"]}) \
+                .groupby("media_type", observed=True)[["engagement", "reach"]].sum()
+            by_type = by_type[by_type["reach"] > 0]
+            content_types = list(by_type.index)
+            engagement_rates = list((by_type["engagement"] / by_type["reach"] * 100).round(2))
+        else:
             content_types = ['릴스', '캐러셀', '스토리', '싱글포스트']
             engagement_rates = [2.5, 2.8, 1.2, 1.8]
-            
-            fig = px.bar(
-                x=content_types,
-                y=engagement_rates,
-                title="콘텐츠 타입별 참여율",
-                labels={'x': '콘텐츠 타입', 'y': '참여율 (%)'},
-                color=engagement_rates,
-                color_continuous_scale="Viridis"
-            )
+        
+        if PLOTLY_AVAILABLE:
+            with span("chart.content_types"):
+                fig = px.bar(
+                    x=content_types,
+                    y=engagement_rates,
+                    title="콘텐츠 타입별 참여율",
+                    labels={'x': '콘텐츠 타입', 'y': '참여율 (%)'},
+                    color=engagement_rates,
+                    color_continuous_scale="Viridis"
+                )
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.markdown("#### 📊 콘텐츠 타입별 참여율")
             chart_data = pd.DataFrame({
-                '참여율': [2.5, 2.8, 1.2, 1.8]
-            }, index=['릴스', '캐러셀', '스토리', '싱글포스트'])
+                '참여율': engagement_rates
+            }, index=content_types)
             st.bar_chart(chart_data)
     
     # 주간 리포트
@@ -826,28 +1174,17 @@ def show_dashboard():
         """)
     
     # 개선 권장사항
-    st.markdown("### 💡 AI 기반 개선 권장사항")
+    st.markdown("### 💡 데이터 기반 개선 권장사항")
     
-    recommendations = [
-        {
-            "우선순위": "높음",
-            "영역": "콘텐츠 최적화", 
-            "권장사항": "릴스 콘텐츠 비중을 50%로 확대하여 도달률 20% 향상 예상",
-            "예상효과": "+20% 도달률"
-        },
-        {
-            "우선순위": "중간",
-            "영역": "참여 증대",
-            "권장사항": "캐러셀 포스트에 인터랙티브 요소 추가 (폴, 퀴즈 등)",
-            "예상효과": "+15% 참여율"
-        },
-        {
-            "우선순위": "중간", 
-            "영역": "트래픽 전환",
-            "권장사항": "스토리 하이라이트에 링크 추가 및 바이오 링크 최적화",
-            "예상효과": "+25% 웹사이트 클릭"
-        }
-    ]
+    if actual is None:
+        recommendations = SAMPLE_RECOMMENDATIONS
+    else:
+        recommendations = [
+            {"우선순위": r.priority, "영역": r.area, "권장사항": r.message, "예상효과": r.effect}
+            for r in get_recommendation_engine().recommend(account, actual)
+        ]
+        if not recommendations:
+            st.success("현재 지표에서는 개선이 필요한 항목이 발견되지 않았습니다.")
     
     for rec in recommendations:
         priority_color = {"높음": "🔴", "중간": "🟡", "낮음": "🟢"}[rec["우선순위"]]
@@ -857,32 +1194,193 @@ def show_dashboard():
         - 예상 효과: {rec['예상효과']}
         """)
 
+PORTFOLIO_PAGE_SIZE = 25
+PORTFOLIO_SORT_LABELS = {
+    "created_at": "등록일",
+    "attainment": "KPI 달성률",
+    "follower_growth": "팔로워 증가율",
+    "followers": "팔로워 수",
+    "engagement_rate": "참여율"
+}
+
+@timed("page.show_portfolio")
+def show_portfolio():
+    from core import PERFORMANCE_TIERS
+    from portfolio import tier_label
+    from store import PORTFOLIO_SORTS
+    
+    st.markdown('<div class="section-header"><h2>🗂️ 고객 포트폴리오</h2></div>', unsafe_allow_html=True)
+    store = get_store()
+    
+    # 필터와 정렬은 SQL 로 넘기고, 화면에는 현재 페이지의 요약 행만 가져온다
+    filter_cols = st.columns(4)
+    with filter_cols[0]:
+        business_type = st.selectbox(
+            "사업 분야",
+            options=[None] + list(SURVEY_DATA["business_types"]),
+            format_func=lambda x: "전체" if x is None else SURVEY_DATA["business_types"][x],
+            key="portfolio_business_type"
+        )
+    with filter_cols[1]:
+        strategy_name = st.selectbox(
+            "전략",
+            options=[None] + [definition["strategy_name"] for definition in STRATEGY_DEFINITIONS.values()],
+            format_func=lambda x: "전체" if x is None else x,
+            key="portfolio_strategy"
+        )
+    with filter_cols[2]:
+        tier = st.selectbox(
+            "성과 등급",
+            options=[None] + list(range(len(PERFORMANCE_TIERS))),
+            format_func=lambda x: "전체" if x is None else PERFORMANCE_TIERS[x],
+            key="portfolio_tier"
+        )
+    with filter_cols[3]:
+        sort = st.selectbox(
+            "정렬",
+            options=list(PORTFOLIO_SORTS),
+            format_func=lambda x: PORTFOLIO_SORT_LABELS[x],
+            key="portfolio_sort"
+        )
+        descending = st.toggle("내림차순", value=True, key="portfolio_descending")
+    filters = {"business_type": business_type, "strategy_name": strategy_name, "tier": tier}
+    
+    try:
+        with span("portfolio.summary"):
+            summary = store.portfolio_summary(**filters)
+    except sqlite3.Error as e:
+        st.error(f"포트폴리오를 불러오지 못했습니다: {e}")
+        return
+    
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("고객 수", f"{summary['clients']:,}")
+    metric_cols[1].metric("성과 데이터 보유", f"{summary['tracked']:,}")
+    metric_cols[2].metric(
+        "평균 KPI 달성률", "-" if summary["avg_attainment"] is None else f"{summary['avg_attainment']:.0f}%"
+    )
+    metric_cols[3].metric(
+        "평균 팔로워 증가율", "-" if summary["avg_growth"] is None else f"{summary['avg_growth']:+.1f}%"
+    )
+    
+    if not summary["clients"]:
+        st.info("조건에 맞는 고객이 없습니다.")
+        return
+    
+    with st.expander("📊 전략별 현황"):
+        st.dataframe(
+            [
+                {
+                    "전략": row["strategy_name"] or "-",
+                    "고객 수": row["clients"],
+                    "성과 데이터 보유": row["tracked"],
+                    "평균 KPI 달성률 (%)": None if row["avg_attainment"] is None else round(row["avg_attainment"], 1),
+                    "평균 팔로워 증가율 (%)": None if row["avg_growth"] is None else round(row["avg_growth"], 2)
+                }
+                for row in store.portfolio_breakdown(**filters)
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    pages = max(1, -(-summary["clients"] // PORTFOLIO_PAGE_SIZE))
+    # 필터가 바뀌어 페이지 수가 줄면 마지막 페이지로 맞춤
+    if st.session_state.get("portfolio_page", 1) > pages:
+        st.session_state.portfolio_page = pages
+    page = st.number_input(f"페이지 (총 {pages:,}쪽)", min_value=1, max_value=pages, key="portfolio_page")
+    with span("portfolio.page"):
+        rows = store.portfolio_page(
+            PORTFOLIO_PAGE_SIZE, (page - 1) * PORTFOLIO_PAGE_SIZE, sort, descending, **filters
+        )
+    st.dataframe(
+        [
+            {
+                "프로필 ID": row["id"][:8],
+                "사업 분야": SURVEY_DATA["business_types"].get(row["business_type"], row["business_type"]),
+                "전략": row["strategy_name"] or "-",
+                "등록일": row["created_at"][:10],
+                "팔로워": row["followers"],
+                "팔로워 증가율 (%)": None if row["follower_growth"] is None else round(row["follower_growth"], 2),
+                "참여율 (%)": None if row["engagement_rate"] is None else round(row["engagement_rate"], 2),
+                "KPI 달성률 (%)": None if row["attainment"] is None else round(row["attainment"], 1),
+                "성과 등급": tier_label(row["tier"])
+            }
+            for row in rows
+        ],
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("성과 데이터는 인사이트를 가져올 때 고객별로 갱신됩니다. "
+               "전체 갱신: python portfolio.py refresh")
+    
+    show_guide_export(store, filters, summary["clients"], [row["id"] for row in rows])
+
+def show_guide_export(store: ProfileStore, filters: dict, clients: int, page_ids: list):
+    """필터에 맞는 전체 고객 또는 선택한 고객의 가이드를 ZIP 하나로 내려받기"""
+    import tempfile
+    from guide_export import export_guides
+    
+    with st.expander("📦 브랜드 가이드 일괄 내보내기 (ZIP)"):
+        scope = st.radio(
+            "대상",
+            options=["filtered", "selected"],
+            format_func=lambda x: f"현재 필터의 전체 고객 ({clients:,}명)" if x == "filtered" else "이 페이지에서 선택한 고객",
+            horizontal=True,
+            key="export_scope"
+        )
+        selected = None
+        if scope == "selected":
+            selected = st.multiselect(
+                "고객", options=page_ids, format_func=lambda x: x[:8], key="export_ids"
+            )
+        export_format = st.radio(
+            "문서 형식",
+            options=list(GUIDE_FORMATS),
+            index=list(GUIDE_FORMATS).index("md"),
+            format_func=lambda x: GUIDE_FORMATS[x][0],
+            horizontal=True,
+            key="export_format"
+        )
+        
+        # 다운로드를 누를 때 워커 프로세스로 렌더링해 임시 파일에 항목 하나씩 기록
+        def build_export():
+            archive = tempfile.TemporaryFile()
+            with span("guide.export"):
+                export_guides(store, archive, export_format, profile_ids=selected, **filters)
+            archive.seek(0)
+            return archive
+        
+        st.download_button(
+            label="📥 가이드 ZIP 다운로드",
+            data=build_export,
+            file_name=f"brand_guides_{datetime.now():%Y%m%d}.zip",
+            mime="application/zip",
+            disabled=scope == "selected" and not selected,
+            key="export_download"
+        )
+        st.caption("수천 명 이상은 명령줄로 내보내는 편이 빠릅니다: "
+                   "python guide_export.py guides.zip --format md --workers 8")
+
+@timed("page.show_resources")
 def show_resources():
+    import pandas as pd
+    
     st.markdown('<div class="section-header"><h2>📚 브랜딩 리소스 센터</h2></div>', unsafe_allow_html=True)
     
+    # 리소스와 벤치마크는 참조 데이터 팩에서 읽음 (파일이 바뀌면 다음 리런부터 반영)
+    pack = reference.current()
+    st.caption(f"참조 데이터 버전 {pack.version} ({pack.digest})")
+    if reference.LOADER.last_error:
+        st.warning(f"참조 데이터 파일을 다시 읽지 못해 이전 버전을 사용합니다: {reference.LOADER.last_error}")
+    if reference.LOADER.restart_required():
+        st.info("설문, 전략, 성과 기준 변경은 서버를 재시작하면 반영됩니다.")
+    
     # 탭으로 리소스 구분
     tab1, tab2, tab3, tab4 = st.tabs(["🛠️ 도구", "📖 가이드", "🎨 템플릿", "📊 벤치마크"])
     
     with tab1:
         st.markdown("### 🛠️ 추천 도구 및 앱")
         
-        tools_categories = {
-            "콘텐츠 제작": [
-                {"이름": "Canva Pro", "용도": "디자인 및 템플릿", "가격": "월 12,000원", "추천도": "⭐⭐⭐⭐⭐"},
-                {"이름": "VSCO", "용도": "사진 편집 및 필터", "가격": "월 19,900원", "추천도": "⭐⭐⭐⭐"},
-                {"이름": "InShot", "용도": "비디오 편집", "가격": "무료/유료", "추천도": "⭐⭐⭐⭐"},
-            ],
-            "스케줄링": [
-                {"이름": "Later", "용도": "포스트 예약 및 스케줄링", "가격": "월 $18", "추천도": "⭐⭐⭐⭐⭐"},
-                {"이름": "Buffer", "용도": "소셜미디어 관리", "가격": "월 $6", "추천도": "⭐⭐⭐⭐"},
-                {"이름": "Hootsuite", "용도": "다중 플랫폼 관리", "가격": "월 $49", "추천도": "⭐⭐⭐"},
-            ],
-            "분석": [
-                {"이름": "Instagram Insights", "용도": "기본 성과 분석", "가격": "무료", "추천도": "⭐⭐⭐⭐"},
-                {"이름": "Sprout Social", "용도": "고급 분석", "가격": "월 $99", "추천도": "⭐⭐⭐⭐⭐"},
-                {"이름": "Iconosquare", "용도": "성과 추적", "가격": "월 $29", "추천도": "⭐⭐⭐⭐"},
-            ]
-        }
+        tools_categories = pack.resources["tools"]
         
         for category, tools in tools_categories.items():
             st.markdown(f"#### {category}")
@@ -901,32 +1399,7 @@ def show_resources():
     with tab2:
         st.markdown("### 📖 브랜딩 가이드")
         
-        guides = [
-            {
-                "제목": "인스타그램 알고리즘 완전 정복 가이드",
-                "설명": "2024-2025년 최신 알고리즘 변화와 대응 전략",
-                "난이도": "초급-중급",
-                "소요시간": "15분"
-            },
-            {
-                "제목": "브랜드 아이덴티티 설정 워크북", 
-                "설명": "체계적인 브랜드 정체성 구축 단계별 가이드",
-                "난이도": "초급",
-                "소요시간": "30분"
-            },
-            {
-                "제목": "콘텐츠 기획 및 제작 마스터클래스",
-                "설명": "매력적인 콘텐츠 아이디어 발굴과 제작 노하우",
-                "난이도": "중급",
-                "소요시간": "45분"
-            },
-            {
-                "제목": "인플루언서 협업 전략 가이드",
-                "설명": "효과적인 파트너십 구축과 ROI 측정 방법",
-                "난이도": "고급", 
-                "소요시간": "25분"
-            }
-        ]
+        guides = pack.resources["guides"]
         
         for guide in guides:
             with st.expander(f"📖 {guide['제목']}"):
@@ -937,29 +1410,7 @@ def show_resources():
     with tab3:
         st.markdown("### 🎨 디자인 템플릿")
         
-        template_categories = {
-            "포스트 템플릿": [
-                "브랜드 소개 캐러셀",
-                "제품 소개 템플릿", 
-                "고객 후기 디자인",
-                "교육 콘텐츠 레이아웃",
-                "이벤트 홍보 템플릿"
-            ],
-            "스토리 템플릿": [
-                "Q&A 스토리 템플릿",
-                "비하인드 스토리 프레임",
-                "제품 사용법 가이드",
-                "투표 및 퀴즈 템플릿",
-                "링크 스티커 디자인"
-            ],
-            "하이라이트 커버": [
-                "미니멀 스타일",
-                "브랜드 컬러 세트", 
-                "아이콘 기반 디자인",
-                "타이포그래피 중심",
-                "일러스트 스타일"
-            ]
-        }
+        template_categories = pack.resources["templates"]
         
         for category, templates in template_categories.items():
             st.markdown(f"#### {category}")
@@ -973,24 +1424,13 @@ def show_resources():
         st.markdown("### 📊 업계 벤치마크 데이터")
         
         # 업계별 벤치마크 차트
-        benchmark_data = {
-            "업계": ["패션", "뷰티", "음식", "기술", "여행", "피트니스"],
-            "평균_팔로워": [15000, 25000, 8000, 12000, 18000, 22000],
-            "평균_참여율": [1.8, 2.1, 2.5, 1.2, 2.0, 2.8],
-            "월간_게시물": [20, 25, 15, 12, 18, 24]
-        }
+        benchmark_data = pack.benchmarks["industries"]
         
         col1, col2 = st.columns(2)
         
         with col1:
             if PLOTLY_AVAILABLE:
-                fig = px.bar(
-                    x=benchmark_data["업계"],
-                    y=benchmark_data["평균_참여율"],
-                    title="업계별 평균 참여율",
-                    labels={'x': '업계', 'y': '참여율 (%)'}
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(industry_engagement_figure(pack.digest, pack), use_container_width=True)
             else:
                 st.markdown("#### 📊 업계별 평균 참여율")
                 chart_data = pd.DataFrame({
@@ -1000,15 +1440,7 @@ def show_resources():
         
         with col2:
             if PLOTLY_AVAILABLE:
-                fig = px.scatter(
-                    x=benchmark_data["평균_팔로워"],
-                    y=benchmark_data["평균_참여율"],
-                    text=benchmark_data["업계"],
-                    title="팔로워 수 vs 참여율",
-                    labels={'x': '평균 팔로워 수', 'y': '참여율 (%)'}
-                )
-                fig.update_traces(textposition="top center")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(followers_engagement_figure(pack.digest, pack), use_container_width=True)
             else:
                 st.markdown("#### 📈 팔로워 수 vs 참여율")
                 scatter_data = pd.DataFrame({
@@ -1020,15 +1452,38 @@ def show_resources():
         # 성과 기준표
         st.markdown("#### 📈 성과 평가 기준표")
         
-        performance_standards = pd.DataFrame({
-            "지표": ["참여율", "팔로워 증가율", "도달률", "스토리 완료율"],
-            "우수 (상위 10%)": ["3.0% 이상", "20% 이상", "30% 이상", "70% 이상"],
-            "양호 (상위 25%)": ["2.0-3.0%", "15-20%", "20-30%", "60-70%"],
-            "평균 (상위 50%)": ["1.0-2.0%", "10-15%", "10-20%", "50-60%"],
-            "개선 필요": ["1.0% 미만", "10% 미만", "10% 미만", "50% 미만"]
-        })
-        
-        st.dataframe(performance_standards, use_container_width=True)
+        st.dataframe(performance_standards_table(reference.LOADER.initial.digest), use_container_width=True)
+
+def show_diagnostics():
+    import pandas as pd
+    
+    st.markdown('<div class="section-header"><h2>🩺 리런 성능 진단</h2></div>', unsafe_allow_html=True)
+    
+    registry = telemetry.REGISTRY
+    rows = registry.snapshot()
+    started = datetime.fromtimestamp(registry.started_at).strftime("%Y-%m-%d %H:%M:%S")
+    st.caption(f"{started} 이후 이 프로세스의 모든 세션에서 수집한 구간별 소요 시간 (ms)")
+    
+    if not rows:
+        st.info("아직 수집된 구간이 없습니다. 다른 페이지를 이용한 뒤 다시 확인하세요.")
+    else:
+        st.dataframe(pd.DataFrame(rows).set_index("span").round(3), use_container_width=True)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            label="📥 지표 텍스트 다운로드",
+            data=registry.export_text,
+            file_name="branding_telemetry.prom",
+            mime="text/plain"
+        )
+    with col2:
+        if st.button("💾 지표 파일 저장"):
+            st.success(f"저장했습니다: {registry.write_metrics()}")
+    with col3:
+        if st.button("🔄 초기화"):
+            registry.reset()
+            st.rerun()
 
 if __name__ == "__main__":
     main()
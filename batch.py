@@ -0,0 +1,177 @@
+"""설문 응답 파일(CSV/JSONL)을 일괄 처리해 브랜딩 전략과 브랜드 가이드를 생성하는 배치 도구
+
+사용 예:
+    python batch.py clients.csv out/ --workers 8
+
+결과는 행 단위로 완료되는 즉시 디스크에 기록됩니다.
+- out/strategies.jsonl : 행 번호, 프로필, 전략 (완료 순서)
+- out/guides/<프로필 ID>.txt : 브랜드 가이드 문서 (파일 이름으로 안전하지 않은 ID 는 core.safe_filename 으로 변환)
+- out/errors.jsonl : 처리에 실패한 행(해석할 수 없는 줄, 중복 ID 포함)과 오류 메시지
+--db 를 지정하면 완료된 청크를 ProfileStore 에 한 트랜잭션씩 함께 기록합니다.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+
+from core import (
+    TONE_KEYS, StrategyEngine, profile_from_dict, profile_to_dict, safe_filename, strategy_from_dict, strategy_to_dict
+)
+from guide import generate_brand_guide
+from store import ProfileStore
+
+# CSV 에서 여러 값을 한 칸에 담는 필드 (구분자: ;)
+LIST_FIELDS = ["primary_goals", "competitors", "differentiation", "tools_available"]
+LIST_SEPARATOR = ";"
+
+_engine = None
+
+class MalformedRow(ValueError):
+    """입력 파일에서 해석할 수 없는 행 (워커에서 오류 행으로 기록)"""
+
+def read_rows(path: str) -> Iterator[Dict]:
+    """입력 파일을 한 행씩 읽어 설문 응답 딕셔너리로 반환 (파일 전체를 메모리에 올리지 않음)
+
+    JSON 으로 해석할 수 없는 줄은 중단하지 않고 MalformedRow 로 넘겨 errors.jsonl 에 기록되게 합니다.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield MalformedRow(f"{line_number}번째 줄: JSON 을 해석할 수 없습니다 ({e.msg}, {e.pos + 1}번째 문자)")
+        return
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield csv_row_to_dict(row)
+
+def csv_row_to_dict(row: Dict[str, str]) -> Dict:
+    """평면 CSV 행을 profile_from_dict 가 받는 형태로 변환"""
+    data = {key: value for key, value in row.items() if value not in (None, "")}
+    for field in LIST_FIELDS:
+        raw = data.get(field, "")
+        data[field] = [item.strip() for item in raw.split(LIST_SEPARATOR) if item.strip()]
+    data["tone_scores"] = {key: data.pop(key) for key in TONE_KEYS if key in data}
+    return data
+
+def _init_worker():
+    # 워커 프로세스마다 엔진을 한 번만 생성
+    global _engine
+    _engine = StrategyEngine()
+
+def process_chunk(chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict, str, str]]:
+    """워커에서 실행: (행 번호, 결과 레코드, 가이드 텍스트, 오류 메시지) 목록 반환"""
+    results = []
+    for row_number, data in chunk:
+        try:
+            if isinstance(data, MalformedRow):
+                raise data
+            profile = profile_from_dict(data)
+            strategy = _engine.match_strategy(profile)
+            record = {"row": row_number, "profile": profile_to_dict(profile), "strategy": strategy_to_dict(strategy)}
+            results.append((row_number, record, generate_brand_guide(profile, strategy), ""))
+        except Exception as e:
+            results.append((row_number, {}, "", f"{type(e).__name__}: {e}"))
+    return results
+
+def iter_chunks(rows: Iterator[Dict], chunk_size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    numbered = enumerate(rows, 1)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_batch(input_path: str, output_dir: str, workers: int = None, chunk_size: int = 64,
+              report_every: float = 5.0, db_path: str = None) -> Dict[str, float]:
+    """입력 파일 전체를 워커 풀로 처리하고 처리 통계를 반환
+
+    동시에 처리 중인 청크 수를 워커 수의 2배로 제한하므로,
+    입력 크기와 관계없이 메모리 사용량은 chunk_size * workers 수준으로 유지됩니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    guides_dir = os.path.join(output_dir, "guides")
+    os.makedirs(guides_dir, exist_ok=True)
+    store = ProfileStore(db_path) if db_path else None
+
+    stats = {"rows": 0, "errors": 0}
+    # 같은 ID 가 다시 나오면 앞선 가이드/저장 결과를 덮어쓰지 않도록 오류 행으로 기록 (ID 당 수십 바이트)
+    seen_ids = set()
+    started = last_report = time.perf_counter()
+
+    with open(os.path.join(output_dir, "strategies.jsonl"), "w", encoding="utf-8") as out, \
+            open(os.path.join(output_dir, "errors.jsonl"), "w", encoding="utf-8") as err, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+
+        def drain(done):
+            for future in done:
+                completed = []
+                for row_number, record, guide, error in future.result():
+                    stats["rows"] += 1
+                    profile_id = record.get("profile", {}).get("id")
+                    if not error and profile_id in seen_ids:
+                        error = f"DuplicateId: 앞선 행과 같은 프로필 ID {profile_id!r}"
+                    if error:
+                        stats["errors"] += 1
+                        err.write(json.dumps({"row": row_number, "error": error}, ensure_ascii=False) + "\n")
+                        continue
+                    seen_ids.add(profile_id)
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    guide_path = os.path.join(guides_dir, safe_filename(profile_id, "txt"))
+                    with open(guide_path, "w", encoding="utf-8") as g:
+                        g.write(guide)
+                    completed.append(record)
+                if store is not None and completed:
+                    store.save_many(
+                        (profile_from_dict(r["profile"]), strategy_from_dict(r["strategy"])) for r in completed
+                    )
+
+        pending = set()
+        for chunk in iter_chunks(read_rows(input_path), chunk_size):
+            pending.add(pool.submit(process_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                drain(done)
+
+            now = time.perf_counter()
+            if report_every and now - last_report >= report_every:
+                last_report = now
+                print(f"... {stats['rows']:,}행 처리 ({stats['rows'] / (now - started):,.1f} rows/sec)", file=sys.stderr)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            drain(done)
+
+    stats["elapsed"] = time.perf_counter() - started
+    stats["rows_per_sec"] = stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="설문 응답 파일로 브랜딩 전략/가이드를 일괄 생성합니다.")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("output_dir", help="결과를 기록할 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="워커에 한 번에 넘길 행 수")
+    parser.add_argument("--report-every", type=float, default=5.0, help="진행률 출력 간격 (초, 0이면 끔)")
+    parser.add_argument("--db", default=None, help="결과를 함께 저장할 SQLite 파일 경로")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.input, args.output_dir, args.workers, args.chunk_size, args.report_every, args.db)
+    print(
+        f"완료: {stats['rows']:,}행 (오류 {stats['errors']:,}행), "
+        f"{stats['elapsed']:.2f}초, {stats['rows_per_sec']:,.1f} rows/sec",
+        file=sys.stderr
+    )
+    return 1 if stats["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
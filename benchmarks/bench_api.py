@@ -0,0 +1,173 @@
+"""전략 생성 HTTP API 부하 테스트 (localhost)
+
+api.py 서버를 별도 프로세스로 띄운 뒤(또는 --url 로 실행 중인 서버 지정) 동시 연결 N개가
+합성 설문 응답을 POST /strategy 로 보내고 requests/sec 와 지연 분위수(p50/p90/p99)를 출력합니다.
+클라이언트는 연결마다 스레드 하나가 keep-alive 로 요청을 이어 보내며,
+--no-keepalive 로 요청마다 새 연결을 맺는 경우와 비교할 수 있습니다.
+측정 전에 형식이 잘못된 설문 응답(MALFORMED_PAYLOADS)이 모두 400 으로 거절되는지 먼저 확인합니다.
+
+    python benchmarks/bench_api.py --connections 16 --duration 10
+    python benchmarks/bench_api.py --guide md --workers 8
+    python benchmarks/bench_api.py --url http://127.0.0.1:8600
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from bench_scoring import random_profiles
+from core import profile_to_dict
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "api.py"), "--port", str(port), "--workers", str(workers)],
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("API 서버가 시작되지 않았습니다")
+
+# 회귀 확인: 형식이 잘못된 설문 응답은 500 이 아니라 400 (검증 오류 목록)이어야 함
+MALFORMED_PAYLOADS = [
+    {"business_type": ["product"]},
+    {"business_stage": {"idea": True}, "business_type": "product", "target_age_group": "25-34",
+     "brand_archetype": "sage"},
+    {"business_stage": "idea", "business_type": "product", "target_age_group": 25, "brand_archetype": None},
+    {"business_stage": "idea", "business_type": "product", "target_age_group": "25-34", "brand_archetype": "sage",
+     "primary_goals": "sales", "tone_scores": {"serious_fun": "5"}, "competitors": [1]},
+    ["not", "an", "object"]
+]
+
+def check_validation(host: str, port: int) -> list:
+    """잘못된 응답마다 400 과 오류 목록을 받는지 확인하고 실패한 경우 목록을 반환"""
+    failures = []
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    for payload in MALFORMED_PAYLOADS:
+        conn.request("POST", "/strategy", json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                     {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        body = json.loads(response.read())
+        if response.status != 400 or not body.get("errors"):
+            failures.append((payload, response.status, body))
+    conn.close()
+    return failures
+
+def client(host: str, port: int, path: str, bodies, keepalive: bool, stop_at: float, latencies, errors):
+    conn = None
+    headers = {"Content-Type": "application/json"}
+    i = 0
+    while time.perf_counter() < stop_at:
+        body = bodies[i % len(bodies)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+            conn.request("POST", path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if not keepalive:
+            conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="실행 중인 서버 주소 (없으면 api.py 를 직접 띄움)")
+    parser.add_argument("--workers", type=int, default=32, help="직접 띄우는 서버의 워커 수")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--guide", default=None, help="가이드 형식 (지정하면 ?guide= 로 함께 렌더링)")
+    parser.add_argument("--profiles", type=int, default=1000, help="돌려 가며 보낼 합성 설문 응답 수")
+    parser.add_argument("--no-keepalive", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = start_server(port, args.workers)
+
+    bodies = [json.dumps(profile_to_dict(p), ensure_ascii=False).encode("utf-8")
+              for p in random_profiles(args.profiles)]
+    path = f"/strategy?guide={args.guide}" if args.guide else "/strategy"
+    keepalive = not args.no_keepalive
+
+    try:
+        failures = check_validation(host, port)
+        if failures:
+            for payload, status, body in failures:
+                print(f"검증 실패: {payload!r} -> {status} {body}", file=sys.stderr)
+            sys.exit(1)
+        results = {}
+        for phase, duration in (("warmup", args.warmup), ("run", args.duration)):
+            latencies, errors = [], []
+            stop_at = time.perf_counter() + duration
+            threads = [
+                threading.Thread(target=client, args=(host, port, path, bodies, keepalive, stop_at, latencies, errors))
+                for _ in range(args.connections)
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results[phase] = (latencies, errors, time.perf_counter() - started)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies, errors, elapsed = results["run"]
+    ms = np.array(latencies) * 1000
+    print(f"POST {path}, 연결 {args.connections}개 ({'keep-alive' if keepalive else '요청마다 새 연결'}), "
+          f"{elapsed:.1f}s" + ("" if args.url else f", 서버 워커 {args.workers}개"))
+    if not len(ms):
+        print(f"  성공한 요청이 없습니다 (오류 {len(errors):,}건)")
+        return
+    p50, p90, p99 = np.percentile(ms, (50, 90, 99))
+    print(f"  {len(ms) / elapsed:,.0f} requests/sec, 지연 p50 {p50:.2f} ms / p90 {p90:.2f} ms / p99 {p99:.2f} ms, "
+          f"최대 {ms.max():.2f} ms, 오류 {len(errors):,}건")
+    if not args.url and args.connections > args.workers:
+        print(f"  연결 수가 워커 수보다 많아 {args.connections - args.workers}개 연결은 "
+              f"다른 연결이 끝나거나 유휴 시간 초과로 닫힐 때까지 대기합니다")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""경쟁사 지표 조회 벤치마크 (로컬 대체 서버 사용)
+
+요청당 인위적 지연(기본 200ms)을 둔 대체 서버에 대해
+- 순차 조회 (이전처럼 한 계정씩)
+- 동시 조회 (CompetitorFetcher, 캐시 미스)
+- 캐시 적중
+의 소요 시간을 비교하고, 속도 제한기가 지정한 초당 요청 수를 지키는지 확인합니다.
+
+    python benchmarks/bench_competitors.py --handles 3 --delay 0.2
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from competitors import CompetitorFetcher, HTTPJsonSource, start_standin_server, standin_url
+
+def timed_call(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--handles", type=int, default=3, help="조회할 경쟁사 수")
+    parser.add_argument("--delay", type=float, default=0.2, help="대체 서버의 요청당 지연(초)")
+    parser.add_argument("--rate", type=float, default=5.0, help="속도 제한 확인용 초당 요청 수")
+    args = parser.parse_args()
+
+    server = start_standin_server(delay=args.delay)
+    url = standin_url(server)
+    handles = [f"competitor_{i}" for i in range(args.handles)]
+    try:
+        source = HTTPJsonSource(url, rate=1000, burst=args.handles)
+        sequential, _ = timed_call(lambda: [source._get(handle) for handle in handles])
+        fetcher = CompetitorFetcher(source)
+        concurrent, results = timed_call(fetcher.fetch_all, handles)
+        cached, _ = timed_call(fetcher.fetch_all, handles)
+        assert all(stats.ok for stats in results)
+        print(f"경쟁사 {args.handles}개, 요청당 지연 {args.delay * 1000:.0f} ms")
+        print(f"  순차 조회   {sequential * 1000:8.1f} ms")
+        print(f"  동시 조회   {concurrent * 1000:8.1f} ms ({sequential / concurrent:.1f}배 빠름)")
+        print(f"  캐시 적중   {cached * 1000:8.3f} ms")
+
+        # 버스트 1, 초당 rate 회로 제한하면 N개 요청은 최소 (N-1)/rate 초에 걸쳐 나뉘어야 함
+        count = int(args.rate * 2) + 1
+        limited = CompetitorFetcher(HTTPJsonSource(url, rate=args.rate, burst=1))
+        elapsed, _ = timed_call(limited.fetch_all, [f"limited_{i}" for i in range(count)])
+        expected = (count - 1) / args.rate
+        print(f"  속도 제한   {count}건 / {elapsed:.2f}초 (하한 {expected:.2f}초, 초당 {args.rate:g}건)")
+        print(f"  대체 서버가 받은 요청 수: {server.requests}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
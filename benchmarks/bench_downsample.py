@@ -0,0 +1,69 @@
+"""차트 다운샘플링 벤치마크
+
+수년치 시간별 팔로워 시계열(기본 5년, 약 43,800점)로 plotly 그림을 만들고,
+원본 그대로 그릴 때와 다운샘플링 후 그릴 때의 페이로드 크기(fig.to_json 길이)와
+그림 생성 + 직렬화 시간을 비교합니다. 모양 보존 정도는 축소한 점을 선형 보간해
+원본과 비교한 최대/평균 오차(값 범위 대비 %)로 보여줍니다.
+
+    python benchmarks/bench_downsample.py --years 5 --points 600
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import plotly.express as px
+
+from downsample import downsample
+
+def hourly_followers(years: int, seed: int = 42):
+    """추세 + 주간 주기 + 잡음 + 가끔의 급등(바이럴)을 섞은 시간별 팔로워 수"""
+    rng = np.random.default_rng(seed)
+    n = years * 365 * 24
+    x = np.datetime64("2020-01-01T00", "h") + np.arange(n)
+    t = np.arange(n)
+    spikes = np.zeros(n)
+    spikes[rng.choice(n, size=max(n // 5000, 1), replace=False)] = rng.uniform(500, 2000, max(n // 5000, 1))
+    y = 1000 + t * 0.4 + 150 * np.sin(2 * np.pi * t / (24 * 7)) + rng.normal(0, 20, n) + np.cumsum(spikes)
+    return x, y.round()
+
+def render(x, y):
+    started = time.perf_counter()
+    fig = px.line(x=x, y=y, title="팔로워 성장 추이", labels={"x": "날짜", "y": "팔로워 수"})
+    payload = fig.to_json()
+    return len(payload.encode("utf-8")), time.perf_counter() - started
+
+def shape_error(x, y, sx, sy):
+    xi = x.astype(np.int64).astype(np.float64)
+    approx = np.interp(xi, sx.astype(np.int64).astype(np.float64), sy)
+    span = y.max() - y.min()
+    return np.abs(approx - y).max() / span * 100, np.abs(approx - y).mean() / span * 100
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--points", type=int, default=600)
+    args = parser.parse_args()
+
+    x, y = hourly_followers(args.years)
+    size, elapsed = render(x, y)
+    print(f"원본        {len(y):>7,}점  페이로드 {size / 1024:9.1f} KB  생성+직렬화 {elapsed * 1000:8.1f} ms")
+
+    for method in ("lttb", "minmax"):
+        started = time.perf_counter()
+        sx, sy = downsample(x, y, args.points, method)
+        reduce_time = time.perf_counter() - started
+        size_small, elapsed_small = render(sx, sy)
+        max_err, mean_err = shape_error(x, y, sx, sy)
+        print(
+            f"{method:<10}  {len(sy):>7,}점  페이로드 {size_small / 1024:9.1f} KB  생성+직렬화 {elapsed_small * 1000:8.1f} ms"
+            f"  (축소 {reduce_time * 1000:.1f} ms, 페이로드 {size / size_small:.0f}배 감소)"
+        )
+        print(f"{'':10}  모양 오차: 최대 {max_err:.2f}%, 평균 {mean_err:.3f}% (값 범위 대비)"
+              f"  최솟값/최댓값 보존: {sy.min() == y.min()}/{sy.max() == y.max()}")
+
+if __name__ == "__main__":
+    main()
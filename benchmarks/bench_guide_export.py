@@ -0,0 +1,81 @@
+"""가이드 ZIP 일괄 내보내기 벤치마크 (저장 고객 N명, 기본 10,000)
+
+임시 SQLite 에 합성 고객을 저장한 뒤 guide_export.export_guides 로 ZIP 을 만들며
+- 워커 수별 처리량 (guides/sec)
+- 고객 수별 부모 프로세스의 최대 파이썬 메모리 할당(tracemalloc): 스트리밍 vs 모든 가이드를 렌더링해 메모리의 ZIP 에 담는 방식
+을 측정합니다. 스트리밍 방식은 고객 수가 늘어도 ZIP 중앙 디렉터리 항목만큼만 늘어나야 합니다.
+
+    python benchmarks/bench_guide_export.py --clients 10000 --workers 8
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scoring import random_profiles
+from core import StrategyEngine
+from guide import render_guide
+from guide_export import export_guides
+from store import ProfileStore
+
+def in_memory_zip(store: ProfileStore, fmt: str) -> int:
+    """비교 기준: 고객 한 명씩 다운로드하던 방식을 모아 메모리에서 ZIP 을 만든 경우"""
+    guides = [
+        (profile.id, render_guide(profile, strategy, fmt))
+        for profile_id in store.iter_ids()
+        for profile, strategy in [store.get(profile_id)]
+    ]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for profile_id, guide in guides:
+            archive.writestr(f"{profile_id}.{fmt}", guide)
+    return len(buffer.getvalue())
+
+def peak_mb(func) -> float:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--format", default="md")
+    args = parser.parse_args()
+
+    engine = StrategyEngine()
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = sorted({args.clients // 10, args.clients})
+        stores = {}
+        for clients in sizes:
+            store = ProfileStore(os.path.join(tmp, f"clients_{clients}.db"))
+            store.save_many((p, engine.match_strategy(p)) for p in random_profiles(clients))
+            stores[clients] = store
+        store = stores[args.clients]
+        target = os.path.join(tmp, "guides.zip")
+
+        print(f"고객 {args.clients:,}명, 형식 {args.format}")
+        for workers in sorted({1, args.workers}):
+            stats = export_guides(store, target, args.format, workers=workers)
+            print(f"  워커 {workers:>2}개: {stats['elapsed']:6.2f}s, {stats['guides_per_sec']:8,.0f} guides/sec, "
+                  f"ZIP {os.path.getsize(target) / 1e6:,.1f} MB (원문 {stats['bytes'] / 1e6:,.1f} MB)")
+
+        print("부모 프로세스 최대 메모리 할당")
+        for clients in sizes:
+            streamed = peak_mb(lambda: export_guides(stores[clients], target, args.format, workers=args.workers))
+            started = time.perf_counter()
+            buffered = peak_mb(lambda: in_memory_zip(stores[clients], args.format))
+            buffered_seconds = time.perf_counter() - started
+            print(f"  고객 {clients:>7,}명: 스트리밍 {streamed:7.1f} MB vs 메모리 ZIP {buffered:7.1f} MB "
+                  f"({buffered_seconds:.1f}s, 단일 프로세스)")
+
+if __name__ == "__main__":
+    main()
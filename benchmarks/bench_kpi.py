@@ -0,0 +1,77 @@
+"""KPI 평가 엔진 벤치마크
+
+무작위 프로필 N개(기본 10,000)에 전략을 매칭하고 무작위 실제 지표를 만든 뒤,
+목표 행렬 컴파일(KPIEvaluator 생성) 시간과, 새로고침마다 전체 계정의 목표 달성률 + 등급 분류를
+한 번에 수행하는 시간(evaluate)을 측정합니다.
+계정마다 딕셔너리를 순회하는 단순 구현과 결과가 같은지도 확인합니다.
+
+    python benchmarks/bench_kpi.py --accounts 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_scoring import random_profiles
+from core import PERFORMANCE_THRESHOLDS, PERFORMANCE_TIERS, StrategyEngine
+from kpi import KPIEvaluator
+
+def naive_tiers(actuals, n):
+    """계정마다 지표를 순회하며 등급을 매기는 기준 구현"""
+    tiers = []
+    for i in range(n):
+        row = []
+        for metric, values in actuals.items():
+            average, good, excellent = PERFORMANCE_THRESHOLDS[metric]
+            value = values[i]
+            row.append(
+                PERFORMANCE_TIERS[0] if value >= excellent else
+                PERFORMANCE_TIERS[1] if value >= good else
+                PERFORMANCE_TIERS[2] if value >= average else
+                PERFORMANCE_TIERS[3]
+            )
+        tiers.append(row)
+    return tiers
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = StrategyEngine()
+    strategies = [engine.match_strategy(profile) for profile in random_profiles(args.accounts)]
+    rng = np.random.default_rng(42)
+    actuals = {
+        "팔로워_증가율": rng.gamma(2.0, 6.0, args.accounts),
+        "참여율": rng.gamma(2.0, 1.0, args.accounts),
+        "도달률": rng.gamma(3.0, 6.0, args.accounts),
+        "스토리_완료율": rng.uniform(30, 90, args.accounts)
+    }
+
+    started = time.perf_counter()
+    evaluator = KPIEvaluator(strategies, list(actuals))
+    compile_time = time.perf_counter() - started
+
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        evaluation = evaluator.evaluate(actuals)
+        timings.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    expected = naive_tiers(actuals, args.accounts)
+    naive_time = time.perf_counter() - started
+
+    assert evaluation.tier_labels().tolist() == expected
+    print(f"목표 행렬 컴파일: {compile_time * 1000:.1f} ms")
+    print(f"계정 {args.accounts:,}개 × 지표 {len(actuals)}개 평가: 최소 {min(timings) * 1000:.1f} ms, 중앙값 {sorted(timings)[2] * 1000:.1f} ms")
+    print(f"계정별 루프 등급 분류(비교용): {naive_time * 1000:.1f} ms")
+    frame = evaluation.to_frame()
+    print(frame.groupby(["metric", "tier"]).size().unstack(fill_value=0))
+
+if __name__ == "__main__":
+    main()
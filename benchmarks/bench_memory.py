@@ -0,0 +1,140 @@
+"""세션당 메모리 벤치마크 (UserProfile + BrandStrategy)
+
+세션 N개(기본 5,000)가 각각 프로필과 전략을 하나씩 들고 있을 때 tracemalloc 으로 측정한 세션당 할당량을
+이전 표현(일반 데이터 클래스, 문자열/리스트/딕셔너리 사본, 주마다 새로 만든 주간 계획 딕셔너리)과 비교합니다.
+- 설문 제출: 엔진으로 전략을 새로 매칭
+- 저장소 복원: 저장된 JSON 에서 다시 읽어 옴 (새로고침, 서버 재시작 후 ?pid= 복원)
+
+    python benchmarks/bench_memory.py --sessions 5000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scoring import random_profiles
+from core import (
+    STRATEGY_TABLE, StrategyEngine, profile_from_dict, profile_to_dict, strategy_from_dict, strategy_to_dict
+)
+
+@dataclass
+class LegacyProfile:
+    id: str
+    business_stage: str
+    business_type: str
+    instagram_status: str
+    target_age_group: str
+    target_gender: str
+    primary_goals: List[str]
+    brand_archetype: str
+    tone_scores: Dict[str, int]
+    competitors: List[str]
+    differentiation: List[str]
+    time_available: str
+    budget: str
+    tools_available: List[str]
+    created_at: str
+
+@dataclass
+class LegacyStrategy:
+    brand_type: str
+    strategy_name: str
+    content_pillars: List[str]
+    posting_frequency: Dict[str, int]
+    content_mix: Dict[str, int]
+    recommended_tools: List[str]
+    kpi_targets: Dict[str, float]
+    weekly_plans: List[Dict]
+
+def legacy_weekly_plans(strategy_data) -> List[Dict]:
+    """이전 generate_weekly_plans: 주마다 새 딕셔너리와 할 일 리스트를 만든다"""
+    plans = []
+    for week in range(1, 13):
+        if week <= 2:
+            phase = "브랜드 파운데이션"
+            tasks = ["인스타그램 비즈니스 계정 설정 및 최적화", "브랜드 아이덴티티 가이드 문서 작성",
+                     "경쟁사 분석 및 벤치마킹", "콘텐츠 필러 정의 및 스타일 가이드 작성"]
+        elif week <= 8:
+            phase = "콘텐츠 전략 실행"
+            tasks = [f"{strategy_data['posting_frequency']['총_게시물']}개 포스트 제작 및 게시",
+                     "스토리 인터랙티브 콘텐츠 일일 게시", "댓글 및 DM 응답 (24시간 내)", "주간 성과 분석 및 최적화"]
+        else:
+            phase = "성장 가속화"
+            tasks = ["유료 광고 캠페인 테스트 런칭", "인플루언서 협업 기획", "UGC 캠페인 실행", "크로스 플랫폼 콘텐츠 전략 구현"]
+        plans.append({"week": week, "phase": phase, "tasks": tasks, "kpi_focus": list(strategy_data["kpi_targets"].keys())[0]})
+    return plans
+
+def legacy_match(profile: LegacyProfile) -> LegacyStrategy:
+    goal = profile.primary_goals[0] if profile.primary_goals else "awareness"
+    data = STRATEGY_TABLE[(profile.business_type, goal)]
+    return LegacyStrategy(
+        brand_type=data["brand_type"],
+        strategy_name=data["strategy_name"],
+        content_pillars=list(data["content_pillars"]),
+        posting_frequency=dict(data["posting_frequency"]),
+        content_mix=dict(data["content_mix"]),
+        recommended_tools=list(data["recommended_tools"]),
+        kpi_targets=dict(data["kpi_targets"]),
+        weekly_plans=legacy_weekly_plans(data)
+    )
+
+def legacy_profile(data: Dict) -> LegacyProfile:
+    return LegacyProfile(**{**data, **{key: list(data[key]) for key in
+                                       ("primary_goals", "competitors", "differentiation", "tools_available")},
+                            "tone_scores": dict(data["tone_scores"])})
+
+def measure(build, inputs) -> float:
+    """inputs 각각에 대해 build 로 세션 객체를 만들어 유지했을 때 세션당 할당 바이트"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(item) for item in inputs]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del sessions
+    return used / len(inputs)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = StrategyEngine()
+    profiles = random_profiles(args.sessions)
+    stored = [
+        (json.dumps(profile_to_dict(p), ensure_ascii=False), json.dumps(strategy_to_dict(engine.match_strategy(p)), ensure_ascii=False))
+        for p in profiles
+    ]
+    # 설문 제출 경로의 입력은 설문 응답 딕셔너리 (선택지 문자열은 두 표현 모두 같은 상수를 참조)
+    answers = [profile_to_dict(p) for p in profiles]
+
+    scenarios = {
+        "설문 제출": (
+            lambda data: (lambda p: (p, legacy_match(p)))(legacy_profile(data)),
+            lambda data: (lambda p: (p, engine.match_strategy(p)))(profile_from_dict(data)),
+            answers
+        ),
+        "저장소 복원": (
+            lambda row: (legacy_profile(json.loads(row[0])), LegacyStrategy(**json.loads(row[1]))),
+            lambda row: (profile_from_dict(json.loads(row[0])), strategy_from_dict(json.loads(row[1]))),
+            stored
+        )
+    }
+    print(f"세션 {args.sessions:,}개 기준 세션당 메모리 (tracemalloc)")
+    for name, (legacy, compact, inputs) in scenarios.items():
+        # 공유 캐시(주간 계획, 매핑)를 먼저 채워 세션별 증가분만 비교
+        compact(inputs[0])
+        legacy_bytes = measure(legacy, inputs)
+        compact_bytes = measure(compact, inputs)
+        print(f"  {name:<8} 이전 {legacy_bytes:8,.0f} B → 현재 {compact_bytes:8,.0f} B "
+              f"({1 - compact_bytes / legacy_bytes:.0%} 감소)")
+
+if __name__ == "__main__":
+    main()
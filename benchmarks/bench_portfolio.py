@@ -0,0 +1,104 @@
+"""포트폴리오 조회 벤치마크 (고객 N명, 기본 10,000)
+
+임시 SQLite 에 프로필/전략과 합성 성과 요약(account_metrics)을 넣은 뒤, 포트폴리오 화면 한 번의 리런에 필요한
+- SQL 집계 + 전략별 현황 + 정렬/필터된 한 페이지 조회 (ProfileStore.portfolio_*)
+- 이전 방식: 전체 프로필을 읽어 DataFrame 으로 만든 뒤 pandas 로 집계/정렬/필터
+의 소요 시간을 비교합니다. 성과 요약 계산(summarize_accounts)의 배치 처리 속도도 함께 출력합니다.
+
+    python benchmarks/bench_portfolio.py --clients 10000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from bench_scoring import random_profiles
+from core import StrategyEngine, profile_to_dict
+from portfolio import summarize_accounts
+from store import ProfileStore
+
+PAGE_SIZE = 25
+
+def best_of(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def sql_rerun(store: ProfileStore, page: int):
+    filters = {"business_type": "product", "strategy_name": None, "tier": None}
+    summary = store.portfolio_summary(**filters)
+    store.portfolio_breakdown(**filters)
+    store.portfolio_page(PAGE_SIZE, page * PAGE_SIZE, "attainment", True, **filters)
+    return summary
+
+def dataframe_rerun(store: ProfileStore, metrics: pd.DataFrame, page: int):
+    """비교 기준: 모든 고객을 읽어 프레임으로 만든 뒤 pandas 로 처리"""
+    records, cursor = [], None
+    while True:
+        batch, cursor = store.list_page(1000, cursor)
+        records.extend({**profile_to_dict(p), "strategy_name": s.strategy_name} for p, s in batch)
+        if cursor is None:
+            break
+    frame = pd.DataFrame(records).merge(metrics, how="left", left_on="id", right_index=True)
+    frame = frame[frame["business_type"] == "product"]
+    frame.groupby("strategy_name")["attainment"].agg(["count", "mean"])
+    return frame.sort_values("attainment", ascending=False).iloc[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+def resave_keeps_metrics(store: ProfileStore, pairs) -> bool:
+    """회귀 확인: 같은 ID 를 다시 저장(설문 재제출, batch.py --db 재실행)해도 성과 요약이 남아 있는지"""
+    ids = [profile.id for profile, _ in pairs]
+    before = store.profile_outcomes(ids)
+    store.save_many(pairs)
+    after = store.profile_outcomes(ids)
+    return bool(before) and after == before
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--tracked", type=float, default=0.8, help="성과 데이터가 있는 고객 비율")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="portfolio-bench-")
+    try:
+        store = ProfileStore(os.path.join(work_dir, "branding.db"))
+        engine = StrategyEngine()
+        pairs = [(profile, engine.match_strategy(profile)) for profile in random_profiles(args.clients)]
+        store.save_many(pairs)
+
+        rng = np.random.default_rng(7)
+        tracked = [pair for pair in pairs if rng.random() < args.tracked]
+        snapshots = [
+            {"팔로워": float(rng.integers(500, 200_000)), "팔로워_증가율": float(rng.normal(12, 8)),
+             "참여율": float(rng.gamma(2, 0.8)), "도달률": float(rng.uniform(5, 40))}
+            for _ in tracked
+        ]
+        started = time.perf_counter()
+        rows = summarize_accounts([strategy for _, strategy in tracked], snapshots)
+        summarize_time = time.perf_counter() - started
+        store.save_account_metrics(zip((profile.id for profile, _ in tracked), rows))
+        metrics = pd.DataFrame(rows, index=[profile.id for profile, _ in tracked])
+        if not resave_keeps_metrics(store, tracked[:100]):
+            sys.exit("재저장 후 성과 요약(account_metrics)이 사라졌습니다")
+
+        print(f"고객 {args.clients:,}명 (성과 데이터 {len(tracked):,}명)")
+        print(f"  성과 요약 계산          {summarize_time * 1000:8.2f} ms")
+        for page in (0, args.clients // PAGE_SIZE // 4):
+            sql_time = best_of(lambda: sql_rerun(store, page))
+            frame_time = best_of(lambda: dataframe_rerun(store, metrics, page), repeat=2)
+            print(f"  {page + 1:>4}쪽: SQL {sql_time * 1000:8.2f} ms / 전체 DataFrame {frame_time * 1000:8.2f} ms "
+                  f"({frame_time / sql_time:.0f}배)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""12주 성장 전망(몬테카를로) 벤치마크
+
+계정 N개(기본 200)의 (프로필, 전략)에 대해 projection.simulate 의 계정당 시간을
+시뮬레이션 수별로 측정하고, 궤적마다 주차를 파이썬 루프로 도는 방식과 비교합니다.
+ProjectionEngine 캐시 적중(같은 프로필/전략/시드/과거 통계로 다시 그릴 때)의 시간도 출력합니다.
+
+    python benchmarks/bench_projection.py --accounts 200 --simulations 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_scoring import random_profiles
+from core import StrategyEngine
+from projection import (
+    BASELINE_ACTIVITY, FORMAT_GROWTH_WEIGHTS, GROWTH_ELASTICITY, PHASE_EFFECTS, AccountHistory, ProjectionEngine,
+    prior_history, simulate
+)
+
+def loop_simulate(strategy, history: AccountHistory, simulations: int, seed: int):
+    """비교 기준: 궤적마다, 주차마다 파이썬 루프로 팔로워만 시뮬레이션"""
+    rng = random.Random(seed)
+    finals = []
+    for _ in range(simulations):
+        followers = max(history.followers, 1)
+        for plan in strategy.weekly_plans:
+            ratio, boost = PHASE_EFFECTS.get(plan.phase, (1.0, 1.0))
+            activity = sum(
+                weight * np.random.poisson(strategy.posting_frequency[f] * ratio)
+                for f, weight in FORMAT_GROWTH_WEIGHTS.items() if strategy.posting_frequency.get(f)
+            )
+            growth = history.growth_mean / 100 * (activity / BASELINE_ACTIVITY) ** GROWTH_ELASTICITY * boost \
+                + rng.gauss(0, history.growth_std / 100)
+            followers *= 1 + max(growth, -0.5)
+        finals.append(followers)
+    return np.percentile(finals, (10, 50, 90))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--simulations", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = StrategyEngine()
+    inputs = [(p, engine.match_strategy(p)) for p in random_profiles(args.accounts)]
+    histories = [prior_history(p) for p, _ in inputs]
+
+    print(f"계정 {args.accounts}개, 계정당 시간")
+    for simulations in sorted({1000, args.simulations, 20_000}):
+        started = time.perf_counter()
+        for (_, strategy), history in zip(inputs, histories):
+            simulate(strategy, history, simulations)
+        per_account = (time.perf_counter() - started) / len(inputs)
+        print(f"  시뮬레이션 {simulations:>6,}회: 벡터화 {per_account * 1000:7.2f} ms")
+
+    sample = inputs[:5]
+    started = time.perf_counter()
+    for (_, strategy), history in zip(sample, histories):
+        loop_simulate(strategy, history, args.simulations, 0)
+    loop_ms = (time.perf_counter() - started) / len(sample) * 1000
+    print(f"  시뮬레이션 {args.simulations:>6,}회: 파이썬 루프 {loop_ms:7.2f} ms (팔로워만, 계정 {len(sample)}개 표본)")
+
+    projections = ProjectionEngine(simulations=args.simulations)
+    for profile, strategy in inputs:
+        projections.project(profile, strategy)
+    started = time.perf_counter()
+    for profile, strategy in inputs:
+        projections.project(profile, strategy)
+    hit_us = (time.perf_counter() - started) / len(inputs) * 1e6
+    print(f"캐시 적중 (리런): {hit_us:,.0f} µs/계정, {projections.stats}")
+
+if __name__ == "__main__":
+    main()
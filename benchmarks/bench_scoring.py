@@ -0,0 +1,67 @@
+"""다요인 전략 점수 엔진 벤치마크
+
+무작위 프로필 N개(기본 100,000)를 한 번 인코딩한 뒤,
+가중치를 바꿔 전체를 재순위화(가중치 컴파일 + 행렬곱 + top-k)하는 시간을 측정합니다.
+
+    python benchmarks/bench_scoring.py --profiles 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import BUDGET_OPTIONS, GENDER_OPTIONS, SURVEY_DATA, TIME_OPTIONS, TONE_KEYS, profile_from_dict
+from scoring import DEFAULT_STRATEGY_WEIGHTS, StrategyScorer
+
+def random_profiles(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    goals = list(SURVEY_DATA["primary_goals"])
+    return [
+        profile_from_dict({
+            "id": str(i),
+            "business_stage": rng.choice(list(SURVEY_DATA["business_stages"])),
+            "business_type": rng.choice(list(SURVEY_DATA["business_types"])),
+            "instagram_status": rng.choice(list(SURVEY_DATA["instagram_statuses"])),
+            "target_age_group": rng.choice(list(SURVEY_DATA["age_groups"])),
+            "target_gender": rng.choice(GENDER_OPTIONS),
+            "primary_goals": rng.sample(goals, rng.randint(0, 3)),
+            "brand_archetype": rng.choice(list(SURVEY_DATA["brand_archetypes"])),
+            "tone_scores": {key: rng.randint(1, 10) for key in TONE_KEYS},
+            "time_available": rng.choice(TIME_OPTIONS),
+            "budget": rng.choice(BUDGET_OPTIONS),
+            "created_at": "2025-01-01T00:00:00"
+        })
+        for i in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    profiles = random_profiles(args.profiles)
+    scorer = StrategyScorer()
+
+    started = time.perf_counter()
+    X = scorer.encode(profiles)
+    encode_time = time.perf_counter() - started
+
+    # 가중치 변경 후 전체 재순위화
+    tweaked = {key: {f: w * 1.1 for f, w in features.items()} for key, features in DEFAULT_STRATEGY_WEIGHTS.items()}
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        scorer.set_weights(tweaked)
+        indices, scores = scorer.top_k(X, args.k)
+        timings.append(time.perf_counter() - started)
+
+    print(f"프로필 {len(profiles):,}개, 특성 {X.shape[1]}개, 전략 {len(scorer.strategy_keys)}개")
+    print(f"인코딩 (최초 1회):      {encode_time * 1000:8.1f} ms")
+    print(f"재순위화 (top-{args.k}, 최소): {min(timings) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""유사 브랜드 색인 벤치마크 (저장 프로필 N개, 기본 1,000,000)
+
+합성 프로필을 similarity.ProfileVectorizer 로 벡터화한 뒤 두 색인을 비교합니다.
+- FlatIndex: float32 전체 행렬곱 (정확)
+- IVFIndex: 구면 k-평균 역색인 + int8 벡터, nprobe 별 (근사)
+질의 1개 / 64개 묶음의 질의당 지연, 메모리, IVF 의 recall@k(FlatIndex 결과 대비), 설문 제출 1건의 증분 추가 시간을 출력합니다.
+
+    python benchmarks/bench_similarity.py --profiles 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bench_scoring import random_profiles
+from core import DIFFERENTIATION_OPTIONS, profile_from_dict, profile_to_dict
+from similarity import FlatIndex, IVFIndex, ProfileVectorizer
+
+CHUNK = 100_000
+
+def with_differentiation(profiles, seed: int):
+    rng = random.Random(seed)
+    return [
+        profile_from_dict({**profile_to_dict(p), "differentiation": rng.sample(DIFFERENTIATION_OPTIONS, rng.randint(0, 3))})
+        for p in profiles
+    ]
+
+def median_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+def recall(approx, exact, k: int) -> float:
+    """근사 결과가 정확한 k번째 점수 이상인 이웃을 찾은 비율 (동점 이웃은 어느 것이든 정답)"""
+    hits = []
+    for found, truth in zip(approx, exact):
+        threshold = truth[-1][1] - 1e-3
+        hits.append(min(sum(score >= threshold for _, score in found), k) / k)
+    return float(np.mean(hits))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    vectorizer = ProfileVectorizer()
+    vectors = np.empty((args.profiles, vectorizer.dim), dtype=np.float32)
+    vectorize_seconds = 0.0
+    for start in range(0, args.profiles, CHUNK):
+        profiles = with_differentiation(random_profiles(min(CHUNK, args.profiles - start), seed=start), start)
+        started = time.perf_counter()
+        vectors[start:start + len(profiles)] = vectorizer.transform(profiles)
+        vectorize_seconds += time.perf_counter() - started
+    ids = [str(i) for i in range(args.profiles)]
+    queries_profiles = with_differentiation(random_profiles(args.queries, seed=-1), -1)
+    queries = vectorizer.transform(queries_profiles)
+    print(f"프로필 {args.profiles:,}개, {vectorizer.dim}차원: 벡터화 {vectorize_seconds / args.profiles * 1e6:.1f} µs/개")
+
+    flat = FlatIndex(vectorizer.dim)
+    flat.add(ids, vectors)
+    exact = flat.search(queries, args.k)
+    print(f"\nFlatIndex (float32, {flat.vectors.nbytes / 1e6:,.0f} MB)")
+    print(f"  질의 1개: {median_ms(lambda: flat.search(queries[:1], args.k), 5):8.2f} ms")
+    print(f"  64개 묶음: {median_ms(lambda: flat.search(queries[:64], args.k), 3) / 64:8.2f} ms/질의")
+
+    started = time.perf_counter()
+    ivf = IVFIndex.train(vectors)
+    train_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    ivf.add(ids, vectors)
+    add_seconds = time.perf_counter() - started
+    size = sum(codes.nbytes for codes in ivf._codes) + sum(rows.nbytes for rows in ivf._rows)
+    print(f"\nIVFIndex (int8, 클러스터 {ivf.nlist:,}개, {size / 1e6:,.0f} MB): 학습 {train_seconds:.1f}s, 추가 {add_seconds:.1f}s")
+    for nprobe in (4, 8, 16, 32):
+        single = median_ms(lambda: ivf.search(queries[:1], args.k, nprobe), 20)
+        batch = median_ms(lambda: ivf.search(queries[:64], args.k, nprobe), 3) / 64
+        found = ivf.search(queries, args.k, nprobe)
+        print(f"  nprobe {nprobe:>2}: 질의 1개 {single:6.2f} ms, 64개 묶음 {batch:6.2f} ms/질의, "
+              f"recall@{args.k} {recall(found, exact, args.k):.3f}")
+
+    # 기존과 겹치지 않는 새 ID 로 한 건씩 추가
+    extra = with_differentiation(random_profiles(1, seed=10**9), 10**9)
+    new_ids = iter(f"new-{i}" for i in range(10**6))
+    insert_ms = median_ms(lambda: ivf.add([next(new_ids)], vectorizer.transform(extra)), 50)
+    print(f"\n설문 제출 1건 증분 추가 (벡터화 + IVF): {insert_ms:.2f} ms")
+
+if __name__ == "__main__":
+    main()
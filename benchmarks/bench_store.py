@@ -0,0 +1,70 @@
+"""ProfileStore 동시 세션 처리량 벤치마크
+
+여러 스레드(= Streamlit 세션)가 동시에 제출 결과를 저장하고 결과 페이지를 불러오는 상황을 재현합니다.
+
+    python benchmarks/bench_store.py --sessions 16 --submits 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scoring import random_profiles
+from core import StrategyEngine
+from store import ProfileStore
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=16, help="동시 세션(스레드) 수")
+    parser.add_argument("--submits", type=int, default=200, help="세션당 제출 수")
+    parser.add_argument("--batch-size", type=int, default=500, help="일괄 쓰기 크기")
+    args = parser.parse_args()
+
+    engine = StrategyEngine()
+    total = args.sessions * args.submits
+    pairs = [(p, engine.match_strategy(p)) for p in random_profiles(total)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProfileStore(os.path.join(tmp, "bench.db"))
+
+        # 1) 세션별 단건 저장 + 즉시 재조회 (설문 제출 직후 결과 페이지)
+        def session(worker: int):
+            for profile, strategy in pairs[worker::args.sessions]:
+                store.save(profile, strategy)
+                store.get(profile.id)
+            store.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        print(f"동시 세션 {args.sessions}개 단건 저장+조회: {total / elapsed:10,.0f} 제출/초")
+
+        # 2) 일괄 쓰기 (배치 처리 경로)
+        started = time.perf_counter()
+        for i in range(0, total, args.batch_size):
+            store.save_many(pairs[i:i + args.batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"일괄 쓰기 (트랜잭션당 {args.batch_size}건):   {total / elapsed:10,.0f} 건/초")
+
+        # 3) 필터 + 커서 페이지 조회
+        started = time.perf_counter()
+        pages, cursor = 0, None
+        while True:
+            _, cursor = store.list_page(limit=50, cursor=cursor, business_type="product")
+            pages += 1
+            if cursor is None:
+                break
+        elapsed = time.perf_counter() - started
+        print(f"business_type 필터 페이지 조회:        {pages / elapsed:10,.0f} 페이지/초 ({pages}페이지)")
+        store.close()
+
+if __name__ == "__main__":
+    main()
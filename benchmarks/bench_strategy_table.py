@@ -0,0 +1,67 @@
+"""설문 제출 1회당 전략 매칭 비용 마이크로 벤치마크
+
+이전 방식(제출마다 StrategyEngine 전략 dict 재생성 + 문자열 키 조회)과
+프로세스당 한 번 컴파일된 STRATEGY_TABLE 조회를 비교합니다.
+
+    python benchmarks/bench_strategy_table.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import STRATEGY_DEFINITIONS, STRATEGY_TABLE, SURVEY_DATA, StrategyEngine, profile_from_dict
+
+def _thaw(value):
+    if hasattr(value, "items"):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+# 원래 __init__ 의 중첩 dict 리터럴과 같은 바이트코드로 컴파일
+_LEGACY_LITERAL = compile(repr(_thaw(STRATEGY_DEFINITIONS)), "<legacy strategies>", "eval")
+
+def legacy_lookup(profile):
+    # 이전 StrategyEngine.__init__ 은 제출마다 중첩 dict 리터럴 전체를 새로 만들었다
+    strategies = eval(_LEGACY_LITERAL)
+    key = f"{profile.business_type}_{profile.primary_goals[0] if profile.primary_goals else 'awareness'}"
+    return strategies.get(key, strategies["product_awareness"])
+
+def compiled_lookup(profile):
+    goal = profile.primary_goals[0] if profile.primary_goals else "awareness"
+    return STRATEGY_TABLE[(profile.business_type, goal)]
+
+def main(number: int = 20000):
+    profiles = [
+        profile_from_dict({
+            "business_stage": "startup",
+            "business_type": business_type,
+            "target_age_group": "25-34",
+            "brand_archetype": "sage",
+            "primary_goals": [goal]
+        })
+        for business_type in SURVEY_DATA["business_types"]
+        for goal in SURVEY_DATA["primary_goals"]
+    ]
+
+    def run(fn):
+        return lambda: [fn(profile) for profile in profiles]
+
+    engine = StrategyEngine()
+    cases = [
+        ("전략 조회 (이전: dict 재생성)", run(legacy_lookup)),
+        ("전략 조회 (컴파일된 테이블)", run(compiled_lookup)),
+        ("match_strategy 전체 (주간 계획 포함)", run(engine.match_strategy)),
+    ]
+
+    loops = max(1, number // len(profiles))
+    print(f"조합 {len(profiles)}개 x {loops}회 반복")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=loops, repeat=5))
+        per_call = best / (loops * len(profiles)) * 1e6
+        print(f"{name:<40} {per_call:8.2f} µs/제출")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""계측(telemetry) 오버헤드 벤치마크
+
+빈 함수를 N번(기본 1,000,000) 호출하면서 계측 없음 / 계측 꺼짐 / 계측 켜짐일 때의
+호출당 추가 비용을 비교합니다 (span 컨텍스트 매니저와 timed 데코레이터 각각).
+
+    python benchmarks/bench_telemetry.py --calls 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry
+
+def work():
+    return None
+
+def loop_plain(calls: int):
+    for _ in range(calls):
+        work()
+
+def loop_span(calls: int):
+    span = telemetry.span
+    for _ in range(calls):
+        with span("bench.span"):
+            work()
+
+def loop_timed(func, calls: int):
+    for _ in range(calls):
+        func()
+
+def measure(func, *args) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    baseline = measure(loop_plain, args.calls)
+    print(f"계측 없음: 호출당 {baseline / args.calls * 1e9:7.1f} ns")
+
+    for enabled in (False, True):
+        telemetry.ENABLED = enabled
+        telemetry.REGISTRY.reset()
+        timed_work = telemetry.timed("bench.timed")(work)
+        span_time = measure(loop_span, args.calls)
+        timed_time = measure(loop_timed, timed_work, args.calls)
+        state = "켜짐" if enabled else "꺼짐"
+        print(f"계측 {state}: span 추가 {(span_time - baseline) / args.calls * 1e9:7.1f} ns/호출, "
+              f"timed 추가 {(timed_time - baseline) / args.calls * 1e9:7.1f} ns/호출")
+
+    row = next(row for row in telemetry.REGISTRY.snapshot() if row["span"] == "bench.span")
+    print(f"\n켜짐 상태 span 요약: {row['count']:,}회, p50 {row['p50_ms'] * 1000:.2f} µs, "
+          f"p95 {row['p95_ms'] * 1000:.2f} µs, p99 {row['p99_ms'] * 1000:.2f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""app.py 콜드 스타트 임포트 시간 리포트
+
+새 프로세스에서 `python -X importtime` 으로 app.py 를 임포트하고,
+최상위 패키지별 임포트 시간을 큰 순서대로 출력합니다.
+--pages 를 주면 페이지에서 지연 임포트하는 무거운 라이브러리의 추가 비용도 함께 측정합니다.
+
+    python benchmarks/import_time.py --top 15 --pages
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 페이지 함수 안에서 임포트되는 라이브러리
+LAZY_MODULES = ["pandas", "plotly.express", "numpy"]
+
+def import_times(statement: str):
+    """statement 를 새 인터프리터에서 실행하고 (모듈, 자체 시간 µs, 누적 시간 µs) 목록을 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def summarize(rows):
+    # 자체 시간(self)을 최상위 패키지 기준으로 합산 — 중복 집계 없이 합계가 전체 임포트 시간이 됨
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.strip().split(".")[0]] += self_us
+    return sorted(by_package.items(), key=lambda item: -item[1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수")
+    parser.add_argument("--pages", action="store_true", help="지연 임포트 라이브러리의 추가 비용도 측정")
+    args = parser.parse_args()
+
+    packages = summarize(import_times("import app"))
+    total = sum(elapsed for _, elapsed in packages)
+    print(f"app.py 임포트 합계: {total / 1000:8.1f} ms")
+    for name, elapsed in packages[:args.top]:
+        print(f"  {name:<30} {elapsed / 1000:8.1f} ms ({elapsed / total:5.1%})")
+
+    if args.pages:
+        print("\n페이지별 지연 임포트 추가 비용 (app 임포트 이후):")
+        for module in LAZY_MODULES:
+            before = {name.strip() for name, _, _ in import_times("import app")}
+            rows = import_times(f"import app; import {module}")
+            extra = sum(self_us for name, self_us, _ in rows if name.strip() not in before)
+            print(f"  {module:<30} {extra / 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""재현 가능한 성능 벤치마크 모음 (오프라인)
+
+1) 엔진: StrategyEngine.match_strategy, generate_weekly_plans, generate_brand_guide (캐시 미스 / 캐시 적중)
+2) 페이지: Streamlit 오프라인 앱 테스트 하네스(AppTest)로 각 페이지 함수(show_home, show_survey,
+   show_results, show_dashboard, show_portfolio, show_resources)를 포함한 전체 리런을 반복 측정
+
+저장소(SQLite)와 인사이트 저장소는 임시 디렉터리를 사용하고, 대시보드에는 합성 인사이트 데이터를 넣어
+네트워크나 기존 데이터 없이 같은 조건에서 실행됩니다. 결과는 JSON 으로 저장하며
+--compare 로 다른 커밋의 결과와 비교해 느려진 항목을 표시합니다.
+
+    python benchmarks/run.py                              # benchmarks/results/<커밋>.json 에 저장
+    python benchmarks/run.py --compare benchmarks/results/abc1234.json
+    python benchmarks/run.py --only engine --repeat 2000
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 저장소 경로는 모듈 임포트 시점에 환경 변수에서 읽으므로 임포트 전에 임시 디렉터리로 지정
+WORK_DIR = tempfile.mkdtemp(prefix="branding-bench-")
+os.environ["BRANDING_DB_PATH"] = os.path.join(WORK_DIR, "branding.db")
+os.environ["BRANDING_INSIGHTS_DIR"] = os.path.join(WORK_DIR, "insights")
+os.environ.setdefault("STREAMLIT_BROWSER_GATHER_USAGE_STATS", "false")
+
+import numpy as np
+import pandas as pd
+
+from bench_scoring import random_profiles
+from core import STRATEGY_DEFINITIONS, StrategyEngine
+
+APP_PATH = os.path.join(ROOT, "app.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PAGES = {
+    "show_home": "🏠 홈",
+    "show_survey": "📝 브랜딩 설문조사",
+    "show_results": "📊 결과 및 전략",
+    "show_dashboard": "📈 성과 대시보드",
+    "show_portfolio": "🗂️ 포트폴리오",
+    "show_resources": "📚 리소스"
+}
+
+# --compare 에서 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_RATIO = 1.2
+
+def summarize(samples):
+    """측정값(초) 목록 -> 통계 (ms)"""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p95_ms": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000
+    }
+
+def time_each(func, items):
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def bench_engine(repeat: int):
+    from guide import _documents, _renders, generate_brand_guide
+
+    engine = StrategyEngine()
+    profiles = random_profiles(repeat)
+    strategies = [engine.match_strategy(profile) for profile in profiles]
+    pairs = list(zip(profiles, strategies))
+
+    results = {
+        "engine.match_strategy": summarize(time_each(engine.match_strategy, profiles)),
+        "engine.generate_weekly_plans": summarize(
+            time_each(lambda profile: engine.generate_weekly_plans(profile, STRATEGY_DEFINITIONS["product_awareness"]), profiles)
+        )
+    }
+    _documents.clear()
+    _renders.clear()
+    results["guide.generate_brand_guide.cold"] = summarize(time_each(lambda pair: generate_brand_guide(*pair), pairs))
+    results["guide.generate_brand_guide.cached"] = summarize(time_each(lambda pair: generate_brand_guide(*pair), pairs))
+    return results
+
+def write_sample_insights(directory: str, days: int = 730, posts: int = 2000, seed: int = 42):
+    """대시보드용 합성 인사이트 내보내기 파일(일별 지표, 게시물 지표)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-01-01", periods=days, freq="D")
+    daily_path = os.path.join(directory, "daily.csv")
+    pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Followers": 1000 + np.cumsum(rng.integers(0, 30, days)),
+        "Reach": rng.integers(500, 5000, days),
+        "Impressions": rng.integers(1000, 9000, days),
+        "Website clicks": rng.integers(0, 60, days),
+        "Profile visits": rng.integers(20, 300, days),
+        "Likes": rng.integers(10, 300, days),
+        "Comments": rng.integers(0, 40, days)
+    }).to_csv(daily_path, index=False)
+
+    posts_path = os.path.join(directory, "posts.csv")
+    published = dates[0] + pd.to_timedelta(rng.integers(0, days * 86400, posts), unit="s")
+    pd.DataFrame({
+        "Post ID": [f"p{i}" for i in range(posts)],
+        "Publish time": published.strftime("%Y-%m-%d %H:%M:%S"),
+        "Post type": rng.choice(["REEL", "CAROUSEL_ALBUM", "IMAGE", "STORY"], posts),
+        "Reach": rng.integers(300, 8000, posts),
+        "Likes": rng.integers(5, 500, posts),
+        "Comments": rng.integers(0, 50, posts),
+        "Saves": rng.integers(0, 80, posts),
+        "Shares": rng.integers(0, 40, posts)
+    }).to_csv(posts_path, index=False)
+    return daily_path, posts_path
+
+def bench_pages(reruns: int):
+    from streamlit.testing.v1 import AppTest
+
+    from insights import InsightsStore
+
+    def check(at, step):
+        if at.exception:
+            raise RuntimeError(f"{step}: {at.exception}")
+
+    # 리런마다 찍히는 사용 중단 경고가 결과 출력을 가리지 않도록 (로그 레벨은 리런마다 설정값으로 초기화되므로 필터 사용)
+    logging.getLogger("streamlit.deprecation_util").addFilter(lambda record: False)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    started = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - started
+    check(at, "첫 실행")
+
+    # 설문 제출로 결과/대시보드 페이지에 필요한 세션 상태를 만든 뒤 인사이트 데이터 수집
+    at.sidebar.selectbox[0].set_value(PAGES["show_survey"]).run()
+    while not [button for button in at.button if "전략 생성" in str(button.label)]:
+        at.button(key="survey_next").click().run()
+        check(at, "설문 단계 이동")
+    [button for button in at.button if "전략 생성" in str(button.label)][0].click().run()
+    check(at, "설문 제출")
+    account = at.session_state["user_profile"].id
+    insights = InsightsStore()
+    daily_path, posts_path = write_sample_insights(WORK_DIR)
+    insights.ingest(account, daily_path, "daily")
+    insights.ingest(account, posts_path, "posts")
+
+    results = {"pages.first_run": summarize([first_run])}
+    for function, title in PAGES.items():
+        # 페이지 전환 리런 한 번 (캐시 워밍업), 이후 같은 페이지의 리런을 반복 측정
+        at.sidebar.selectbox[0].set_value(title).run()
+        check(at, function)
+        samples = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - started)
+            check(at, function)
+        results[f"pages.{function}"] = summarize(samples)
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(current, baseline):
+    print(f"\n기준 결과({baseline['commit']}) 대비 중앙값 비교:")
+    for name, stats in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"  {name:<40} (새 항목)")
+            continue
+        ratio = stats["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = "  ← 회귀" if ratio >= REGRESSION_RATIO else ""
+        print(f"  {name:<40} {before['median_ms']:10.3f} → {stats['median_ms']:10.3f} ms ({ratio:5.2f}배){flag}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", choices=["engine", "pages"], help="한쪽 묶음만 실행")
+    parser.add_argument("--repeat", type=int, default=1000, help="엔진 벤치마크 반복 횟수")
+    parser.add_argument("--reruns", type=int, default=10, help="페이지별 리런 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<커밋>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    import streamlit
+
+    # 결과를 같은 경로에 덮어쓸 수 있으므로 비교 대상은 먼저 읽어 둔다
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    benchmarks = {}
+    try:
+        if args.only in (None, "engine"):
+            benchmarks.update(bench_engine(args.repeat))
+        if args.only in (None, "pages"):
+            benchmarks.update(bench_pages(args.reruns))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    result = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {"streamlit": streamlit.__version__, "pandas": pd.__version__, "numpy": np.__version__},
+        "settings": {"repeat": args.repeat, "reruns": args.reruns},
+        "benchmarks": benchmarks
+    }
+
+    for name, stats in benchmarks.items():
+        print(f"{name:<40} 중앙값 {stats['median_ms']:10.3f} ms  p95 {stats['p95_ms']:10.3f} ms  (n={stats['n']})")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if baseline is not None:
+        compare(result, baseline)
+
+if __name__ == "__main__":
+    main()
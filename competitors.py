@@ -0,0 +1,332 @@
+"""경쟁사 공개 프로필 지표 수집 (asyncio 동시 조회 + 공급원별 속도 제한 + TTL 캐시)
+
+설문에서 입력한 경쟁사 계정마다 공개 프로필 지표(팔로워, 게시물 수, 평균 좋아요/댓글)를
+교체 가능한 데이터 공급원(CompetitorSource)에서 가져옵니다.
+- 여러 계정은 asyncio.gather 로 동시에 조회하므로 결과 페이지가 순차 조회를 기다리지 않습니다.
+- 공급원마다 토큰 버킷으로 초당 요청 수를 제한합니다 (모든 세션 공유, 스레드 안전).
+- 조회 결과는 프로세스 전역 TTL 캐시에 보관하고, 실패는 짧은 TTL 로 캐시해 같은 오류를 반복 요청하지 않습니다.
+
+공급원은 환경 변수 BRANDING_COMPETITOR_SOURCE 에 JSON API 기본 URL 을 지정해 켭니다
+(GET <URL>/profiles/<계정> -> {"followers", "following", "posts", "avg_likes", "avg_comments"}).
+개발/테스트용으로 같은 형식을 흉내 내는 로컬 대체 서버를 함께 제공합니다.
+
+사용 예:
+    python competitors.py serve --port 8765 --delay 0.2
+    BRANDING_COMPETITOR_SOURCE=http://127.0.0.1:8765 streamlit run app.py
+    python competitors.py fetch nike adidas --source http://127.0.0.1:8765
+"""
+import abc
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_SOURCE_URL = os.environ.get("BRANDING_COMPETITOR_SOURCE", "")
+DEFAULT_RATE = float(os.environ.get("BRANDING_COMPETITOR_RATE", "5"))
+DEFAULT_TTL = float(os.environ.get("BRANDING_COMPETITOR_TTL", "3600"))
+DEFAULT_ERROR_TTL = 60.0
+DEFAULT_TIMEOUT = 5.0
+
+_HANDLE_RE = re.compile(r"^[a-z0-9._]{1,30}$")
+_PROFILE_URL_RE = re.compile(r"^(https?://)?(www\.)?instagram\.com/", re.IGNORECASE)
+
+class CompetitorFetchError(Exception):
+    """공급원이 프로필 지표를 돌려주지 못함 (없는 계정, 잘못된 응답 등)"""
+
+def normalize_handle(text: str) -> Optional[str]:
+    """'@Nike', 'instagram.com/nike/' 같은 입력을 'nike' 로 정규화 (계정명 형식이 아니면 None)"""
+    handle = _PROFILE_URL_RE.sub("", text.strip()).strip("/").lstrip("@").lower()
+    return handle if _HANDLE_RE.match(handle) else None
+
+@dataclass(frozen=True, slots=True)
+class CompetitorStats:
+    handle: str
+    source: str
+    fetched_at: float
+    followers: int = 0
+    following: int = 0
+    posts: int = 0
+    avg_likes: float = 0.0
+    avg_comments: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    @property
+    def engagement_rate(self) -> float:
+        """게시물당 평균 (좋아요 + 댓글) / 팔로워 (%)"""
+        if not self.followers:
+            return 0.0
+        return round((self.avg_likes + self.avg_comments) / self.followers * 100, 2)
+
+    @classmethod
+    def from_raw(cls, handle: str, source: str, raw: Dict) -> "CompetitorStats":
+        try:
+            return cls(
+                handle=handle,
+                source=source,
+                fetched_at=time.time(),
+                followers=int(raw["followers"]),
+                following=int(raw.get("following", 0)),
+                posts=int(raw.get("posts", 0)),
+                avg_likes=float(raw.get("avg_likes", 0.0)),
+                avg_comments=float(raw.get("avg_comments", 0.0))
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise CompetitorFetchError(f"잘못된 응답 형식: {e!r}") from e
+
+    @classmethod
+    def failed(cls, handle: str, source: str, error: str) -> "CompetitorStats":
+        return cls(handle=handle, source=source, fetched_at=time.time(), error=error)
+
+class CompetitorSource(abc.ABC):
+    """경쟁사 지표 공급원 추상 기본 클래스
+
+    fetch() 는 계정 하나의 원본 지표 딕셔너리를 돌려주는 코루틴입니다.
+    rate/burst 는 이 공급원에 허용되는 초당 요청 수와 순간 최대 요청 수입니다.
+    """
+    name = "base"
+    rate = DEFAULT_RATE
+    burst = 5
+
+    @abc.abstractmethod
+    async def fetch(self, handle: str) -> Dict:
+        """계정 하나의 원본 지표 (실패하면 CompetitorFetchError)"""
+
+class HTTPJsonSource(CompetitorSource):
+    """GET <base_url>/profiles/<계정> 형식의 JSON API (요청은 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+
+    def __init__(self, base_url: str, rate: float = DEFAULT_RATE, burst: int = 5, timeout: float = DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.name = urllib.parse.urlsplit(self.base_url).netloc or self.base_url
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+
+    def _get(self, handle: str) -> Dict:
+        url = f"{self.base_url}/profiles/{urllib.parse.quote(handle)}"
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                data = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            raise CompetitorFetchError("계정을 찾을 수 없음" if e.code == 404 else f"HTTP {e.code}") from e
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise CompetitorFetchError("JSON 이 아닌 응답") from e
+        except http.client.HTTPException as e:
+            # IncompleteRead 등 OSError 가 아닌 HTTP 프로토콜 오류
+            raise CompetitorFetchError(f"HTTP 응답 오류: {type(e).__name__}") from e
+        if not isinstance(data, dict):
+            raise CompetitorFetchError("잘못된 응답 형식: JSON 객체가 아님")
+        return data
+
+    async def fetch(self, handle: str) -> Dict:
+        return await asyncio.to_thread(self._get, handle)
+
+def source_from_env() -> Optional[CompetitorSource]:
+    return HTTPJsonSource(DEFAULT_SOURCE_URL) if DEFAULT_SOURCE_URL else None
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (세션마다 이벤트 루프가 달라도 공유할 수 있도록 threading.Lock 사용)
+
+    토큰이 없으면 잔액을 음수로 예약해 두고 그만큼 기다리므로, 동시에 들어온 요청도 순서대로 간격이 벌어집니다.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class TTLCache:
+    """항목별 만료 시각이 있는 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float = None):
+        with self._lock:
+            self._items[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+class CompetitorFetcher:
+    """공급원 하나에 대한 동시 조회기 (속도 제한기와 캐시는 인스턴스에 묶여 모든 세션이 공유)"""
+
+    def __init__(self, source: CompetitorSource, ttl: float = DEFAULT_TTL, error_ttl: float = DEFAULT_ERROR_TTL,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.source = source
+        self.limiter = TokenBucket(source.rate, source.burst)
+        self.cache = TTLCache(ttl)
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+
+    async def fetch(self, handle: str) -> CompetitorStats:
+        cached = self.cache.get(handle)
+        if cached is not None:
+            return cached
+        await self.limiter.acquire()
+        ttl = None
+        try:
+            raw = await asyncio.wait_for(self.source.fetch(handle), self.timeout)
+            stats = CompetitorStats.from_raw(handle, self.source.name, raw)
+        except asyncio.TimeoutError:
+            stats, ttl = CompetitorStats.failed(handle, self.source.name, "응답 시간 초과"), self.error_ttl
+        except (CompetitorFetchError, OSError) as e:
+            stats, ttl = CompetitorStats.failed(handle, self.source.name, str(e)), self.error_ttl
+        except Exception as e:
+            # 공급원 구현의 예상치 못한 오류도 계정 하나의 실패로 처리 (gather 전체와 화면을 멈추지 않음)
+            stats, ttl = CompetitorStats.failed(handle, self.source.name, f"{type(e).__name__}: {e}"), self.error_ttl
+        self.cache.set(handle, stats, ttl)
+        return stats
+
+    async def fetch_many(self, handles: Iterable[str]) -> List[CompetitorStats]:
+        """입력 순서대로 정규화된 (중복 제거) 계정들의 지표를 동시에 조회"""
+        unique = list(dict.fromkeys(h for h in map(normalize_handle, handles) if h))
+        return list(await asyncio.gather(*(self.fetch(handle) for handle in unique)))
+
+    def fetch_all(self, handles: Iterable[str]) -> List[CompetitorStats]:
+        """동기 코드(Streamlit 스크립트 스레드)에서 호출하는 진입점"""
+        return asyncio.run(self.fetch_many(handles))
+
+# --- 로컬 대체 서버 (개발/테스트용) ---
+
+def standin_stats(handle: str) -> Dict:
+    """계정명에서 결정적으로 만든 가짜 프로필 지표"""
+    seed = int.from_bytes(hashlib.sha256(handle.encode("utf-8")).digest()[:8], "big")
+    followers = 1_000 + seed % 500_000
+    return {
+        "followers": followers,
+        "following": (seed >> 20) % 2_000,
+        "posts": 10 + (seed >> 32) % 3_000,
+        "avg_likes": round(followers * (0.005 + (seed >> 40) % 40 / 1000), 1),
+        "avg_comments": round(followers * (0.0005 + (seed >> 48) % 10 / 10000), 1)
+    }
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        if server.delay:
+            time.sleep(server.delay)
+        parts = urllib.parse.urlsplit(self.path).path.strip("/").split("/")
+        handle = urllib.parse.unquote(parts[1]) if len(parts) == 2 and parts[0] == "profiles" else None
+        if handle is None or normalize_handle(handle) != handle or handle in server.missing:
+            self._send(404, {"error": "not found"})
+        else:
+            self._send(200, standin_stats(handle))
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_standin_server(host: str = "127.0.0.1", port: int = 0, delay: float = 0.0,
+                         missing: Iterable[str] = ()) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 대체 서버 시작 (port=0 이면 빈 포트). 종료는 server.shutdown()
+
+    delay 는 요청당 인위적 지연(초), missing 의 계정은 404 를 돌려줍니다.
+    server.requests 에 받은 요청 수가 누적됩니다.
+    """
+    server = ThreadingHTTPServer((host, port), _StandInHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.missing = set(missing)
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, name="competitor-standin", daemon=True).start()
+    return server
+
+def standin_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+def main():
+    parser = argparse.ArgumentParser(description="경쟁사 프로필 지표 조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="로컬 대체 서버 실행")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--delay", type=float, default=0.0, help="요청당 인위적 지연(초)")
+
+    fetch = sub.add_parser("fetch", help="계정 지표 조회")
+    fetch.add_argument("handles", nargs="+")
+    fetch.add_argument("--source", default=DEFAULT_SOURCE_URL, help="JSON API 기본 URL")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = start_standin_server(args.host, args.port, args.delay)
+        print(f"대체 서버 실행 중: {standin_url(server)} (Ctrl+C 로 종료)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        if not args.source:
+            parser.error("--source 또는 BRANDING_COMPETITOR_SOURCE 가 필요합니다")
+        for stats in CompetitorFetcher(HTTPJsonSource(args.source)).fetch_all(args.handles):
+            if stats.ok:
+                print(f"@{stats.handle}: 팔로워 {stats.followers:,}, 게시물 {stats.posts:,}, 참여율 {stats.engagement_rate}%")
+            else:
+                print(f"@{stats.handle}: 오류 - {stats.error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""12주 콘텐츠 캘린더 생성 및 ICS/CSV 내보내기
+
+전략의 posting_frequency(주간 포맷별 게시 수)를 한 주짜리 게시 슬롯 템플릿(요일 오프셋, 시각, 포맷)으로
+펼친 뒤, 설문 제출일(created_at) 다음 날부터 12주 동안의 날짜를 numpy datetime64 브로드캐스팅으로 계산합니다.
+content_pillars 는 시간순으로 돌아가며 각 슬롯에 배정됩니다.
+
+템플릿은 posting_frequency 별로 한 번만 만들고, 여러 고객을 처리할 때는 같은 템플릿을 쓰는 고객들의
+시작일 배열에 한 번에 더하므로 고객 수백 명도 행렬 연산 한 번으로 계산됩니다.
+내보내기는 청크 단위로 계산해 행/줄 단위로 바로 기록하므로 전체 캘린더를 메모리에 올리지 않습니다.
+
+사용 예 (batch.py 결과를 입력으로):
+    python content_calendar.py out/strategies.jsonl calendars/
+    -> calendars/calendar.csv, calendars/ics/<프로필 ID>.ics (core.safe_filename)
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from core import BrandStrategy, UserProfile, profile_from_dict, safe_filename, strategy_from_dict
+
+WEEKS = 12
+EVENT_MINUTES = 30
+DEFAULT_CHUNK_SIZE = 256
+
+# 포맷별 기본 게시 시각 (분). 같은 날 같은 포맷이 여러 번이면 STACK_MINUTES 씩 뒤로 미룸
+FORMAT_MINUTES = {"릴스": 19 * 60, "캐러셀": 12 * 60, "싱글포스트": 9 * 60, "스토리": 10 * 60}
+DEFAULT_FORMAT_MINUTES = 15 * 60
+STACK_MINUTES = {"스토리": 3 * 60}
+DEFAULT_STACK_MINUTES = 2 * 60
+
+WEEKDAYS = np.array(["월", "화", "수", "목", "금", "토", "일"])
+CSV_HEADER = ["프로필 ID", "주차", "날짜", "시간", "요일", "포맷", "콘텐츠 필러"]
+
+@dataclass(frozen=True, eq=False)
+class SlotTemplate:
+    """한 주 동안의 게시 슬롯 (시간순). offsets 는 주 시작 시점부터의 분
+
+    posting_frequency 별로 캐시된 객체 하나를 공유하므로 동일성(id)으로 비교/해시합니다.
+    """
+    offsets: np.ndarray
+    formats: Tuple[str, ...]
+
+@lru_cache(maxsize=64)
+def _slot_template(frequency: Tuple[Tuple[str, int], ...]) -> SlotTemplate:
+    slots = []
+    for content_format, count in frequency:
+        # 주간 게시 수를 7일에 고르게 분산하고, 같은 날 겹치는 슬롯은 시각을 뒤로 미룸
+        days = np.arange(count) * 7 // count
+        stack = np.arange(count) - np.searchsorted(days, days)
+        minutes = FORMAT_MINUTES.get(content_format, DEFAULT_FORMAT_MINUTES) \
+            + stack * STACK_MINUTES.get(content_format, DEFAULT_STACK_MINUTES)
+        slots.extend((int(offset), content_format) for offset in days * 1440 + np.minimum(minutes, 1439))
+    slots.sort()
+    offsets = np.array([offset for offset, _ in slots], dtype=np.int64)
+    offsets.setflags(write=False)
+    return SlotTemplate(offsets, tuple(content_format for _, content_format in slots))
+
+def slot_template(posting_frequency: Mapping[str, int]) -> SlotTemplate:
+    """posting_frequency 의 포맷별 주간 게시 수로 만든 템플릿 (총_게시물 합계 항목은 제외, 캐시됨)"""
+    return _slot_template(tuple((k, int(v)) for k, v in posting_frequency.items() if k != "총_게시물" and v > 0))
+
+def calendar_start(created_at: str) -> np.datetime64:
+    """캘린더 시작일 (설문 제출 다음 날)"""
+    return np.datetime64(created_at[:10], "D") + 1
+
+def slot_starts(starts: np.ndarray, template: SlotTemplate, weeks: int = WEEKS) -> np.ndarray:
+    """시작일 배열(고객 수,) -> 게시 시각 행렬 (고객 수, weeks * 주간 슬롯 수), datetime64[m]"""
+    week_offsets = (np.arange(weeks, dtype=np.int64) * 7 * 1440)[:, None] + template.offsets[None, :]
+    return starts.astype("datetime64[m]")[:, None] + week_offsets.reshape(1, -1).astype("timedelta64[m]")
+
+@dataclass(frozen=True)
+class ContentCalendar:
+    profile_id: str
+    strategy_name: str
+    starts: np.ndarray          # datetime64[m], 시간순
+    formats: Tuple[str, ...]    # 한 주 템플릿의 포맷 (slot i 의 포맷은 formats[i % len(formats)])
+    pillars: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def rows(self) -> Iterator[Tuple]:
+        """(주차, 날짜, 시간, 요일, 포맷, 콘텐츠 필러) 행"""
+        per_week = len(self.formats)
+        days = self.starts.astype("datetime64[D]")
+        dates = np.datetime_as_string(days).tolist()
+        times = np.datetime_as_string(self.starts).tolist()
+        weekdays = WEEKDAYS[(days.astype(np.int64) + 3) % 7].tolist()  # 1970-01-01 은 목요일
+        pillars = self.pillars or ("",)
+        for i in range(len(dates)):
+            yield i // per_week + 1, dates[i], times[i][11:16], weekdays[i], self.formats[i % per_week], pillars[i % len(pillars)]
+
+def build_calendars(pairs: Iterable[Tuple[UserProfile, BrandStrategy]], weeks: int = WEEKS) -> List[ContentCalendar]:
+    """여러 고객의 캘린더를 같은 템플릿끼리 묶어 한 번에 계산 (입력 순서 유지)"""
+    pairs = list(pairs)
+    groups = {}
+    for i, (profile, strategy) in enumerate(pairs):
+        groups.setdefault(slot_template(strategy.posting_frequency), []).append(i)
+
+    calendars = [None] * len(pairs)
+    for template, indices in groups.items():
+        starts = np.array([calendar_start(pairs[i][0].created_at) for i in indices])
+        matrix = slot_starts(starts, template, weeks)
+        for row, i in enumerate(indices):
+            profile, strategy = pairs[i]
+            calendars[i] = ContentCalendar(
+                profile.id, strategy.strategy_name, matrix[row], template.formats, tuple(strategy.content_pillars)
+            )
+    return calendars
+
+def build_calendar(profile: UserProfile, strategy: BrandStrategy, weeks: int = WEEKS) -> ContentCalendar:
+    return build_calendars([(profile, strategy)], weeks)[0]
+
+def iter_calendars(pairs: Iterable[Tuple[UserProfile, BrandStrategy]], weeks: int = WEEKS,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ContentCalendar]:
+    """입력을 chunk_size 명씩 읽어 계산하며 캘린더를 하나씩 반환 (메모리는 청크 크기에 비례)"""
+    pairs = iter(pairs)
+    while True:
+        chunk = list(islice(pairs, chunk_size))
+        if not chunk:
+            return
+        yield from build_calendars(chunk, weeks)
+
+# --- CSV ---
+
+def write_csv(calendars: Iterable[ContentCalendar], f: IO[str], header: bool = True) -> int:
+    """캘린더들을 한 CSV 로 기록하고 기록한 슬롯 수를 반환"""
+    writer = csv.writer(f)
+    if header:
+        writer.writerow(CSV_HEADER)
+    count = 0
+    for calendar in calendars:
+        for row in calendar.rows():
+            writer.writerow((calendar.profile_id,) + row)
+            count += 1
+    return count
+
+def calendar_csv(calendar: ContentCalendar) -> str:
+    buffer = io.StringIO()
+    write_csv([calendar], buffer)
+    return buffer.getvalue()
+
+# --- ICS (RFC 5545) ---
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _fold(line: str) -> str:
+    """75 옥텟을 넘는 줄을 접음 (UTF-8 문자 중간에서 자르지 않음)"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts, current, size = [], [], 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > (75 if not parts else 74):
+            parts.append("".join(current))
+            current, size = [], 0
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
+
+def iter_ics(calendar: ContentCalendar, stamp: str = None) -> Iterator[str]:
+    """VCALENDAR 한 개를 일정(VEVENT) 단위 문자열로 생성, 줄 끝은 CRLF (시각은 현지 시각 기준 floating time)"""
+    stamp = stamp or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    ends = calendar.starts + np.timedelta64(EVENT_MINUTES, "m")
+    start_text = np.char.replace(np.char.replace(np.datetime_as_string(calendar.starts), "-", ""), ":", "").tolist()
+    end_text = np.char.replace(np.char.replace(np.datetime_as_string(ends), "-", ""), ":", "").tolist()
+    description = _escape(calendar.strategy_name)
+    summaries = {}
+
+    yield ("BEGIN:VCALENDAR\r\n"
+           "VERSION:2.0\r\n"
+           "PRODID:-//Instagram Branding Expert//Content Calendar//KO\r\n"
+           "CALSCALE:GREGORIAN\r\n")
+    for i, (week, _, _, _, content_format, pillar) in enumerate(calendar.rows()):
+        # 포맷 x 필러 조합은 몇 개뿐이므로 이스케이프/접기 결과를 재사용
+        summary = summaries.get((content_format, pillar))
+        if summary is None:
+            text = f"[{content_format}] {pillar}" if pillar else f"[{content_format}]"
+            summary = summaries[(content_format, pillar)] = _fold(f"SUMMARY:{_escape(text)}")
+        yield (
+            "BEGIN:VEVENT\r\n"
+            f"UID:{calendar.profile_id}-{i}@branding-calendar\r\n"
+            f"DTSTAMP:{stamp}\r\n"
+            f"DTSTART:{start_text[i]}00\r\n"
+            f"DTEND:{end_text[i]}00\r\n"
+            f"{summary}\r\n"
+            f"{_fold(f'DESCRIPTION:{description} · {week}주차')}\r\n"
+            "END:VEVENT\r\n"
+        )
+    yield "END:VCALENDAR\r\n"
+
+def calendar_ics(calendar: ContentCalendar) -> str:
+    return "".join(iter_ics(calendar))
+
+# --- 일괄 내보내기 ---
+
+def read_strategies(path: str) -> Iterator[Tuple[UserProfile, BrandStrategy]]:
+    """batch.py 의 strategies.jsonl 을 한 줄씩 읽음"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield profile_from_dict(record["profile"]), strategy_from_dict(record["strategy"])
+
+def export_bulk(pairs: Iterable[Tuple[UserProfile, BrandStrategy]], output_dir: str, weeks: int = WEEKS,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Mapping[str, int]:
+    """전체 고객의 CSV 한 개와 고객별 ICS 파일을 스트리밍으로 기록"""
+    ics_dir = os.path.join(output_dir, "ics")
+    os.makedirs(ics_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    stats = {"calendars": 0, "slots": 0}
+    # Excel 에서 한글이 깨지지 않도록 BOM 포함
+    with open(os.path.join(output_dir, "calendar.csv"), "w", encoding="utf-8-sig", newline="") as out:
+        write_csv([], out)
+        for calendar in iter_calendars(pairs, weeks, chunk_size):
+            stats["slots"] += write_csv([calendar], out, header=False)
+            with open(os.path.join(ics_dir, safe_filename(calendar.profile_id, "ics")), "w", encoding="utf-8",
+                      newline="") as f:
+                f.writelines(iter_ics(calendar, stamp))
+            stats["calendars"] += 1
+    return stats
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="전략 결과로 12주 콘텐츠 캘린더(ICS/CSV)를 일괄 생성합니다.")
+    parser.add_argument("input", help="batch.py 가 만든 strategies.jsonl")
+    parser.add_argument("output_dir", help="결과를 기록할 디렉터리")
+    parser.add_argument("--weeks", type=int, default=WEEKS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="한 번에 계산할 고객 수")
+    args = parser.parse_args(argv)
+
+    stats = export_bulk(read_strategies(args.input), args.output_dir, args.weeks, args.chunk_size)
+    print(f"완료: 캘린더 {stats['calendars']:,}개, 게시 슬롯 {stats['slots']:,}개", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""브랜딩 도메인 모델과 전략 매칭 엔진
+
+Streamlit 없이도 임포트할 수 있도록 app.py 에서 분리한 모듈입니다.
+배치 처리(batch.py) 등 헤드리스 실행 경로에서 그대로 재사용합니다.
+
+세션마다 UserProfile/BrandStrategy 를 하나씩 들고 있으므로 둘 다 작게 유지합니다.
+- __slots__ 데이터 클래스 (인스턴스 __dict__ 없음)
+- 범주형 코드(business_type 등)는 sys.intern 으로 프로세스 전체에서 한 객체를 공유
+- 목록 필드는 튜플, 전략의 매핑 필드와 주간 계획은 읽기 전용 공유 객체(플라이웨이트)
+JSON 직렬화는 profile_to_dict / strategy_to_dict 를 사용합니다.
+"""
+from datetime import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple
+import hashlib
+import re
+import sys
+import uuid
+
+import reference
+
+# 프로필의 범주형 필드 (설문 선택지 코드/라벨)
+_CATEGORY_FIELDS = (
+    "business_stage", "business_type", "instagram_status", "target_age_group",
+    "target_gender", "brand_archetype", "time_available", "budget"
+)
+
+def _interned(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
+
+@lru_cache(maxsize=4096)
+def _shared_mapping(items: Tuple) -> Mapping:
+    # 내용이 같은 매핑은 세션 간에 한 객체를 공유 (읽기 전용)
+    return MappingProxyType(dict(items))
+
+def shared_mapping(value: Mapping) -> Mapping:
+    """dict 를 내용 기준으로 공유되는 읽기 전용 매핑으로 변환 (이미 공유 매핑이면 그대로)"""
+    if isinstance(value, MappingProxyType):
+        return value
+    return _shared_mapping(tuple((sys.intern(key), item) for key, item in value.items()))
+
+# 데이터 클래스 정의
+@dataclass(slots=True)
+class UserProfile:
+    id: str
+    business_stage: str
+    business_type: str
+    instagram_status: str
+    target_age_group: str
+    target_gender: str
+    primary_goals: Tuple[str, ...]
+    brand_archetype: str
+    tone_scores: Mapping[str, int]
+    competitors: Tuple[str, ...]
+    differentiation: Tuple[str, ...]
+    time_available: str
+    budget: str
+    tools_available: Tuple[str, ...]
+    created_at: str
+
+    def __post_init__(self):
+        for name in _CATEGORY_FIELDS:
+            setattr(self, name, sys.intern(getattr(self, name)))
+        self.primary_goals = _interned(self.primary_goals)
+        self.differentiation = _interned(self.differentiation)
+        self.tools_available = _interned(self.tools_available)
+        self.competitors = tuple(self.competitors)
+        self.tone_scores = shared_mapping(self.tone_scores)
+
+@dataclass(frozen=True, slots=True)
+class WeeklyPlan:
+    week: int
+    phase: str
+    tasks: Tuple[str, ...]
+    kpi_focus: str
+
+@dataclass(slots=True)
+class BrandStrategy:
+    brand_type: str
+    strategy_name: str
+    content_pillars: Tuple[str, ...]
+    posting_frequency: Mapping[str, int]
+    content_mix: Mapping[str, int]
+    recommended_tools: Tuple[str, ...]
+    kpi_targets: Mapping[str, float]
+    weekly_plans: Tuple[WeeklyPlan, ...]
+
+# 설문 선택지, 전략 정의, 성과 기준은 참조 데이터 팩(data/reference.json)에서 프로세스 시작 시 한 번 읽음
+# (읽기 전용 공유 객체, 바뀐 값은 재시작 시 반영 - reference.py 참고)
+_REFERENCE = reference.LOADER.initial
+
+# 설문 데이터 정의
+SURVEY_DATA = MappingProxyType({name: _REFERENCE.survey[name] for name in reference.SURVEY_CHOICES})
+
+# 설문에서 선택한 문구가 그대로 저장되는 항목의 선택지
+GENDER_OPTIONS = _REFERENCE.survey["gender_options"]
+DIFFERENTIATION_OPTIONS = _REFERENCE.survey["differentiation_options"]
+TIME_OPTIONS = _REFERENCE.survey["time_options"]
+BUDGET_OPTIONS = _REFERENCE.survey["budget_options"]
+TOOL_OPTIONS = _REFERENCE.survey["tool_options"]
+
+# 주요 목표별 기본 전략 (목표 미선택 시 awareness 로 간주)
+GOAL_STRATEGY_ROUTES = _REFERENCE.strategies["goal_routes"]
+
+# 사업 분야 특성상 목표별 기본값과 다른 전략이 맞는 조합
+BUSINESS_STRATEGY_OVERRIDES = MappingProxyType({
+    (override["business_type"], override["goal"]): override["strategy"]
+    for override in _REFERENCE.strategies["business_overrides"]
+})
+
+DEFAULT_STRATEGY_KEY = _REFERENCE.strategies["default"]
+
+def _compile_strategy_table() -> Mapping[Tuple[str, str], Mapping]:
+    """모든 business_types x primary_goals 조합을 전략 정의에 직접 연결한 조회 테이블 생성"""
+    table = {}
+    for business_type in SURVEY_DATA["business_types"]:
+        for goal in SURVEY_DATA["primary_goals"]:
+            key = BUSINESS_STRATEGY_OVERRIDES.get((business_type, goal), GOAL_STRATEGY_ROUTES[goal])
+            table[(business_type, goal)] = STRATEGY_DEFINITIONS[key]
+    return MappingProxyType(table)
+
+# 프로세스당 한 번만 컴파일되어 모든 세션이 공유하는 읽기 전용 테이블
+STRATEGY_DEFINITIONS = _REFERENCE.strategies["definitions"]
+STRATEGY_TABLE = _compile_strategy_table()
+
+# 전략 매칭 엔진
+class StrategyEngine:
+    def __init__(self):
+        self.strategies = STRATEGY_DEFINITIONS
+        self.table = STRATEGY_TABLE
+    
+    def match_strategy(self, profile: UserProfile) -> BrandStrategy:
+        # 비즈니스 타입과 주요 목표를 기반으로 전략 매칭
+        goal = profile.primary_goals[0] if profile.primary_goals else "awareness"
+        strategy_data = self.table.get((profile.business_type, goal))
+        if strategy_data is None:
+            # 설문 항목에 없는 조합은 기본 전략
+            strategy_data = self.strategies[DEFAULT_STRATEGY_KEY]
+        
+        # 주간 계획 생성
+        weekly_plans = self.generate_weekly_plans(profile, strategy_data)
+        
+        # 공유 테이블의 값은 읽기 전용(튜플/MappingProxyType)이므로 복사 없이 그대로 참조
+        return BrandStrategy(
+            brand_type=strategy_data["brand_type"],
+            strategy_name=strategy_data["strategy_name"],
+            content_pillars=strategy_data["content_pillars"],
+            posting_frequency=strategy_data["posting_frequency"],
+            content_mix=strategy_data["content_mix"],
+            recommended_tools=strategy_data["recommended_tools"],
+            kpi_targets=strategy_data["kpi_targets"],
+            weekly_plans=weekly_plans
+        )
+    
+    def generate_weekly_plans(self, profile: UserProfile, strategy_data: Mapping) -> Tuple[WeeklyPlan, ...]:
+        # 12주 계획은 (주간 게시물 수, 주요 KPI) 로만 결정되므로 같은 조합은 세션 간에 같은 튜플을 공유
+        kpi_focus = next(iter(strategy_data["kpi_targets"]), "팔로워 증가")
+        return _weekly_plans(strategy_data["posting_frequency"]["총_게시물"], kpi_focus)
+
+# 단계별 할 일 템플릿 (모든 주간 계획이 공유)
+FOUNDATION_TASKS = (
+    "인스타그램 비즈니스 계정 설정 및 최적화",
+    "브랜드 아이덴티티 가이드 문서 작성",
+    "경쟁사 분석 및 벤치마킹",
+    "콘텐츠 필러 정의 및 스타일 가이드 작성"
+)
+GROWTH_TASKS = (
+    "유료 광고 캠페인 테스트 런칭",
+    "인플루언서 협업 기획",
+    "UGC 캠페인 실행",
+    "크로스 플랫폼 콘텐츠 전략 구현"
+)
+
+@lru_cache(maxsize=256)
+def _execution_tasks(total_posts: int) -> Tuple[str, ...]:
+    return (
+        f"{total_posts}개 포스트 제작 및 게시",
+        "스토리 인터랙티브 콘텐츠 일일 게시",
+        "댓글 및 DM 응답 (24시간 내)",
+        "주간 성과 분석 및 최적화"
+    )
+
+@lru_cache(maxsize=1024)
+def weekly_plan(week: int, phase: str, tasks: Tuple[str, ...], kpi_focus: str) -> WeeklyPlan:
+    """내용이 같은 주간 계획은 한 객체를 공유"""
+    return WeeklyPlan(week, sys.intern(phase), tasks, sys.intern(kpi_focus))
+
+@lru_cache(maxsize=256)
+def _weekly_plans(total_posts: int, kpi_focus: str) -> Tuple[WeeklyPlan, ...]:
+    plans = []
+    for week in range(1, 13):  # 12주 계획
+        if week <= 2:
+            phase, tasks = "브랜드 파운데이션", FOUNDATION_TASKS
+        elif week <= 8:
+            phase, tasks = "콘텐츠 전략 실행", _execution_tasks(total_posts)
+        else:
+            phase, tasks = "성장 가속화", GROWTH_TASKS
+        plans.append(weekly_plan(week, phase, tasks, kpi_focus))
+    return tuple(plans)
+
+# 톤앤보이스 슬라이더 키 (설문 순서)
+TONE_KEYS = ("formal_casual", "serious_fun", "polite_bold", "factual_passionate")
+
+def profile_from_dict(data: Dict) -> UserProfile:
+    """설문 응답 딕셔너리(JSON, CSV 행 등)로부터 UserProfile 생성"""
+    tone_scores = data.get("tone_scores") or {}
+    return UserProfile(
+        id=data.get("id") or str(uuid.uuid4()),
+        business_stage=data["business_stage"],
+        business_type=data["business_type"],
+        instagram_status=data.get("instagram_status", "none"),
+        target_age_group=data["target_age_group"],
+        target_gender=data.get("target_gender", "균등 분포"),
+        primary_goals=data.get("primary_goals") or (),
+        brand_archetype=data["brand_archetype"],
+        tone_scores={key: int(tone_scores.get(key, 5)) for key in TONE_KEYS},
+        competitors=data.get("competitors") or (),
+        differentiation=data.get("differentiation") or (),
+        time_available=data.get("time_available", "2-5시간"),
+        budget=data.get("budget", "예산 없음"),
+        tools_available=data.get("tools_available") or (),
+        created_at=data.get("created_at") or datetime.now().isoformat()
+    )
+
+# 파일 이름/ZIP 항목 이름으로 그대로 써도 되는 프로필 ID (UUID 등)
+_SAFE_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+def safe_filename(profile_id: str, extension: str) -> str:
+    """프로필 ID -> 경로 구분자나 '..' 없이 쓸 수 있는 파일 이름
+
+    입력 파일이나 저장소의 ID 는 검증되지 않은 값이므로, 안전한 패턴이 아니면
+    허용되지 않는 문자를 '_' 로 바꾸고 원래 ID 의 해시를 붙여 서로 다른 ID 가 같은 이름이 되지 않게 합니다.
+    """
+    if _SAFE_ID.fullmatch(profile_id) and ".." not in profile_id:
+        return f"{profile_id}.{extension}"
+    stem = _UNSAFE_CHARS.sub("_", profile_id).replace("..", "_").strip("._")[:48]
+    digest = hashlib.sha1(profile_id.encode("utf-8")).hexdigest()[:12]
+    return f"{stem}-{digest}.{extension}" if stem else f"{digest}.{extension}"
+
+def strategy_from_dict(data: Dict) -> BrandStrategy:
+    """저장된 딕셔너리(strategy_to_dict 결과)로부터 BrandStrategy 복원"""
+    return BrandStrategy(
+        brand_type=sys.intern(data["brand_type"]),
+        strategy_name=sys.intern(data["strategy_name"]),
+        content_pillars=_interned(data["content_pillars"]),
+        posting_frequency=shared_mapping(data["posting_frequency"]),
+        content_mix=shared_mapping(data["content_mix"]),
+        recommended_tools=_interned(data["recommended_tools"]),
+        kpi_targets=shared_mapping(data["kpi_targets"]),
+        weekly_plans=tuple(
+            weekly_plan(plan["week"], plan["phase"], _interned(plan["tasks"]), plan["kpi_focus"])
+            for plan in data["weekly_plans"]
+        )
+    )
+
+def profile_to_dict(profile: UserProfile) -> Dict:
+    """JSON 으로 직렬화할 수 있는 딕셔너리 (profile_from_dict 의 역)"""
+    data = {name: getattr(profile, name) for name in UserProfile.__slots__}
+    data["tone_scores"] = dict(profile.tone_scores)
+    return data
+
+def strategy_to_dict(strategy: BrandStrategy) -> Dict:
+    """JSON 으로 직렬화할 수 있는 딕셔너리 (strategy_from_dict 의 역)"""
+    return {
+        "brand_type": strategy.brand_type,
+        "strategy_name": strategy.strategy_name,
+        "content_pillars": list(strategy.content_pillars),
+        "posting_frequency": dict(strategy.posting_frequency),
+        "content_mix": dict(strategy.content_mix),
+        "recommended_tools": list(strategy.recommended_tools),
+        "kpi_targets": dict(strategy.kpi_targets),
+        "weekly_plans": [
+            {"week": plan.week, "phase": plan.phase, "tasks": list(plan.tasks), "kpi_focus": plan.kpi_focus}
+            for plan in strategy.weekly_plans
+        ]
+    }
+
+# 성과 등급 (높은 등급부터)
+PERFORMANCE_TIERS = _REFERENCE.performance["tiers"]
+PERFORMANCE_TIER_LABELS = _REFERENCE.performance["tier_labels"]
+
+# 지표별 등급 하한값 (평균, 양호, 우수 순으로 오름차순, 단위 %)
+# 키는 BrandStrategy.kpi_targets 와 같은 이름을 사용
+PERFORMANCE_THRESHOLDS = _REFERENCE.performance["thresholds"]
+PERFORMANCE_DECIMALS = _REFERENCE.performance.get("decimals", {})
+
+def performance_standards_rows() -> Dict[str, List[str]]:
+    """등급 하한값으로부터 성과 기준표(지표 × 등급) 생성"""
+    table = {"지표": [metric.replace("_", " ") for metric in PERFORMANCE_THRESHOLDS]}
+    for label in PERFORMANCE_TIER_LABELS:
+        table[label] = []
+    for metric, (average, good, excellent) in PERFORMANCE_THRESHOLDS.items():
+        decimals = PERFORMANCE_DECIMALS.get(metric, 0)
+        fmt = lambda value: f"{value:.{decimals}f}"
+        table[PERFORMANCE_TIER_LABELS[0]].append(f"{fmt(excellent)}% 이상")
+        table[PERFORMANCE_TIER_LABELS[1]].append(f"{fmt(good)}-{fmt(excellent)}%")
+        table[PERFORMANCE_TIER_LABELS[2]].append(f"{fmt(average)}-{fmt(good)}%")
+        table[PERFORMANCE_TIER_LABELS[3]].append(f"{fmt(average)}% 미만")
+    return table
@@ -0,0 +1,90 @@
+"""차트용 시계열 다운샘플링
+
+plotly 그림은 모든 점을 JSON 으로 직렬화해 브라우저로 보내므로, 수년치 일별/시간별 데이터를 그대로 그리면
+리런마다 수 MB 의 웹소켓 페이로드가 발생합니다. 그림을 만들기 전에 화면 폭에 맞는 점 수로 줄입니다.
+- lttb: Largest-Triangle-Three-Buckets. 버킷마다 인접 버킷과 만드는 삼각형 넓이가 가장 큰 점을 골라 모양을 유지
+- minmax: 버킷마다 최솟값/최댓값 두 점을 남겨 급등락(스파이크)을 보존
+
+    x, y = downsample(dates, followers, max_points=600)
+"""
+from typing import Tuple
+
+import numpy as np
+
+# 대시보드 차트(컨테이너 폭 기준 반쪽 화면)에 충분한 점 수
+DEFAULT_MAX_POINTS = 600
+
+# 보이는 기간(일)에 따라 고르는 롤업 해상도
+AUTO_RESOLUTION_DAYS = [(180, "day"), (3 * 365, "week")]
+
+def resolution_for_range(start, end) -> str:
+    """보이는 날짜 구간의 길이로 롤업 해상도(day/week/month)를 선택"""
+    days = int((np.datetime64(end, "D") - np.datetime64(start, "D")).astype(np.int64))
+    for limit, resolution in AUTO_RESOLUTION_DAYS:
+        if days <= limit:
+            return resolution
+    return "month"
+
+def _as_numeric(x: np.ndarray) -> np.ndarray:
+    # 날짜 축은 정수(epoch 기준 단위 수)로 바꿔 넓이를 계산
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """LTTB 로 남길 점의 인덱스 (첫 점과 마지막 점은 항상 포함)"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    xf, yf = _as_numeric(x), y.astype(np.float64)
+
+    # 첫/마지막 점을 제외한 n-2 개를 threshold-2 개의 버킷으로 분할
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # 다음 버킷의 평균점은 누적합으로 한 번에 계산
+    csx = np.concatenate(([0.0], np.cumsum(xf)))
+    csy = np.concatenate(([0.0], np.cumsum(yf)))
+    next_lo = edges[1:]
+    next_hi = np.append(edges[2:], n)
+    counts = next_hi - next_lo
+    avg_x = (csx[next_hi] - csx[next_lo]) / counts
+    avg_y = (csy[next_hi] - csy[next_lo]) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 이전 선택점 a, 후보 점, 다음 버킷 평균점이 만드는 삼각형 넓이(의 2배)
+        area = np.abs((xf[a] - avg_x[i]) * (yf[lo:hi] - yf[a]) - (xf[a] - xf[lo:hi]) * (avg_y[i] - yf[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """버킷마다 최솟값과 최댓값 위치를 남긴 인덱스 (최대 2 * buckets 개, 시간순)"""
+    n = len(y)
+    if 2 * buckets >= n or buckets < 1:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    # 버킷 폭이 고르지 않을 수 있으므로 가장 긴 폭으로 채운 2차원 배열에서 한 번에 argmin/argmax
+    width = int(np.diff(edges).max())
+    positions = edges[:-1, None] + np.arange(width)
+    valid = positions < edges[1:, None]
+    positions = np.minimum(positions, n - 1)
+    values = y[positions].astype(np.float64)
+    lows = np.where(valid, values, np.inf).argmin(axis=1)
+    highs = np.where(valid, values, -np.inf).argmax(axis=1)
+    rows = np.arange(buckets)
+    return np.unique(np.concatenate((positions[rows, lows], positions[rows, highs])))
+
+def downsample(x, y, max_points: int = DEFAULT_MAX_POINTS, method: str = "lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """(x, y) 시계열을 최대 max_points 개의 점으로 축소 (x 는 정렬되어 있어야 함)"""
+    x, y = np.asarray(x), np.asarray(y)
+    if method == "lttb":
+        keep = lttb_indices(x, y, max_points)
+    elif method == "minmax":
+        keep = minmax_indices(y, max_points // 2)
+    else:
+        raise ValueError(f"알 수 없는 다운샘플링 방식: {method}")
+    return x[keep], y[keep]
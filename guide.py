@@ -0,0 +1,272 @@
+"""브랜드 가이드 문서 렌더링 (텍스트/Markdown/HTML/JSON)
+
+가이드 내용은 (프로필, 전략) 쌍의 해시를 키로 구조화된 문서 모델로 한 번만 조립하고,
+모든 형식은 같은 문서 모델을 순회해 렌더링합니다.
+문서 모델과 섹션 렌더링 결과는 프로세스 전체가 공유하는 LRU 캐시에 보관되므로,
+내용이 바뀌지 않은 재실행이나 반복 다운로드는 캐시 조회 비용만 듭니다.
+생성일/생성 시간은 캐시에 넣지 않고 렌더링할 때마다 머리말과 꼬리말에 붙입니다.
+"""
+import hashlib
+import html
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Hashable
+
+from core import SURVEY_DATA, BrandStrategy, UserProfile, profile_to_dict, strategy_to_dict
+
+# 형식 코드: (표시 이름, MIME 타입, 파일 확장자)
+GUIDE_FORMATS = {
+    "txt": ("텍스트", "text/plain", "txt"),
+    "md": ("Markdown", "text/markdown", "md"),
+    "html": ("HTML", "text/html", "html"),
+    "json": ("JSON", "application/json", "json")
+}
+
+SUCCESS_TIPS = [
+    "1. 일관성 유지: 시각적 스타일과 브랜드 보이스를 모든 콘텐츠에서 일관되게 유지하세요.",
+    "2. 참여 우선: 좋아요보다는 댓글, 저장, 공유를 유도하는 콘텐츠에 집중하세요.",
+    "3. 스토리 활용: 일상적이고 진정성 있는 모습을 스토리로 꾸준히 공유하세요.",
+    "4. 데이터 기반 의사결정: 주간 인사이트를 반드시 확인하고 전략을 조정하세요.",
+    "5. 커뮤니티 중심: 팔로워와의 진정한 소통과 관계 구축에 집중하세요."
+]
+
+class LRUCache:
+    """스레드 안전한 최대 크기 제한 캐시 (가장 오래 사용하지 않은 항목부터 제거)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_create(self, key: Hashable, factory: Callable):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_documents = LRUCache(maxsize=512)
+_renders = LRUCache(maxsize=2048)
+
+def guide_key(profile: UserProfile, strategy: BrandStrategy) -> str:
+    """(프로필, 전략) 내용 기반 해시 — 내용이 같으면 같은 키"""
+    payload = [profile_to_dict(profile), strategy_to_dict(strategy)]
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def _fields(*items) -> Dict:
+    return {"type": "fields", "items": [list(item) for item in items]}
+
+def _list(label, items, ordered: bool = False) -> Dict:
+    return {"type": "list", "label": label, "items": list(items), "ordered": ordered}
+
+def _paragraphs(items, spaced: bool = True) -> Dict:
+    return {"type": "paragraphs", "items": list(items), "spaced": spaced}
+
+def build_guide(profile: UserProfile, strategy: BrandStrategy) -> Dict:
+    """가이드 문서 모델(메타 정보 + 섹션/블록 목록)을 조립 — 모든 출력 형식의 공통 원본
+
+    생성 시각은 넣지 않습니다 (렌더링할 때 _stamp 로 붙임).
+    """
+    tone = profile.tone_scores
+    weekly_groups = [
+        {
+            "type": "group",
+            "heading": f"Week {plan.week}: {plan.phase}",
+            "blocks": [_fields(("목표", plan.kpi_focus)), _list("할 일", plan.tasks)]
+        }
+        for plan in strategy.weekly_plans[:4]
+    ]
+    sections = [
+        ("🎯 브랜드 전략 개요", [_fields(
+            ("브랜드 타입", strategy.brand_type),
+            ("전략명", strategy.strategy_name),
+            ("비즈니스 단계", SURVEY_DATA["business_stages"][profile.business_stage]),
+            ("사업 분야", SURVEY_DATA["business_types"][profile.business_type])
+        )]),
+        ("👥 타겟 오디언스", [_fields(
+            ("연령대", SURVEY_DATA["age_groups"][profile.target_age_group]),
+            ("성별 분포", profile.target_gender),
+            ("주요 목표", ", ".join(SURVEY_DATA["primary_goals"][goal] for goal in profile.primary_goals))
+        )]),
+        ("🎨 브랜드 아이덴티티", [
+            _fields(("브랜드 아키타입", SURVEY_DATA["brand_archetypes"][profile.brand_archetype])),
+            _list("브랜드 톤앤보이스", [
+                f"공식적(1) ←→ 캐주얼(10): {tone['formal_casual']}/10",
+                f"진지함(1) ←→ 재미있음(10): {tone['serious_fun']}/10",
+                f"정중함(1) ←→ 과감함(10): {tone['polite_bold']}/10",
+                f"사실적(1) ←→ 열정적(10): {tone['factual_passionate']}/10"
+            ])
+        ]),
+        ("📋 콘텐츠 전략", [
+            _list("콘텐츠 필러", strategy.content_pillars, ordered=True),
+            _list("콘텐츠 믹스 비율", [f"{fmt}: {ratio}%" for fmt, ratio in strategy.content_mix.items()]),
+            _list("월간 게시 빈도", [f"{fmt}: {freq}개" for fmt, freq in strategy.posting_frequency.items()])
+        ]),
+        ("🎯 성과 목표 (KPI)", [
+            _list(None, [f"{kpi.replace('_', ' ').title()}: {target}%" for kpi, target in strategy.kpi_targets.items()])
+        ]),
+        ("🛠️ 권장 도구", [_list(None, strategy.recommended_tools)]),
+        ("💼 리소스 현황", [_fields(
+            ("가용 시간", f"{profile.time_available}/주"),
+            ("예산", f"{profile.budget}/월"),
+            ("보유 도구", ", ".join(profile.tools_available) if profile.tools_available else "없음")
+        )]),
+        ("🏆 경쟁사 분석", [_fields(
+            ("주요 경쟁사", ", ".join(profile.competitors) if profile.competitors else "미지정"),
+            ("차별화 포인트", ", ".join(profile.differentiation) if profile.differentiation else "미지정")
+        )]),
+        ("📅 주간 실행 계획 (처음 4주)", weekly_groups),
+        ("💡 성공을 위한 핵심 팁", [_paragraphs(SUCCESS_TIPS)]),
+        ("📞 지원 및 문의", [_paragraphs([
+            "이 가이드는 Instagram Branding Expert 시스템에서 생성되었습니다.",
+            "추가 문의사항이나 전략 조정이 필요한 경우 언제든 새로운 분석을 실행하세요."
+        ], spaced=False)])
+    ]
+    return {
+        "title": "📸 INSTAGRAM 브랜딩 가이드",
+        "brand_id": profile.id[:8],
+        "sections": [{"title": title, "blocks": blocks} for title, blocks in sections]
+    }
+
+def _stamp(doc: Dict, now: datetime) -> Dict:
+    """섹션을 뺀 메타 정보에 생성일/생성 시간을 붙임"""
+    return {
+        "title": doc["title"],
+        "brand_id": doc["brand_id"],
+        "created_date": now.strftime("%Y-%m-%d"),
+        "created_time": now.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+# 형식별 렌더러: 섹션 본문(캐시 대상)과 생성 시각이 들어가는 머리말/꼬리말을 나눠 렌더링
+
+def _text_block(block: Dict, nested: bool = False) -> str:
+    kind = block["type"]
+    if kind == "fields":
+        return "\n".join(f"{label}: {value}" for label, value in block["items"])
+    if kind == "list":
+        bullet = "  - " if nested else "- "
+        lines = [f"{i}. {item}" if block["ordered"] else f"{bullet}{item}" for i, item in enumerate(block["items"], 1)]
+        return "\n".join(([f"{block['label']}:"] if block["label"] else []) + lines)
+    if kind == "paragraphs":
+        return ("\n\n" if block["spaced"] else "\n").join(block["items"])
+    return "\n".join([block["heading"]] + [_text_block(inner, nested=True) for inner in block["blocks"]])
+
+def _text_sections(doc: Dict) -> str:
+    rule = "=" * 50
+    parts = []
+    for section in doc["sections"]:
+        body = "\n\n".join(_text_block(block) for block in section["blocks"])
+        parts.append(f"{rule}\n{section['title']}\n{rule}\n\n{body}\n")
+    return "\n".join(parts)
+
+def render_text(meta: Dict, sections: str) -> str:
+    return (
+        f"\n{meta['title']}\n생성일: {meta['created_date']}\n브랜드 ID: {meta['brand_id']}\n\n"
+        f"{sections}\n생성 시간: {meta['created_time']}\n"
+    )
+
+def _markdown_block(block: Dict) -> str:
+    kind = block["type"]
+    if kind == "fields":
+        return "\n".join(f"- **{label}**: {value}" for label, value in block["items"])
+    if kind == "list":
+        lines = [f"{i}. {item}" if block["ordered"] else f"- {item}" for i, item in enumerate(block["items"], 1)]
+        return "\n".join(([f"**{block['label']}**", ""] if block["label"] else []) + lines)
+    if kind == "paragraphs":
+        return ("\n\n" if block["spaced"] else "  \n").join(block["items"])
+    return "\n\n".join([f"### {block['heading']}"] + [_markdown_block(inner) for inner in block["blocks"]])
+
+def _markdown_sections(doc: Dict) -> str:
+    parts = []
+    for section in doc["sections"]:
+        parts.append(f"## {section['title']}")
+        parts.extend(_markdown_block(block) for block in section["blocks"])
+    return "\n\n".join(parts)
+
+def render_markdown(meta: Dict, sections: str) -> str:
+    return (
+        f"# {meta['title']}\n\n생성일: {meta['created_date']} · 브랜드 ID: `{meta['brand_id']}`\n\n"
+        f"{sections}\n\n_생성 시간: {meta['created_time']}_\n"
+    )
+
+def _html_block(block: Dict) -> str:
+    e = html.escape
+    kind = block["type"]
+    if kind == "fields":
+        return "<ul>" + "".join(f"<li><strong>{e(label)}</strong>: {e(str(value))}</li>" for label, value in block["items"]) + "</ul>"
+    if kind == "list":
+        tag = "ol" if block["ordered"] else "ul"
+        label = f"<p><strong>{e(block['label'])}</strong></p>" if block["label"] else ""
+        return f"{label}<{tag}>" + "".join(f"<li>{e(str(item))}</li>" for item in block["items"]) + f"</{tag}>"
+    if kind == "paragraphs":
+        return "".join(f"<p>{e(item)}</p>" for item in block["items"])
+    return f"<h3>{e(block['heading'])}</h3>" + "".join(_html_block(inner) for inner in block["blocks"])
+
+def _html_sections(doc: Dict) -> str:
+    e = html.escape
+    body = []
+    for section in doc["sections"]:
+        body.append(f"<h2>{e(section['title'])}</h2>")
+        body.extend(_html_block(block) for block in section["blocks"])
+    return "\n".join(body)
+
+def render_html(meta: Dict, sections: str) -> str:
+    e = html.escape
+    return (
+        '<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{e(meta['title'])} - {e(meta['brand_id'])}</title>\n"
+        "<style>body{font-family:sans-serif;max-width:760px;margin:2rem auto;line-height:1.6}"
+        "h2{border-bottom:3px solid #833AB4;padding-bottom:.3rem}</style>\n"
+        f"</head>\n<body>\n<h1>{e(meta['title'])}</h1>\n"
+        f"<p>생성일: {e(meta['created_date'])} · 브랜드 ID: <code>{e(meta['brand_id'])}</code></p>\n"
+        f"{sections}\n<p><em>생성 시간: {e(meta['created_time'])}</em></p>\n</body>\n</html>\n"
+    )
+
+def _json_sections(doc: Dict) -> str:
+    # 최상위 객체 안에 들어갈 값이므로 한 단계 더 들여씀 (문자열 안의 줄바꿈은 \n 으로 이스케이프됨)
+    return json.dumps(doc["sections"], ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+def render_json(meta: Dict, sections: str) -> str:
+    head = json.dumps(meta, ensure_ascii=False, indent=2)[:-2]
+    return f'{head},\n  "sections": {sections}\n}}'
+
+# 형식 코드 -> (섹션 렌더러, 머리말/꼬리말을 붙이는 렌더러)
+_RENDERERS = {
+    "txt": (_text_sections, render_text),
+    "md": (_markdown_sections, render_markdown),
+    "html": (_html_sections, render_html),
+    "json": (_json_sections, render_json)
+}
+
+def render_guide(profile: UserProfile, strategy: BrandStrategy, fmt: str = "txt", now: datetime = None) -> str:
+    """가이드를 지정 형식으로 렌더링 (섹션은 내용 해시 기준 캐시, 생성 시각은 now 또는 현재 시각)"""
+    if fmt not in _RENDERERS:
+        raise ValueError(f"지원하지 않는 가이드 형식: {fmt}")
+    key = guide_key(profile, strategy)
+    doc = _documents.get_or_create(key, lambda: build_guide(profile, strategy))
+    render_sections, render = _RENDERERS[fmt]
+    sections = _renders.get_or_create((key, fmt), lambda: render_sections(doc))
+    return render(_stamp(doc, now or datetime.now()), sections)
+
+def generate_brand_guide(profile: UserProfile, strategy: BrandStrategy) -> str:
+    """브랜드 가이드 문서 생성"""
+    return render_guide(profile, strategy, "txt")
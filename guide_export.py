@@ -0,0 +1,192 @@
+"""저장된 고객들의 브랜드 가이드를 ZIP 한 파일로 일괄 내보내기
+
+선택한 고객(ID 목록 또는 포트폴리오 필터)의 (프로필, 전략) JSON 을 ProfileStore 에서 키 순서로 묶음씩 읽어
+워커 프로세스 풀에서 렌더링하고, 완료된 묶음을 고객 ID 순서대로 ZIP 항목 하나씩 기록합니다.
+항목 이름은 core.safe_filename 으로 만들어 저장된 ID 에 경로 구분자나 '..' 가 있어도 압축 해제 위치를 벗어나지 않습니다.
+동시에 렌더링 중인 묶음 수를 워커 수의 2배로 제한하므로 메모리에는 chunk_size × workers 개의 가이드만 올라가고,
+고객 수에 비례해 늘어나는 것은 ZIP 중앙 디렉터리 항목(고객당 수백 바이트)뿐입니다.
+
+- export_guides: 파일(또는 쓰기 가능한 파일 객체)에 기록
+- iter_export: HTTP 응답 등에 그대로 흘려보낼 수 있도록 항목이 기록될 때마다 ZIP 바이트 조각을 반환
+
+    python guide_export.py guides.zip --format md --business-type cafe --workers 8
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core import StrategyEngine, profile_from_dict, safe_filename, strategy_from_dict
+from guide import GUIDE_FORMATS, render_guide
+from store import DEFAULT_DB_PATH, ProfileStore
+
+DEFAULT_FORMAT = "md"
+DEFAULT_CHUNK_SIZE = 32
+# safe_filename 결과는 영숫자로 시작하므로 가이드 항목과 겹치지 않음
+ERRORS_ENTRY = "_errors.txt"
+
+_engine = None
+
+def _render_chunk(rows: List[Tuple[str, str, Optional[str]]], fmt: str) -> List[Tuple[str, bytes, str]]:
+    """워커에서 실행: (프로필 ID, 가이드 바이트, 오류 메시지) 목록 반환
+
+    전략이 저장되지 않은 고객은 워커의 엔진으로 전략을 다시 매칭합니다.
+    """
+    global _engine
+    results = []
+    for profile_id, profile_json, strategy_json in rows:
+        try:
+            profile = profile_from_dict(json.loads(profile_json))
+            if strategy_json:
+                strategy = strategy_from_dict(json.loads(strategy_json))
+            else:
+                _engine = _engine or StrategyEngine()
+                strategy = _engine.match_strategy(profile)
+            results.append((profile_id, render_guide(profile, strategy, fmt).encode("utf-8"), ""))
+        except Exception as e:
+            results.append((profile_id, b"", f"{type(e).__name__}: {e}"))
+    return results
+
+def _rechunk(batches: Iterable[List], chunk_size: int) -> Iterator[List]:
+    for batch in batches:
+        for start in range(0, len(batch), chunk_size):
+            yield batch[start:start + chunk_size]
+
+def _write_entries(archive: zipfile.ZipFile, store: ProfileStore, fmt: str, profile_ids: Iterable[str],
+                   filters: Dict, workers: int, chunk_size: int, stats: Dict) -> Iterator[None]:
+    """가이드를 렌더링해 ZIP 항목으로 기록 (항목 하나를 기록할 때마다 yield)"""
+    extension = GUIDE_FORMATS[fmt][2]
+    errors = []
+    batches = store.iter_guide_sources(profile_ids, **filters)
+
+    # 스트림릿 서버처럼 스레드가 여러 개인 프로세스에서 fork 하지 않도록 spawn 으로 워커를 띄움
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+
+        def drain():
+            for profile_id, data, error in pending.popleft().result():
+                if error:
+                    errors.append(f"{profile_id}\t{error}")
+                    continue
+                archive.writestr(safe_filename(profile_id, extension), data)
+                stats["guides"] += 1
+                stats["bytes"] += len(data)
+                yield
+
+        # 제출 순서대로 꺼내므로 ZIP 항목은 고객 ID 순서를 유지
+        for chunk in _rechunk(batches, chunk_size):
+            pending.append(pool.submit(_render_chunk, chunk, fmt))
+            if len(pending) >= workers * 2:
+                yield from drain()
+        while pending:
+            yield from drain()
+
+    stats["errors"] = len(errors)
+    if errors:
+        archive.writestr(ERRORS_ENTRY, "\n".join(errors) + "\n")
+        yield
+
+def _validate(fmt: str):
+    if fmt not in GUIDE_FORMATS:
+        raise ValueError(f"지원하지 않는 가이드 형식: {fmt}")
+
+def export_guides(store: ProfileStore, target, fmt: str = DEFAULT_FORMAT, profile_ids: Iterable[str] = None,
+                  workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, compresslevel: int = 6,
+                  **filters) -> Dict[str, float]:
+    """가이드 ZIP 을 target(경로 또는 쓰기 가능한 바이너리 파일 객체)에 기록하고 처리 통계를 반환
+
+    profile_ids 를 주지 않으면 filters(business_type / strategy_name / tier)에 맞는 전체 고객을 내보냅니다.
+    """
+    _validate(fmt)
+    workers = workers or os.cpu_count() or 1
+    stats = {"guides": 0, "errors": 0, "bytes": 0}
+    started = time.perf_counter()
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for _ in _write_entries(archive, store, fmt, profile_ids, filters, workers, chunk_size, stats):
+            pass
+    stats["elapsed"] = time.perf_counter() - started
+    stats["guides_per_sec"] = stats["guides"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+class _ChunkSink(io.RawIOBase):
+    """ZipFile 이 쓴 바이트를 모아 두는 탐색 불가 스트림 (ZipFile 은 데이터 디스크립터 방식으로 기록)"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_export(store: ProfileStore, fmt: str = DEFAULT_FORMAT, profile_ids: Iterable[str] = None,
+                workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, compresslevel: int = 6,
+                **filters) -> Iterator[bytes]:
+    """ZIP 바이트를 항목 단위 조각으로 반환 (전체 아카이브를 메모리나 디스크에 만들지 않음)"""
+    _validate(fmt)
+    workers = workers or os.cpu_count() or 1
+    stats = {"guides": 0, "errors": 0, "bytes": 0}
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for _ in _write_entries(archive, store, fmt, profile_ids, filters, workers, chunk_size, stats):
+            data = sink.take()
+            if data:
+                yield data
+    # 중앙 디렉터리는 ZipFile 을 닫을 때 기록됨
+    data = sink.take()
+    if data:
+        yield data
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="저장된 고객들의 브랜드 가이드를 ZIP 파일로 일괄 내보냅니다.")
+    parser.add_argument("output", help="ZIP 파일 경로 (- 이면 표준 출력)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="ProfileStore SQLite 파일 경로")
+    parser.add_argument("--format", choices=list(GUIDE_FORMATS), default=DEFAULT_FORMAT, help="가이드 형식")
+    parser.add_argument("--ids", default=None, help="내보낼 프로필 ID 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--business-type", default=None)
+    parser.add_argument("--strategy", default=None, help="전략 이름")
+    parser.add_argument("--tier", type=int, default=None, help="성과 등급 번호")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="워커에 한 번에 넘길 고객 수")
+    args = parser.parse_args(argv)
+
+    store = ProfileStore(args.db)
+    profile_ids = None
+    if args.ids:
+        with open(args.ids, encoding="utf-8") as f:
+            profile_ids = [line.strip() for line in f if line.strip()]
+    options = dict(
+        fmt=args.format, profile_ids=profile_ids, workers=args.workers, chunk_size=args.chunk_size,
+        business_type=args.business_type, strategy_name=args.strategy, tier=args.tier
+    )
+
+    if args.output == "-":
+        for data in iter_export(store, **options):
+            sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+        return 0
+
+    stats = export_guides(store, args.output, **options)
+    print(
+        f"완료: 가이드 {stats['guides']:,}개 (오류 {stats['errors']:,}개), "
+        f"{stats['elapsed']:.2f}초, {stats['guides_per_sec']:,.1f} guides/sec",
+        file=sys.stderr
+    )
+    return 1 if stats["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
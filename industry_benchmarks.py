@@ -0,0 +1,361 @@
+"""업종 × 팔로워 구간별 벤치마크 백분위 색인
+
+계정 단위 지표 데이터셋(업종, 팔로워 수, 참여율, 팔로워 증가율, 월간 게시물)을 한 번 읽어
+세그먼트(업종 × 팔로워 구간)마다 지표별로 정렬된 배열을 만들어 두고,
+사용자 지표의 백분위를 np.searchsorted 로 O(log n) 에 계산합니다.
+
+- 정렬된 값은 지표마다 하나의 float32 배열에 세그먼트 순서로 이어 붙이고 오프셋으로 구간을 나눕니다.
+  업종 전체, 전체 계정 같은 상위 세그먼트는 값을 복제하지 않고 하위 세그먼트들의 검색 결과를 합산합니다.
+- 세그먼트 표본이 MIN_PEERS 보다 적으면 업종 전체, 전체 계정 순으로 넓혀 비교합니다.
+- 백분위 밴드 차트에 쓰는 분위수(QUANTILES)는 모든 세그먼트 수준에 대해 색인을 만들 때 미리 계산합니다.
+
+업종은 설문의 비즈니스 유형(core.SURVEY_DATA["business_types"]) 코드 또는 이름을 사용합니다.
+데이터셋(CSV / JSON Lines)은 청크 단위로 읽어 색인 파일(.npz) 하나로 저장하며,
+색인 파일이 없으면 앱은 고정 시드로 만든 샘플 데이터셋의 색인을 사용합니다.
+
+사용 예:
+    python industry_benchmarks.py build accounts.csv --output data/industry_benchmarks.npz
+    python industry_benchmarks.py sample accounts.csv --accounts 1000000
+    python industry_benchmarks.py rank --industry product --followers 3200 참여율=2.4
+"""
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import BrandStrategy, SURVEY_DATA, UserProfile
+
+DEFAULT_PATH = os.environ.get(
+    "BRANDING_BENCHMARK_INDEX", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "industry_benchmarks.npz")
+)
+DEFAULT_CHUNK_ROWS = 200_000
+SAMPLE_ACCOUNTS = 200_000
+SAMPLE_SEED = 2025
+
+# 순위를 매기는 지표 (데이터셋 열 -> 지표 이름)
+METRICS = ("참여율", "팔로워_증가율", "월간_게시물")
+METRIC_UNITS = {"참여율": "%", "팔로워_증가율": "%", "월간_게시물": "개"}
+COLUMNS = {"engagement_rate": "참여율", "follower_growth": "팔로워_증가율", "monthly_posts": "월간_게시물"}
+COLUMN_ALIASES = {
+    "industry": ("industry", "업종", "업계", "business_type"),
+    "followers": ("followers", "팔로워", "팔로워_수"),
+    "engagement_rate": ("engagement_rate", "참여율"),
+    "follower_growth": ("follower_growth", "팔로워_증가율"),
+    "monthly_posts": ("monthly_posts", "월간_게시물")
+}
+_ALIAS_LOOKUP = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+# 팔로워 구간 하한값과 이름 (마지막 구간은 상한 없음)
+FOLLOWER_BAND_EDGES = (0, 1_000, 10_000, 100_000, 1_000_000)
+FOLLOWER_BANDS = ("나노 (1천 미만)", "마이크로 (1천-1만)", "미드 (1만-10만)", "매크로 (10만-100만)", "메가 (100만 이상)")
+# 설문 응답의 계정 현황으로 추정한 팔로워 구간 (모르면 None = 업종 전체와 비교)
+STATUS_BANDS = {"business_small": 0, "business_medium": 0}
+
+QUANTILES = (10, 25, 50, 75, 90)
+MIN_PEERS = 50
+ALL = "전체"
+
+def follower_band(followers) -> np.ndarray:
+    """팔로워 수 -> 구간 인덱스 (음수나 결측은 -1)"""
+    followers = np.asarray(followers, dtype=np.float64)
+    bands = np.searchsorted(FOLLOWER_BAND_EDGES, followers, side="right") - 1
+    return np.where(np.isnan(followers), -1, bands)
+
+def industry_codes() -> Tuple[str, ...]:
+    return tuple(SURVEY_DATA["business_types"])
+
+def _industry_lookup() -> Dict[str, int]:
+    lookup = {}
+    for i, (code, label) in enumerate(SURVEY_DATA["business_types"].items()):
+        lookup[code] = i
+        lookup[label] = i
+    return lookup
+
+@dataclass(frozen=True, slots=True)
+class PercentileRank:
+    metric: str
+    value: float
+    percentile: float        # 세그먼트에서 이 값 이하인 계정 비율 (동점은 절반), 0-100
+    segment: str             # 실제로 비교한 세그먼트 이름 (표본이 적으면 넓힌 세그먼트)
+    peers: int
+
+    @property
+    def top(self) -> float:
+        """상위 몇 % 인지 (표시용, 최소 1%)"""
+        return max(100.0 - self.percentile, 1.0)
+
+class BenchmarkIndex:
+    """지표별로 세그먼트 정렬 배열을 이어 붙인 읽기 전용 백분위 색인
+
+    - values[m]: float32, 세그먼트(업종 i, 구간 b -> i * 구간 수 + b) 순서로 정렬된 값
+    - offsets[m]: int64, 세그먼트 s 의 값은 values[m][offsets[m][s]:offsets[m][s + 1]]
+    - quantiles[m]: (업종 수 + 1, 구간 수 + 1, 분위수 개수), 마지막 업종/구간 인덱스가 '전체'
+    - counts[m]: (업종 수 + 1, 구간 수 + 1) 표본 수
+    """
+
+    def __init__(self, industries: Sequence[str], values: Mapping[str, np.ndarray], offsets: Mapping[str, np.ndarray],
+                 quantiles: Mapping[str, np.ndarray], counts: Mapping[str, np.ndarray], source: str = ""):
+        self.industries = tuple(industries)
+        self.values = dict(values)
+        self.offsets = dict(offsets)
+        self.quantiles = dict(quantiles)
+        self.counts = dict(counts)
+        self.source = source
+        self._industry_index = {code: i for i, code in enumerate(self.industries)}
+
+    @property
+    def accounts(self) -> int:
+        return int(self.counts[METRICS[0]][-1, -1])
+
+    @classmethod
+    def build(cls, chunks: Iterable[pd.DataFrame], source: str = "") -> "BenchmarkIndex":
+        """표준 열(industry, followers, 지표 열) 청크들 -> 색인 (정렬은 지표마다 한 번)"""
+        industries = industry_codes()
+        lookup = _industry_lookup()
+        segment_parts: List[np.ndarray] = []
+        metric_parts: Dict[str, List[np.ndarray]] = {metric: [] for metric in METRICS}
+        for frame in chunks:
+            industry = frame["industry"].astype(str).str.strip().map(lookup).to_numpy(dtype=np.float64, na_value=np.nan)
+            band = follower_band(pd.to_numeric(frame["followers"], errors="coerce").to_numpy(dtype=np.float64))
+            valid = ~np.isnan(industry) & (band >= 0)
+            segment_parts.append((industry[valid] * len(FOLLOWER_BANDS) + band[valid]).astype(np.int32))
+            for column, metric in COLUMNS.items():
+                values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64) \
+                    if column in frame else np.full(len(frame), np.nan)
+                metric_parts[metric].append(values[valid].astype(np.float32))
+        segments = np.concatenate(segment_parts) if segment_parts else np.empty(0, dtype=np.int32)
+        n_segments = len(industries) * len(FOLLOWER_BANDS)
+
+        values, offsets, quantiles, counts = {}, {}, {}, {}
+        for metric in METRICS:
+            column = np.concatenate(metric_parts[metric]) if metric_parts[metric] else np.empty(0, dtype=np.float32)
+            present = ~np.isnan(column)
+            metric_segments, column = segments[present], column[present]
+            order = np.lexsort((column, metric_segments))
+            values[metric] = np.ascontiguousarray(column[order])
+            sizes = np.bincount(metric_segments, minlength=n_segments)
+            offsets[metric] = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+            quantiles[metric], counts[metric] = cls._level_quantiles(values[metric], offsets[metric], len(industries))
+        return cls(industries, values, offsets, quantiles, counts, source)
+
+    @staticmethod
+    def _level_quantiles(values: np.ndarray, offsets: np.ndarray, n_industries: int) -> Tuple[np.ndarray, np.ndarray]:
+        n_bands = len(FOLLOWER_BANDS)
+        table = np.full((n_industries + 1, n_bands + 1, len(QUANTILES)), np.nan, dtype=np.float32)
+        counts = np.zeros((n_industries + 1, n_bands + 1), dtype=np.int64)
+        for i in range(n_industries + 1):
+            for b in range(n_bands + 1):
+                chunks = [values[offsets[s]:offsets[s + 1]] for s in _segments(i, b, n_industries)]
+                merged = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32)
+                counts[i, b] = len(merged)
+                if len(merged):
+                    table[i, b] = np.percentile(merged, QUANTILES)
+        return table, counts
+
+    def _resolve(self, metric: str, industry: Optional[str], band: Optional[int]) -> Tuple[int, int]:
+        """표본이 MIN_PEERS 이상인 가장 좁은 세그먼트 (업종, 구간 인덱스; 전체는 마지막 인덱스)"""
+        n_industries, n_bands = len(self.industries), len(FOLLOWER_BANDS)
+        i = self._industry_index.get(industry, n_industries)
+        b = n_bands if band is None or not 0 <= band < n_bands else band
+        counts = self.counts[metric]
+        for candidate in ((i, b), (i, n_bands), (n_industries, n_bands)):
+            if counts[candidate] >= MIN_PEERS:
+                return candidate
+        return n_industries, n_bands
+
+    def segment_label(self, i: int, b: int) -> str:
+        industry = ALL if i >= len(self.industries) else SURVEY_DATA["business_types"].get(self.industries[i], self.industries[i])
+        band = ALL if b >= len(FOLLOWER_BANDS) else FOLLOWER_BANDS[b]
+        if i >= len(self.industries) and b >= len(FOLLOWER_BANDS):
+            return "전체 계정"
+        return f"{industry} · {band}"
+
+    def percentiles(self, metric: str, values, industry: Optional[str] = None, band: Optional[int] = None) -> np.ndarray:
+        """값 배열의 백분위 (세그먼트마다 searchsorted 두 번; 상위 세그먼트는 하위 결과 합산)"""
+        i, b = self._resolve(metric, industry, band)
+        return self._percentiles(metric, np.asarray(values, dtype=np.float32), i, b)
+
+    def _percentiles(self, metric: str, values: np.ndarray, i: int, b: int) -> np.ndarray:
+        sorted_values, offsets = self.values[metric], self.offsets[metric]
+        below = np.zeros(values.shape, dtype=np.int64)
+        equal = np.zeros(values.shape, dtype=np.int64)
+        for s in _segments(i, b, len(self.industries)):
+            segment = sorted_values[offsets[s]:offsets[s + 1]]
+            left = np.searchsorted(segment, values, side="left")
+            below += left
+            equal += np.searchsorted(segment, values, side="right") - left
+        total = self.counts[metric][i, b]
+        if not total:
+            return np.full(values.shape, np.nan)
+        return (below + equal / 2) / total * 100
+
+    def rank(self, metric: str, value: float, industry: Optional[str] = None,
+             band: Optional[int] = None) -> Optional[PercentileRank]:
+        if value is None or np.isnan(value):
+            return None
+        i, b = self._resolve(metric, industry, band)
+        peers = int(self.counts[metric][i, b])
+        if not peers:
+            return None
+        percentile = float(self._percentiles(metric, np.array([value], dtype=np.float32), i, b)[0])
+        return PercentileRank(metric, float(value), round(percentile, 1), self.segment_label(i, b), peers)
+
+    def rank_metrics(self, metrics: Mapping[str, float], industry: Optional[str] = None,
+                     band: Optional[int] = None) -> List[PercentileRank]:
+        """지표 이름 -> 값 딕셔너리의 색인 지표들을 METRICS 순서로 순위 계산"""
+        ranks = (self.rank(metric, metrics[metric], industry, band) for metric in METRICS if metric in metrics)
+        return [rank for rank in ranks if rank is not None]
+
+    def bands(self, metric: str, industry: Optional[str] = None, band: Optional[int] = None) -> Dict[int, float]:
+        """비교 세그먼트의 미리 계산된 분위수 {10: p10, 25: p25, ...}"""
+        i, b = self._resolve(metric, industry, band)
+        return {q: float(value) for q, value in zip(QUANTILES, self.quantiles[metric][i, b])}
+
+    def save(self, path: str):
+        arrays = {"industries": np.array(self.industries), "source": np.array(self.source)}
+        for k, metric in enumerate(METRICS):
+            arrays[f"values_{k}"] = self.values[metric]
+            arrays[f"offsets_{k}"] = self.offsets[metric]
+            arrays[f"quantiles_{k}"] = self.quantiles[metric]
+            arrays[f"counts_{k}"] = self.counts[metric]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "BenchmarkIndex":
+        with np.load(path, allow_pickle=False) as data:
+            industries = [str(code) for code in data["industries"]]
+            if tuple(industries) != industry_codes():
+                raise ValueError("색인의 업종 목록이 현재 설문 비즈니스 유형과 다릅니다. 색인을 다시 만드세요.")
+            parts = {name: {metric: data[f"{name}_{k}"] for k, metric in enumerate(METRICS)}
+                     for name in ("values", "offsets", "quantiles", "counts")}
+            return cls(industries, parts["values"], parts["offsets"], parts["quantiles"], parts["counts"],
+                       str(data["source"]))
+
+def _segments(i: int, b: int, n_industries: int) -> List[int]:
+    """(업종, 구간) 수준 -> 하위 세그먼트 번호 목록 (마지막 인덱스는 '전체')"""
+    n_bands = len(FOLLOWER_BANDS)
+    industries = range(n_industries) if i >= n_industries else (i,)
+    bands = range(n_bands) if b >= n_bands else (b,)
+    return [industry * n_bands + band for industry in industries for band in bands]
+
+def read_dataset_chunks(source, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """CSV / JSON Lines 데이터셋을 청크로 읽어 표준 열 이름으로 변환"""
+    name = getattr(source, "name", source)
+    if str(name).endswith((".jsonl", ".json")):
+        reader = pd.read_json(source, lines=True, chunksize=chunk_rows)
+    else:
+        reader = pd.read_csv(source, chunksize=chunk_rows)
+    for frame in reader:
+        columns = {column: _ALIAS_LOOKUP.get(str(column).strip().lower().replace(" ", "_")) for column in frame.columns}
+        frame = frame.rename(columns={column: name for column, name in columns.items() if name})
+        missing = {"industry", "followers"} - set(frame.columns)
+        if missing:
+            raise ValueError(f"필수 열이 없습니다: {', '.join(sorted(missing))}")
+        yield frame
+
+# 샘플 데이터셋의 업종별 분포 (팔로워 로그 평균, 1천 팔로워 기준 참여율, 월간 게시물 평균)
+_SAMPLE_PROFILES = {
+    "product": (8.6, 2.2, 18),
+    "service": (7.9, 2.6, 12),
+    "digital": (8.3, 1.9, 16),
+    "creator": (9.4, 3.1, 24),
+    "b2b": (7.2, 1.4, 8)
+}
+
+def sample_accounts(n: int = SAMPLE_ACCOUNTS, seed: int = SAMPLE_SEED) -> pd.DataFrame:
+    """업종별 분포를 흉내 낸 계정 단위 샘플 데이터셋 (팔로워가 많을수록 참여율/증가율이 낮아짐)"""
+    rng = np.random.default_rng(seed)
+    codes = industry_codes()
+    industry = rng.integers(0, len(codes), n)
+    params = np.array([_SAMPLE_PROFILES.get(code, (8.0, 2.0, 14)) for code in codes])
+    log_mean, engagement_base, posts_mean = params[industry].T
+    followers = np.maximum(np.exp(rng.normal(log_mean, 1.6)), 10).astype(np.int64)
+    scale = (followers / 1_000) ** -0.15
+    return pd.DataFrame({
+        "industry": np.array(codes)[industry],
+        "followers": followers,
+        "engagement_rate": np.round(engagement_base * scale * rng.lognormal(0, 0.45, n), 2),
+        "follower_growth": np.round(rng.normal(1.5, 2.5, n) * scale + rng.exponential(1.0, n) * scale, 2),
+        "monthly_posts": rng.poisson(posts_mean * rng.lognormal(0, 0.4, n))
+    })
+
+def sample_index(n: int = SAMPLE_ACCOUNTS, seed: int = SAMPLE_SEED) -> BenchmarkIndex:
+    return BenchmarkIndex.build([sample_accounts(n, seed)], source=f"샘플 데이터 ({n:,}개 계정)")
+
+def load_index(path: str = DEFAULT_PATH) -> BenchmarkIndex:
+    """색인 파일을 읽고, 없으면 샘플 데이터셋으로 만든 색인을 반환"""
+    if os.path.exists(path):
+        return BenchmarkIndex.load(path)
+    return sample_index()
+
+def strategy_metrics(strategy: BrandStrategy) -> Dict[str, float]:
+    """결과 페이지용: 전략의 KPI 목표와 주간 게시 계획을 색인 지표로 변환 (월간 = 주간 × 52 / 12)"""
+    metrics = {metric: float(strategy.kpi_targets[metric]) for metric in ("참여율", "팔로워_증가율")
+               if metric in strategy.kpi_targets}
+    weekly = strategy.posting_frequency.get("총_게시물")
+    if weekly:
+        metrics["월간_게시물"] = round(weekly * 52 / 12, 1)
+    return metrics
+
+def profile_band(profile: UserProfile) -> Optional[int]:
+    return STATUS_BANDS.get(profile.instagram_status)
+
+def monthly_posts(posts: Optional[pd.DataFrame], days: int = 90) -> Optional[float]:
+    """최근 기간 게시물 수의 30일 환산값 (게시물 데이터가 없으면 None)"""
+    if posts is None or not len(posts):
+        return None
+    published = posts["published_at"]
+    recent = published > published.max() - pd.Timedelta(days=days)
+    span_days = max((published.max() - published[recent].min()).days + 1, 1)
+    return round(int(recent.sum()) / min(span_days, days) * 30, 1)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="업종 벤치마크 백분위 색인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="계정 단위 데이터셋(CSV / JSON Lines)으로 색인 만들기")
+    build.add_argument("dataset")
+    build.add_argument("--output", default=DEFAULT_PATH)
+    build.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    sample = sub.add_parser("sample", help="샘플 데이터셋 CSV 생성")
+    sample.add_argument("output")
+    sample.add_argument("--accounts", type=int, default=SAMPLE_ACCOUNTS)
+    sample.add_argument("--seed", type=int, default=SAMPLE_SEED)
+    rank = sub.add_parser("rank", help="지표 값의 백분위 조회")
+    rank.add_argument("values", nargs="+", help="지표=값 (예: 참여율=2.4)")
+    rank.add_argument("--industry", default=None, help="비즈니스 유형 코드")
+    rank.add_argument("--followers", type=float, default=None)
+    rank.add_argument("--index", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = BenchmarkIndex.build(read_dataset_chunks(args.dataset, args.chunk_rows), source=os.path.basename(args.dataset))
+        index.save(args.output)
+        print(f"완료: 계정 {index.accounts:,}개로 색인을 만들었습니다 -> {args.output}", file=sys.stderr)
+    elif args.command == "sample":
+        sample_accounts(args.accounts, args.seed).to_csv(args.output, index=False)
+        print(f"완료: 샘플 계정 {args.accounts:,}개 -> {args.output}", file=sys.stderr)
+    else:
+        index = load_index(args.index)
+        band = None if args.followers is None else int(follower_band([args.followers])[0])
+        metrics = {}
+        for item in args.values:
+            metric, _, value = item.partition("=")
+            if metric not in METRICS:
+                parser.error(f"알 수 없는 지표: {metric} (가능: {', '.join(METRICS)})")
+            metrics[metric] = float(value)
+        for r in index.rank_metrics(metrics, args.industry, band):
+            print(f"{r.metric} {r.value:g}{METRIC_UNITS[r.metric]}: 백분위 {r.percentile:.1f} "
+                  f"(상위 {r.top:.1f}%, {r.segment}, {r.peers:,}개 계정)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,422 @@
+"""인스타그램 인사이트 내보내기(CSV/JSON Lines/JSON 배열) 수집 및 계정별 컬럼형 저장소
+
+내보내기 파일은 정해진 행 수만큼 청크로 읽으며, 열 이름을 표준 스키마로 맞추고
+명시적 dtype(int32, datetime64, 범주 코드)으로 변환한 뒤 청크마다 압축 파티션 하나로 기록합니다.
+파일 전체를 메모리에 올리지 않으므로 수년치 게시물 단위 내보내기도 그대로 수집할 수 있습니다.
+
+저장소 구조:
+    <루트>/<계정>/<종류>/part-00001.npz   (열마다 배열 하나)
+    <루트>/<계정>/<종류>/manifest.json    (파티션 목록, 행 수, 날짜 범위)
+
+사용 예:
+    python insights.py ingest <계정 ID> export.csv --kind daily
+    python insights.py ingest <계정 ID> posts.jsonl --kind posts
+"""
+import argparse
+import codecs
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROOT = os.environ.get("BRANDING_INSIGHTS_DIR", "insights_store")
+DEFAULT_CHUNK_ROWS = 100_000
+
+COUNT_COLUMNS = ["reach", "impressions", "likes", "comments", "saves", "shares"]
+
+# 종류별 표준 스키마: 열 이름 -> 저장 dtype
+SCHEMAS = {
+    "daily": {
+        "date": "datetime64[D]",
+        "followers": np.int32,
+        "profile_views": np.int32,
+        "website_clicks": np.int32,
+        **{column: np.int32 for column in COUNT_COLUMNS}
+    },
+    "posts": {
+        "post_id": np.str_,
+        "published_at": "datetime64[s]",
+        "media_type": np.int8,
+        **{column: np.int32 for column in COUNT_COLUMNS}
+    }
+}
+
+# 종류별 행을 구분하는 키 (같은 키가 다시 수집되면 나중 파티션이 우선)
+KEY_COLUMNS = {"daily": "date", "posts": "post_id"}
+
+# 내보내기 열 이름(소문자, 밑줄은 공백으로 정규화) -> 표준 열 이름
+COLUMN_ALIASES = {
+    "date": ["date", "날짜", "일자"],
+    "post_id": ["post id", "게시물 id", "media id", "id"],
+    "published_at": ["publish time", "게시 시간", "게시일", "timestamp"],
+    "media_type": ["post type", "게시물 유형", "media type", "콘텐츠 유형"],
+    "followers": ["followers", "팔로워", "팔로워 수", "follower count"],
+    "profile_views": ["profile visits", "프로필 방문", "profile views"],
+    "website_clicks": ["website clicks", "웹사이트 클릭", "link clicks"],
+    "reach": ["reach", "도달", "도달 계정"],
+    "impressions": ["impressions", "노출", "views", "조회"],
+    "likes": ["likes", "좋아요"],
+    "comments": ["comments", "댓글"],
+    "saves": ["saves", "저장"],
+    "shares": ["shares", "공유"]
+}
+_ALIAS_LOOKUP = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+# 게시물 유형은 앱의 콘텐츠 타입 이름으로 통일해 int8 코드로 저장
+MEDIA_TYPES = ["릴스", "캐러셀", "스토리", "싱글포스트"]
+MEDIA_TYPE_ALIASES = {
+    "reels": "릴스", "reel": "릴스", "video": "릴스", "릴스": "릴스",
+    "carousel_album": "캐러셀", "carousel": "캐러셀", "캐러셀": "캐러셀",
+    "story": "스토리", "stories": "스토리", "스토리": "스토리",
+    "image": "싱글포스트", "photo": "싱글포스트", "사진": "싱글포스트", "싱글포스트": "싱글포스트"
+}
+
+# 계정 ID 는 저장소 루트 아래 디렉터리 이름이 되므로 점으로만 된 이름('.', '..')은 거부
+_ACCOUNT_PATTERN = re.compile(r"^(?!\.+$)[A-Za-z0-9_.@-]{1,128}$")
+
+def _normalize_header(name: str) -> str:
+    return str(name).strip().lower().replace("_", " ")
+
+def map_columns(headers: List[str], kind: str) -> Dict[str, str]:
+    """내보내기 열 이름 -> 표준 열 이름 매핑 (스키마에 없는 열은 무시)"""
+    mapping = {}
+    for header in headers:
+        column = _ALIAS_LOOKUP.get(_normalize_header(header))
+        if column in SCHEMAS[kind] and column not in mapping.values():
+            mapping[header] = column
+    key = KEY_COLUMNS[kind]
+    if key not in mapping.values():
+        raise ValueError(f"'{key}' 에 해당하는 열을 찾을 수 없습니다: {list(headers)}")
+    return mapping
+
+# JSON 배열은 이 글자 수만큼씩 읽어 레코드 단위로 해석
+JSON_BLOCK_CHARS = 1 << 20
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+def _read_text_blocks(source) -> Iterator[str]:
+    """파일 경로 또는 파일 객체(바이트/텍스트)를 JSON_BLOCK_CHARS 크기의 텍스트 조각으로 반환"""
+    if isinstance(source, str):
+        with open(source, encoding="utf-8-sig") as f:
+            yield from iter(lambda: f.read(JSON_BLOCK_CHARS), "")
+        return
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        raw = source.read(JSON_BLOCK_CHARS)
+        block = decoder.decode(raw, final=not raw) if isinstance(raw, bytes) else raw
+        if block:
+            yield block
+        if not raw:
+            return
+
+class _JsonStream:
+    """텍스트 조각을 이어 붙인 버퍼에서 JSON 값을 하나씩 해석 (해석한 부분은 버퍼에서 버림)"""
+
+    def __init__(self, source):
+        self.source = source
+        self._blocks = _read_text_blocks(source)
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        block = next(self._blocks, "")
+        if not block:
+            return False
+        self._buffer = self._buffer[self._pos:] + block
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """다음 공백이 아닌 글자 (파일 끝이면 빈 문자열)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"'{char}' 가 와야 할 자리에 {found or '파일 끝'!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # 값이 조각 경계에서 잘린 경우 다음 조각을 붙여 다시 해석
+                if self._fill():
+                    continue
+                raise
+            # 버퍼 끝에서 끝난 숫자는 다음 조각에 이어질 수 있음
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def rewind(self):
+        """해석을 그만두고 파일 객체를 처음 위치로 되돌림"""
+        self._blocks.close()
+        if not isinstance(self.source, str):
+            self.source.seek(0)
+
+def _iter_array_records(stream: _JsonStream, chunk_rows: int) -> Iterator[List[Dict]]:
+    try:
+        stream.expect("[")
+        chunk = []
+        if stream.peek() == "]":
+            return
+        while True:
+            record = stream.value()
+            if not isinstance(record, dict):
+                raise ValueError(f"JSON 배열의 원소는 객체여야 합니다: {record!r:.80}")
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+            if stream.peek() == "]":
+                break
+            stream.expect(",")
+        if chunk:
+            yield chunk
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 배열을 해석할 수 없습니다: {e.msg}") from e
+    finally:
+        stream.rewind()
+
+def _json_array_chunks(source, chunk_rows: int) -> Optional[Iterator[List[Dict]]]:
+    """JSON 배열 또는 {"data": [...]} 객체 -> 레코드 목록 청크 (객체가 줄마다 있는 JSON Lines 면 None)
+
+    배열 원소를 하나씩 해석하므로 메모리에는 청크 하나와 읽기 버퍼만 올라갑니다.
+    """
+    stream = _JsonStream(source)
+    first = stream.peek()
+    if first == "{":
+        # 최상위 객체의 키를 차례로 읽어 배열 값을 가진 "data" 키를 찾음 (없으면 JSON Lines 의 첫 레코드)
+        try:
+            stream.expect("{")
+            while True:
+                if stream.peek() != '"':
+                    break
+                key = stream.value()
+                stream.expect(":")
+                if key == "data" and stream.peek() == "[":
+                    return _iter_array_records(stream, chunk_rows)
+                stream.value()
+                if stream.peek() != ",":
+                    break
+                stream.expect(",")
+        except json.JSONDecodeError:
+            pass
+    elif first == "[":
+        return _iter_array_records(stream, chunk_rows)
+    stream.rewind()
+    return None
+
+def read_export_chunks(source, kind: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """내보내기 파일을 표준 열 이름으로 바꾼 DataFrame 청크로 반환
+
+    source 는 파일 경로 또는 파일 객체(업로드 파일 등)입니다. .jsonl 은 JSON Lines 로 읽고,
+    .json 은 JSON 배열이나 {"data": [...]} 형태면 원소를 차례로 해석해 청크로 묶고, 아니면 JSON Lines 로 읽습니다.
+    """
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    records = _json_array_chunks(source, chunk_rows) if name.endswith(".json") else None
+    if records is not None:
+        for chunk in records:
+            chunk = pd.DataFrame.from_records(chunk)
+            mapping = map_columns(list(chunk.columns), kind)
+            yield chunk[list(mapping)].rename(columns=mapping)
+        return
+    if name.endswith((".jsonl", ".json")):
+        for chunk in pd.read_json(source, lines=True, chunksize=chunk_rows, dtype=False):
+            mapping = map_columns(list(chunk.columns), kind)
+            yield chunk[list(mapping)].rename(columns=mapping)
+        return
+
+    # 헤더만 먼저 읽어 필요한 열과 dtype 을 정한 뒤 청크 단위로 읽음
+    headers = list(pd.read_csv(source, nrows=0).columns)
+    if not isinstance(source, str):
+        source.seek(0)
+    mapping = map_columns(headers, kind)
+    dtypes = {
+        header: "float64" if SCHEMAS[kind][column] == np.int32 else "string"
+        for header, column in mapping.items()
+    }
+    reader = pd.read_csv(source, usecols=list(mapping), dtype=dtypes, thousands=",", chunksize=chunk_rows)
+    for chunk in reader:
+        yield chunk.rename(columns=mapping)
+
+def normalize_chunk(frame: pd.DataFrame, kind: str) -> Dict[str, np.ndarray]:
+    """표준 열 이름의 청크를 스키마 dtype 의 배열로 변환 (없는 수치 열은 0)"""
+    n = len(frame)
+    arrays = {}
+    for column, dtype in SCHEMAS[kind].items():
+        if column == "media_type":
+            names = frame[column].astype("string").str.strip().str.lower().map(MEDIA_TYPE_ALIASES) \
+                if column in frame else pd.Series([None] * n)
+            codes = pd.Categorical(names, categories=MEDIA_TYPES).codes
+            arrays[column] = codes.astype(np.int8)
+        elif dtype == np.int32:
+            values = pd.to_numeric(frame[column], errors="coerce") if column in frame else pd.Series(np.zeros(n))
+            arrays[column] = values.fillna(0).to_numpy(dtype=np.float64).astype(np.int32)
+        elif dtype == np.str_:
+            arrays[column] = frame[column].astype("string").fillna("").to_numpy(dtype=str)
+        else:
+            dates = pd.to_datetime(frame[column], errors="coerce", format="mixed")
+            if getattr(dates.dt, "tz", None) is not None:
+                dates = dates.dt.tz_convert(None)
+            arrays[column] = dates.to_numpy(dtype="datetime64[ns]").astype(dtype)
+
+    # 키가 비어 있는 행(날짜 파싱 실패 등)은 버림
+    key = arrays[KEY_COLUMNS[kind]]
+    valid = ~np.isnat(key) if key.dtype.kind == "M" else key != ""
+    return {column: values[valid] for column, values in arrays.items()}
+
+class InsightsStore:
+    """계정별, 종류별 컬럼형 파티션 저장소"""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+
+    def account_dir(self, account: str) -> str:
+        if not _ACCOUNT_PATTERN.match(account):
+            raise ValueError(f"잘못된 계정 ID: {account!r}")
+        return os.path.join(self.root, account)
+
+    def _dir(self, account: str, kind: str) -> str:
+        if kind not in SCHEMAS:
+            raise ValueError(f"알 수 없는 데이터 종류: {kind}")
+        return os.path.join(self.account_dir(account), kind)
+
+    def manifest(self, account: str, kind: str) -> Dict:
+        path = os.path.join(self._dir(account, kind), "manifest.json")
+        if not os.path.exists(path):
+            return {"kind": kind, "parts": []}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, account: str, kind: str, manifest: Dict):
+        # 임시 파일에 쓴 뒤 교체해 읽는 쪽이 반쯤 쓰인 매니페스트를 보지 않게 함
+        directory = self._dir(account, kind)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, os.path.join(directory, "manifest.json"))
+
+    def has_data(self, account: str, kind: str = "daily") -> bool:
+        try:
+            return bool(self.manifest(account, kind)["parts"])
+        except ValueError:
+            return False
+
+    def ingest(self, account: str, source, kind: str = "daily", chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+        """내보내기 파일 하나를 청크 단위로 수집하고 저장한 행 수를 반환"""
+        directory = self._dir(account, kind)
+        os.makedirs(directory, exist_ok=True)
+        manifest = self.manifest(account, kind)
+        key = KEY_COLUMNS[kind]
+        total = 0
+
+        for frame in read_export_chunks(source, kind, chunk_rows):
+            arrays = normalize_chunk(frame, kind)
+            rows = len(arrays[key])
+            if not rows:
+                continue
+            part = f"part-{len(manifest['parts']) + 1:05d}.npz"
+            np.savez_compressed(os.path.join(directory, part), **arrays)
+
+            entry = {"file": part, "rows": rows}
+            time_column = "date" if kind == "daily" else "published_at"
+            times = arrays[time_column][~np.isnat(arrays[time_column])]
+            if len(times):
+                entry["min"], entry["max"] = str(times.min()), str(times.max())
+            manifest["parts"].append(entry)
+            self._write_manifest(account, kind, manifest)
+            total += rows
+        return total
+
+    def iter_parts(self, account: str, kind: str = "daily", first: int = 0) -> Iterator[Dict[str, np.ndarray]]:
+        """first 번째 이후 파티션을 수집 순서대로 하나씩 반환 (증분 처리용)"""
+        directory = self._dir(account, kind)
+        for entry in self.manifest(account, kind)["parts"][first:]:
+            with np.load(os.path.join(directory, entry["file"])) as part:
+                yield {column: part[column] for column in part.files}
+
+    def load(self, account: str, kind: str = "daily", columns: List[str] = None,
+             start: str = None, end: str = None) -> Dict[str, np.ndarray]:
+        """파티션을 이어 붙여 열 배열로 반환
+
+        start/end(YYYY-MM-DD)를 주면 날짜 범위가 겹치지 않는 파티션은 열지 않으며,
+        같은 키가 여러 번 수집된 경우 가장 나중에 수집된 값만 남깁니다.
+        """
+        directory = self._dir(account, kind)
+        key = KEY_COLUMNS[kind]
+        columns = list(columns or SCHEMAS[kind])
+        wanted = columns if key in columns else [key] + columns
+
+        pieces = {column: [] for column in wanted}
+        for entry in self.manifest(account, kind)["parts"]:
+            if start and entry.get("max") and entry["max"][:10] < start:
+                continue
+            if end and entry.get("min") and entry["min"][:10] > end:
+                continue
+            with np.load(os.path.join(directory, entry["file"])) as part:
+                for column in wanted:
+                    pieces[column].append(part[column])
+
+        if not pieces[key]:
+            return {column: np.array([], dtype=SCHEMAS[kind][column]) for column in columns}
+        arrays = {column: np.concatenate(values) for column, values in pieces.items()}
+
+        # 나중 파티션 우선으로 키 중복 제거 후 키 순서로 정렬
+        _, last = np.unique(arrays[key][::-1], return_index=True)
+        keep = len(arrays[key]) - 1 - last
+        if kind == "posts":
+            keep = keep[np.argsort(arrays["published_at"][keep], kind="stable")]
+        arrays = {column: values[keep] for column, values in arrays.items()}
+
+        if start or end:
+            time_column = "date" if kind == "daily" else "published_at"
+            times = arrays[time_column].astype("datetime64[D]")
+            mask = np.ones(len(times), dtype=bool)
+            if start:
+                mask &= times >= np.datetime64(start, "D")
+            if end:
+                mask &= times <= np.datetime64(end, "D")
+            arrays = {column: values[mask] for column, values in arrays.items()}
+        return {column: arrays[column] for column in columns}
+
+    def load_frame(self, account: str, kind: str = "daily", columns: List[str] = None,
+                   start: str = None, end: str = None) -> pd.DataFrame:
+        frame = pd.DataFrame(self.load(account, kind, columns, start, end))
+        if "media_type" in frame:
+            frame["media_type"] = pd.Categorical.from_codes(frame["media_type"], categories=MEDIA_TYPES)
+        return frame
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="인스타그램 인사이트 내보내기 파일을 계정별 저장소로 수집합니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="내보내기 파일 수집")
+    ingest.add_argument("account", help="계정 ID (대시보드에서는 프로필 ID)")
+    ingest.add_argument("files", nargs="+", help="CSV 또는 JSON Lines 내보내기 파일")
+    ingest.add_argument("--kind", choices=list(SCHEMAS), default="daily", help="일별 계정 지표(daily) 또는 게시물별 지표(posts)")
+    ingest.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="청크(파티션)당 행 수")
+    ingest.add_argument("--root", default=DEFAULT_ROOT, help="저장소 루트 디렉터리")
+    args = parser.parse_args(argv)
+
+    store = InsightsStore(args.root)
+    for path in args.files:
+        rows = store.ingest(args.account, path, args.kind, args.chunk_rows)
+        print(f"{path}: {rows:,}행 수집", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
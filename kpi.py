@@ -0,0 +1,138 @@
+"""KPI 달성도 평가와 성과 등급 분류 (벡터화)
+
+여러 계정의 실제 지표(계정 × 지표 행렬)를 각 계정 전략의 kpi_targets 와 한 번에 비교해 달성률을 계산하고,
+지표마다 정렬된 등급 하한값(core.PERFORMANCE_THRESHOLDS)에 대한 이진 탐색으로 우수/양호/평균/개선 필요 등급을 매깁니다.
+계정 수만큼 파이썬 루프를 돌지 않으므로 수천 개 계정도 밀리초 단위로 평가합니다.
+
+    evaluation = evaluate({"참여율": [1.2, 3.4], "팔로워_증가율": [8.0, 21.0]}, [strategy_a, strategy_b])
+    evaluation.to_frame()
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core import PERFORMANCE_THRESHOLDS, PERFORMANCE_TIERS, BrandStrategy
+
+# 등급 기준이 없는 지표의 등급 코드
+NO_TIER = -1
+
+@dataclass
+class KPIEvaluation:
+    metrics: List[str]
+    actual: np.ndarray  # (계정, 지표) 실제 값, 없으면 NaN
+    targets: np.ndarray  # (계정, 지표) 목표 값, 목표가 없으면 NaN
+    attainment: np.ndarray  # 실제 / 목표 * 100 (%), 목표나 실제 값이 없으면 NaN
+    tiers: np.ndarray  # 등급 코드 (0=우수 ... 3=개선 필요, 기준이 없거나 값이 없으면 NO_TIER)
+
+    def tier_labels(self) -> np.ndarray:
+        # NO_TIER(-1) 은 마지막 항목 "-" 를 가리킨다
+        labels = np.array(PERFORMANCE_TIERS + ("-",), dtype=object)
+        return labels[self.tiers]
+
+    def to_frame(self) -> pd.DataFrame:
+        """계정 × 지표를 (account, metric) 행으로 펼친 표"""
+        n_accounts, n_metrics = self.actual.shape
+        return pd.DataFrame({
+            "account": np.repeat(np.arange(n_accounts), n_metrics),
+            "metric": np.tile(self.metrics, n_accounts),
+            "actual": self.actual.ravel(),
+            "target": self.targets.ravel(),
+            "attainment": self.attainment.ravel(),
+            "tier": self.tier_labels().ravel()
+        })
+
+def target_matrix(strategies: Sequence[BrandStrategy], metrics: Sequence[str]) -> np.ndarray:
+    """계정별 kpi_targets 를 (계정, 지표) 행렬로 변환
+
+    대부분의 계정은 몇 가지 전략 템플릿의 목표를 그대로 쓰므로,
+    서로 다른 목표 조합마다 한 행만 만든 뒤 인덱스로 펼칩니다.
+    """
+    rows: Dict[tuple, int] = {}
+    unique_rows = []
+    index = np.empty(len(strategies), dtype=np.int64)
+    for i, strategy in enumerate(strategies):
+        # 같은 템플릿에서 복사한 목표는 키 순서도 같으므로 정렬 없이 항목 튜플을 키로 사용
+        key = tuple(strategy.kpi_targets.items())
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = len(unique_rows)
+            unique_rows.append([strategy.kpi_targets.get(metric, np.nan) for metric in metrics])
+        index[i] = row
+    table = np.array(unique_rows, dtype=np.float64).reshape(len(unique_rows), len(metrics))
+    return table[index]
+
+def classify(actual: np.ndarray, metrics: Sequence[str],
+             thresholds: Mapping[str, Sequence[float]] = PERFORMANCE_THRESHOLDS) -> np.ndarray:
+    """(계정, 지표) 실제 값을 등급 코드로 분류 (하한값 이상이면 해당 등급)"""
+    tiers = np.full(actual.shape, NO_TIER, dtype=np.int8)
+    worst = len(PERFORMANCE_TIERS) - 1
+    for j, metric in enumerate(metrics):
+        bounds = thresholds.get(metric)
+        if bounds is None:
+            continue
+        column = actual[:, j]
+        # 통과한 하한값 개수(0..3)를 뒤집으면 등급 코드
+        passed = np.searchsorted(np.asarray(bounds, dtype=np.float64), column, side="right")
+        tiers[:, j] = np.where(np.isnan(column), NO_TIER, worst - passed)
+    return tiers
+
+class KPIEvaluator:
+    """계정 목록의 목표 행렬을 한 번 만들어 두고, 새로고침마다 실제 지표만 바꿔 평가
+
+    evaluator = KPIEvaluator(strategies, ["참여율", "도달률"])
+    evaluator.evaluate({"참여율": [...], "도달률": [...]})
+    """
+
+    def __init__(self, strategies: Sequence[BrandStrategy], metrics: Sequence[str],
+                 thresholds: Mapping[str, Sequence[float]] = PERFORMANCE_THRESHOLDS):
+        self.metrics = list(metrics)
+        self.thresholds = thresholds
+        self.targets = target_matrix(strategies, self.metrics)
+
+    def evaluate(self, actuals: Mapping[str, Sequence[float]]) -> KPIEvaluation:
+        """actuals 는 지표 이름 → 계정 순서의 값 배열 (strategies 와 같은 순서)"""
+        actual = np.empty(self.targets.shape, dtype=np.float64)
+        for j, metric in enumerate(self.metrics):
+            actual[:, j] = actuals.get(metric, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            attainment = np.where(self.targets > 0, actual / self.targets * 100, np.nan)
+        return KPIEvaluation(self.metrics, actual, self.targets, attainment, classify(actual, self.metrics, self.thresholds))
+
+def evaluate(actuals: Mapping[str, Sequence[float]], strategies: Sequence[BrandStrategy],
+             thresholds: Mapping[str, Sequence[float]] = PERFORMANCE_THRESHOLDS) -> KPIEvaluation:
+    """계정별 실제 지표를 전략 목표와 등급 기준에 대해 한 번 평가 (KPIEvaluator 의 간편 함수)"""
+    return KPIEvaluator(strategies, list(actuals), thresholds).evaluate(actuals)
+
+def completed_months(series: pd.DataFrame) -> pd.DataFrame:
+    """월별 롤업 시계열에서 진행 중인 마지막 달(데이터 일수 < 그 달의 일수)을 뺀 시계열
+
+    앞에 완료된 달이 없으면 그대로 반환합니다.
+    """
+    if len(series) > 1:
+        last = series.iloc[-1]
+        if last["days"] < pd.Timestamp(last["bucket"]).days_in_month:
+            return series.iloc[:-1]
+    return series
+
+def metrics_from_rollup(series: pd.DataFrame) -> Dict[str, float]:
+    """월별 롤업 시계열(rollup.RollupEngine.series)의 마지막 완료 월 KPI 실제 값
+
+    - 팔로워_증가율: 직전 달 말 대비 팔로워 증가율 (%)
+    - 참여율: (좋아요+댓글+저장+공유) / 도달 (%)
+    - 도달률: 일평균 도달 / 팔로워 수 (%)
+    진행 중인 달(데이터 일수 < 그 달의 일수)은 한 달치 목표와 비교하면 미달로 보이므로,
+    앞에 완료된 달이 있으면 제외하고 평가합니다.
+    """
+    if not len(series):
+        return {}
+    series = completed_months(series)
+    current = series.iloc[-1]
+    metrics = {"참여율": float(current["engagement_rate"])}
+    if len(series) > 1 and series["followers"].iloc[-2] > 0:
+        previous = float(series["followers"].iloc[-2])
+        metrics["팔로워_증가율"] = (float(current["followers"]) - previous) / previous * 100
+    if current["followers"] > 0 and current["days"] > 0:
+        metrics["도달률"] = float(current["reach"]) / float(current["days"]) / float(current["followers"]) * 100
+    return metrics
@@ -0,0 +1,118 @@
+"""에이전시 포트폴리오용 고객별 성과 요약 갱신
+
+고객(프로필)마다 인사이트 월별 롤업의 최근 완료 달 지표를 전략 KPI 목표와 비교해
+팔로워 수, 팔로워 증가율, 참여율, 도달률, 평균 KPI 달성률, 성과 등급을 계산하고
+ProfileStore 의 account_metrics 테이블에 기록합니다. 포트폴리오 화면은 이 요약 테이블만 SQL 로 조회하므로
+고객이 1만 명이어도 리런마다 전체 데이터를 불러오지 않습니다.
+
+KPI 평가는 배치(기본 500명)마다 kpi.KPIEvaluator 로 한 번에 처리합니다.
+대시보드에서 인사이트를 새로 가져오면 해당 고객만 바로 갱신되고, 전체 갱신은 다음 명령으로 실행합니다.
+
+    python portfolio.py refresh --db branding.db
+"""
+import argparse
+import sys
+from itertools import islice
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import BrandStrategy, PERFORMANCE_TIERS
+from insights import InsightsStore
+from kpi import NO_TIER, KPIEvaluator, metrics_from_rollup
+from rollup import RollupEngine
+from store import ProfileStore
+
+# 포트폴리오에서 비교하는 KPI (롤업에서 계산 가능한 지표)
+PORTFOLIO_METRICS = ("팔로워_증가율", "참여율", "도달률")
+DEFAULT_BATCH_SIZE = 500
+
+def account_snapshot(month_series: Optional[pd.DataFrame]) -> Dict[str, float]:
+    """월별 롤업 시계열 -> 최근 완료 달 KPI 실제 값과 현재 팔로워 수 (데이터가 없으면 빈 딕셔너리)"""
+    if month_series is None or not len(month_series):
+        return {}
+    snapshot = metrics_from_rollup(month_series)
+    snapshot["팔로워"] = float(month_series["followers"].iloc[-1])
+    return snapshot
+
+def summarize_accounts(strategies: Sequence[BrandStrategy], snapshots: Sequence[Mapping[str, float]]) -> List[Dict]:
+    """계정별 스냅샷을 전략 목표와 한 번에 비교해 account_metrics 행 값으로 변환
+
+    - attainment: 목표가 있는 지표들의 달성률 평균 (%). 지표마다 100% 에서 잘라, 한 지표의 초과 달성이
+      다른 지표의 미달을 가리지 않게 함 (100% = 모든 목표 달성)
+    - tier: 지표별 등급 중 가장 낮은 등급 코드 (0=우수 ... 3=개선 필요)
+    """
+    evaluation = KPIEvaluator(strategies, PORTFOLIO_METRICS).evaluate(
+        {metric: [snapshot.get(metric, np.nan) for snapshot in snapshots] for metric in PORTFOLIO_METRICS}
+    )
+    valid = ~np.isnan(evaluation.attainment)
+    counts = valid.sum(axis=1)
+    capped = np.where(valid, np.minimum(evaluation.attainment, 100.0), 0.0)
+    attainment = np.where(counts > 0, capped.sum(axis=1) / np.maximum(counts, 1), np.nan)
+    tiers = evaluation.tiers.max(axis=1)
+
+    def value(x):
+        return None if x is None or np.isnan(x) else round(float(x), 4)
+
+    rows = []
+    for i, snapshot in enumerate(snapshots):
+        followers = snapshot.get("팔로워")
+        rows.append({
+            "followers": None if followers is None else int(followers),
+            "follower_growth": value(snapshot.get("팔로워_증가율")),
+            "engagement_rate": value(snapshot.get("참여율")),
+            "reach_rate": value(snapshot.get("도달률")),
+            "attainment": value(attainment[i]),
+            "tier": None if tiers[i] == NO_TIER else int(tiers[i])
+        })
+    return rows
+
+def tier_label(tier: Optional[int]) -> str:
+    return "-" if tier is None else PERFORMANCE_TIERS[tier]
+
+def _batches(items: Iterable, size: int) -> Iterable[List]:
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+def refresh_accounts(store: ProfileStore, insights: InsightsStore, rollups: RollupEngine,
+                     accounts: Iterable[str] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """인사이트 일별 데이터가 있는 고객의 성과 요약을 다시 계산해 기록 (기본: 저장된 모든 고객)"""
+    accounts = store.iter_ids() if accounts is None else accounts
+    updated = 0
+    for batch in _batches((a for a in accounts if insights.has_data(a, "daily")), batch_size):
+        pairs: List[Tuple[str, BrandStrategy, Dict]] = []
+        for account in batch:
+            saved = store.get(account)
+            if saved is None or saved[1] is None:
+                continue
+            rollups.refresh(account)
+            pairs.append((account, saved[1], account_snapshot(rollups.series(account, "month"))))
+        if not pairs:
+            continue
+        rows = summarize_accounts([strategy for _, strategy, _ in pairs], [snapshot for _, _, snapshot in pairs])
+        updated += store.save_account_metrics(zip((account for account, _, _ in pairs), rows))
+    return updated
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="고객별 성과 요약(account_metrics)을 갱신합니다.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refresh = sub.add_parser("refresh", help="인사이트 데이터로 성과 요약 다시 계산")
+    refresh.add_argument("accounts", nargs="*", help="갱신할 프로필 ID (기본: 전체)")
+    refresh.add_argument("--db", default=None, help="SQLite 파일 경로 (기본: BRANDING_DB_PATH)")
+    refresh.add_argument("--insights", default=None, help="인사이트 저장소 경로 (기본: BRANDING_INSIGHTS_DIR)")
+    refresh.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    store = ProfileStore(args.db) if args.db else ProfileStore()
+    insights = InsightsStore(args.insights) if args.insights else InsightsStore()
+    updated = refresh_accounts(store, insights, RollupEngine(insights), args.accounts or None, args.batch_size)
+    print(f"완료: 고객 {updated:,}명의 성과 요약을 갱신했습니다.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
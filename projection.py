@@ -0,0 +1,188 @@
+"""12주 실행 계획의 팔로워/참여율 몬테카를로 전망
+
+전략의 주간 게시 계획(posting_frequency), 콘텐츠 믹스(content_mix), 12주 단계(weekly_plans)와
+계정의 과거 주간 변동성(AccountHistory)으로 수천 개의 주간 궤적을 NumPy 한 번의 벡터 연산으로 시뮬레이션하고
+주차별 p10 / p50 / p90 밴드와 KPI 목표 달성 확률을 계산합니다.
+
+모형 (시뮬레이션 s, 주차 w, 포맷 f):
+- 게시 수 ~ Poisson(주간 계획_f × 단계별 게시 비율_w)
+- 성장 활동량 = Σ_f 게시 수 × 포맷 성장 가중치 (릴스 > 캐러셀 > 싱글포스트 > 스토리)
+- 주간 팔로워 증가율 = 과거 평균 × (활동량 / 기준 활동량)^탄력성 × 단계 가속 + 주간 변동 + 계정별 편차
+- 주간 참여율 = 과거 평균 × 콘텐츠 믹스 효과 × 로그정규 변동 (믹스 효과는 참조 데이터 팩의 포맷별 참여율 기준)
+과거 인사이트가 없으면 설문의 계정 현황으로 시작 팔로워를, 사전값(PRIOR_*)으로 평균/변동성을 정합니다.
+아직 계정이 없는 경우(시작 팔로워 0)에는 팔로워 전망 없이 참여율만 전망합니다.
+
+결과는 (프로필, 전략) 내용 해시 + 시드 + 과거 통계를 키로 LRU 캐시에 보관합니다.
+
+    python benchmarks/bench_projection.py --simulations 5000
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import reference
+from core import BrandStrategy, UserProfile
+from guide import LRUCache, guide_key
+
+DEFAULT_SIMULATIONS = 5_000
+DEFAULT_SEED = 12
+QUANTILES = (10, 50, 90)
+HISTORY_WEEKS = 26
+MIN_HISTORY_WEEKS = 4
+
+# 포맷별 팔로워 유입 가중치 (주간 성장 활동량 계산용)
+FORMAT_GROWTH_WEIGHTS = {"릴스": 1.0, "캐러셀": 0.6, "싱글포스트": 0.3, "스토리": 0.1}
+# 과거 성장률이 반영하는 것으로 보는 주간 활동량 (릴스 2 + 캐러셀 2 + 싱글포스트 2 수준)
+BASELINE_ACTIVITY = 3.8
+GROWTH_ELASTICITY = 0.5
+# 단계 이름 -> (게시 계획 대비 실제 게시 비율, 성장 가속 배수)
+PHASE_EFFECTS = {
+    "브랜드 파운데이션": (0.5, 1.0),
+    "콘텐츠 전략 실행": (1.0, 1.0),
+    "성장 가속화": (1.0, 1.3)
+}
+
+# 인사이트 데이터가 없을 때의 사전값 (주간 증가율 %, 참여율 %)
+PRIOR_GROWTH = (1.0, 1.5)
+PRIOR_ENGAGEMENT = (2.0, 0.6)
+# 설문의 계정 현황 -> 시작 팔로워 사전값
+# - business_*: 설문 구간(100명 미만 / 100-1000명 / 1000명 이상)의 대표값
+# - personal: 팔로워 구간을 묻지 않으며, 지인 팔로워가 있는 개인 계정을 비즈니스용으로 전환하는 경우가 많아
+#   새로 만든 비즈니스 계정(business_small)보다 높은 수백 명 수준으로 봄
+# - none: 계정이 아직 없으므로 0 (팔로워 전망을 만들지 않음, Projection.has_followers)
+STATUS_FOLLOWERS = {
+    "none": 0, "personal": 300, "business_small": 60, "business_medium": 500, "business_large": 3_000
+}
+
+@dataclass(frozen=True, slots=True)
+class AccountHistory:
+    """과거 주간 지표 요약 (캐시 키에 들어가므로 변경 불가)"""
+    followers: int
+    growth_mean: float          # 주간 팔로워 증가율 평균 (%)
+    growth_std: float           # 주간 팔로워 증가율 표준편차 (%)
+    engagement_mean: float      # 주간 참여율 평균 (%)
+    engagement_std: float
+    weeks: int = 0              # 통계에 쓴 완료 주 수 (0 = 사전값)
+
+def prior_history(profile: UserProfile) -> AccountHistory:
+    return AccountHistory(STATUS_FOLLOWERS.get(profile.instagram_status, 0), *PRIOR_GROWTH, *PRIOR_ENGAGEMENT)
+
+def history_from_series(weekly: Optional[pd.DataFrame], profile: UserProfile) -> AccountHistory:
+    """주별 롤업 시계열(rollup.RollupEngine.series(.., "week"))의 완료된 최근 주들 -> 과거 통계
+
+    완료 주가 MIN_HISTORY_WEEKS 보다 적으면 평균/변동성은 사전값을 쓰고 시작 팔로워만 실제 값을 사용합니다.
+    """
+    prior = prior_history(profile)
+    if weekly is None or not len(weekly):
+        return prior
+    followers = int(weekly["followers"].iloc[-1])
+    complete = weekly[weekly["days"] >= 7].tail(HISTORY_WEEKS + 1)
+    counts = complete["followers"].to_numpy(dtype=np.float64)
+    if len(complete) <= MIN_HISTORY_WEEKS or not (counts[:-1] > 0).all():
+        return AccountHistory(followers, *PRIOR_GROWTH, *PRIOR_ENGAGEMENT)
+    growth = np.diff(counts) / counts[:-1] * 100
+    # 일별 내보내기에 좋아요/댓글 등이 없으면 참여율이 0 이므로 참여율만 사전값 사용
+    engagement = complete["engagement_rate"].to_numpy(dtype=np.float64)[1:]
+    engagement = engagement[engagement > 0]
+    engagement_stats = (
+        (round(float(engagement.mean()), 4), round(float(max(engagement.std(ddof=1), 0.05)), 4))
+        if len(engagement) >= MIN_HISTORY_WEEKS else PRIOR_ENGAGEMENT
+    )
+    return AccountHistory(
+        followers, round(float(growth.mean()), 4), round(float(max(growth.std(ddof=1), 0.1)), 4),
+        *engagement_stats, len(growth)
+    )
+
+@dataclass(frozen=True, slots=True)
+class Projection:
+    weeks: np.ndarray           # (주차,) 1..12
+    followers: np.ndarray       # (분위수, 주차) p10 / p50 / p90
+    engagement: np.ndarray      # (분위수, 주차) 참여율 (%)
+    target_probability: Dict[str, float]   # KPI -> 목표 달성 확률 (0-1)
+    history: AccountHistory
+    simulations: int
+    seed: int
+
+    @property
+    def has_followers(self) -> bool:
+        """시작 팔로워가 있어 팔로워 전망이 의미 있는지 (계정이 없으면 참여율만 전망)"""
+        return self.history.followers > 0
+
+    def band(self, metric: str) -> Dict[int, np.ndarray]:
+        values = self.followers if metric == "followers" else self.engagement
+        return dict(zip(QUANTILES, values))
+
+def _format_engagement() -> Dict[str, float]:
+    data = reference.current().benchmarks["format_engagement"]
+    return dict(zip(data["포맷"], data["참여율"]))
+
+def simulate(strategy: BrandStrategy, history: AccountHistory, simulations: int = DEFAULT_SIMULATIONS,
+             seed: int = DEFAULT_SEED) -> Projection:
+    """(시뮬레이션 수, 주차) 궤적을 한 번에 생성해 분위수와 목표 달성 확률로 요약"""
+    rng = np.random.default_rng(seed)
+    plans = strategy.weekly_plans
+    n_weeks = len(plans)
+    phases = np.array([PHASE_EFFECTS.get(plan.phase, (1.0, 1.0)) for plan in plans], dtype=np.float64)
+
+    formats = [f for f in FORMAT_GROWTH_WEIGHTS if strategy.posting_frequency.get(f)]
+    weekly_posts = np.array([strategy.posting_frequency[f] for f in formats], dtype=np.float64)
+    growth_weights = np.array([FORMAT_GROWTH_WEIGHTS[f] for f in formats], dtype=np.float64)
+    posts = rng.poisson(phases[:, 0, None] * weekly_posts, size=(simulations, n_weeks, len(formats)))
+    activity = posts @ growth_weights
+
+    # 계정별 편차(궤적 전체에 공통) + 주간 변동
+    growth_std = history.growth_std / 100
+    account_effect = rng.normal(0.0, growth_std * 0.5, size=(simulations, 1))
+    shocks = rng.normal(0.0, growth_std, size=(simulations, n_weeks))
+    growth = history.growth_mean / 100 * (activity / BASELINE_ACTIVITY) ** GROWTH_ELASTICITY * phases[:, 1] \
+        + account_effect + shocks
+    # 계정이 없으면(시작 팔로워 0) 비율 성장 모형이 의미가 없으므로 팔로워 밴드는 NaN, 달성 확률은 생략
+    followers = history.followers * np.cumprod(1 + np.maximum(growth, -0.5), axis=1) \
+        if history.followers > 0 else np.full((simulations, n_weeks), np.nan)
+
+    format_engagement = _format_engagement()
+    mix = {f: share for f, share in strategy.content_mix.items() if f in format_engagement}
+    mix_effect = (sum(format_engagement[f] * share for f, share in mix.items()) / sum(mix.values())
+                  / np.mean(list(format_engagement.values()))) if mix else 1.0
+    sigma = np.sqrt(np.log1p((history.engagement_std / max(history.engagement_mean, 1e-6)) ** 2))
+    engagement = history.engagement_mean * mix_effect * np.exp(
+        rng.normal(-sigma ** 2 / 2, sigma, size=(simulations, n_weeks)) + rng.normal(0.0, sigma * 0.5, size=(simulations, 1))
+    )
+
+    # 마지막 4주(한 달) 기준 목표 달성 확률 (팔로워_증가율은 월간 %)
+    probability = {}
+    month = min(4, n_weeks - 1)
+    if "팔로워_증가율" in strategy.kpi_targets and month > 0 and history.followers > 0:
+        monthly_growth = (followers[:, -1] / followers[:, -1 - month] - 1) * 100
+        probability["팔로워_증가율"] = float((monthly_growth >= strategy.kpi_targets["팔로워_증가율"]).mean())
+    if "참여율" in strategy.kpi_targets:
+        probability["참여율"] = float((engagement[:, -4:].mean(axis=1) >= strategy.kpi_targets["참여율"]).mean())
+
+    return Projection(
+        weeks=np.arange(1, n_weeks + 1),
+        followers=np.percentile(followers, QUANTILES, axis=0),
+        engagement=np.percentile(engagement, QUANTILES, axis=0),
+        target_probability=probability,
+        history=history,
+        simulations=simulations,
+        seed=seed
+    )
+
+class ProjectionEngine:
+    """(프로필, 전략) 내용 해시 + 시드 + 과거 통계별 전망 캐시"""
+
+    def __init__(self, maxsize: int = 1024, simulations: int = DEFAULT_SIMULATIONS):
+        self.simulations = simulations
+        self._cache = LRUCache(maxsize)
+
+    def project(self, profile: UserProfile, strategy: BrandStrategy, history: AccountHistory = None,
+                seed: int = DEFAULT_SEED) -> Projection:
+        history = history or prior_history(profile)
+        key = (guide_key(profile, strategy), seed, history, self.simulations)
+        return self._cache.get_or_create(key, lambda: simulate(strategy, history, self.simulations, seed))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self._cache.hits, "misses": self._cache.misses, "size": len(self._cache)}
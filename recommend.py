@@ -0,0 +1,230 @@
+"""데이터 기반 개선 권장사항 규칙 엔진
+
+규칙은 아래 _RULE_DEFINITIONS 에 데이터로 정의하고, 모듈 로드 시 한 번 컴파일해
+(1) 규칙 튜플과 (2) 지표 이름 -> 그 지표를 읽는 규칙 인덱스의 의존성 색인을 만듭니다.
+RecommendationEngine 은 계정마다 직전 입력 지표와 규칙별 결과를 기억하고,
+값이 바뀐 지표에 의존하는 규칙만 다시 평가한 뒤 우선순위와 예상 효과 순으로 정렬해 반환합니다.
+
+입력 지표(account_metrics):
+- 참여율, 팔로워_증가율, 도달률: 최근 완료 월 실제 값 (kpi.metrics_from_rollup)
+- 목표_<지표>: 전략의 kpi_targets
+- 클릭률: 최근 완료 월 웹사이트 클릭 / 도달 (%)
+- 비중_<콘텐츠 타입>, 참여율_<콘텐츠 타입>, 참여율_전체: 최근 게시물 기준 실제 비중과 참여율 (%)
+- 계획_<콘텐츠 타입>: 전략의 content_mix
+"""
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import BrandStrategy
+from insights import MEDIA_TYPES
+from kpi import completed_months, metrics_from_rollup
+
+PRIORITIES = ("높음", "중간", "낮음")
+
+# 게시물 지표는 최근 이 기간(일)의 게시물로 계산
+RECENT_POST_DAYS = 90
+
+# 콘텐츠 비중이 계획과 이만큼(%p) 이상 벌어지면 조정을 권장
+MIX_GAP_POINTS = 10.0
+
+@dataclass(frozen=True)
+class Recommendation:
+    rule_id: str
+    priority: str
+    area: str
+    message: str
+    effect: str
+    impact: float  # 정렬용 예상 개선 폭 (%)
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    area: str
+    inputs: Tuple[str, ...]
+    when: Callable[[Mapping[str, float]], bool]
+    impact: Callable[[Mapping[str, float]], float]
+    priority: Callable[[Mapping[str, float]], str]
+    message: str
+    effect: str
+
+    def evaluate(self, metrics: Mapping[str, float]) -> Optional[Recommendation]:
+        if any(name not in metrics for name in self.inputs) or not self.when(metrics):
+            return None
+        impact = float(self.impact(metrics))
+        values = {**metrics, "impact": impact}
+        return Recommendation(
+            self.id, self.priority(metrics), self.area,
+            self.message.format(**values), self.effect.format(**values), impact
+        )
+
+def _gap_priority(metric: str) -> Callable[[Mapping[str, float]], str]:
+    # 목표의 절반도 못 미치면 높음, 그 외 중간
+    return lambda m: "높음" if m[metric] < m[f"목표_{metric}"] * 0.5 else "중간"
+
+def _shortfall(metric: str) -> Callable[[Mapping[str, float]], float]:
+    # 목표까지 남은 폭을 현재 값 대비 비율(%)로 (현재 값이 0에 가까우면 300%에서 자름)
+    return lambda m: min((m[f"목표_{metric}"] - m[metric]) / max(m[metric], 0.1) * 100, 300.0)
+
+_RULE_DEFINITIONS = [
+    {
+        "id": "engagement_below_target",
+        "area": "참여 증대",
+        "inputs": ("참여율", "목표_참여율"),
+        "when": lambda m: m["참여율"] < m["목표_참여율"],
+        "impact": _shortfall("참여율"),
+        "priority": _gap_priority("참여율"),
+        "message": "참여율이 {참여율:.1f}%로 목표 {목표_참여율:.1f}%에 못 미칩니다. 캐러셀과 스토리에 폴·퀴즈 등 인터랙티브 요소를 추가하고 캡션 끝에 질문형 CTA 를 넣으세요",
+        "effect": "+{impact:.0f}% 참여율"
+    },
+    {
+        "id": "growth_below_target",
+        "area": "팔로워 성장",
+        "inputs": ("팔로워_증가율", "목표_팔로워_증가율"),
+        "when": lambda m: m["팔로워_증가율"] < m["목표_팔로워_증가율"],
+        "impact": lambda m: m["목표_팔로워_증가율"] - m["팔로워_증가율"],
+        "priority": _gap_priority("팔로워_증가율"),
+        "message": "월 팔로워 증가율이 {팔로워_증가율:.1f}%로 목표 {목표_팔로워_증가율:.0f}%보다 낮습니다. 유사 계정과의 협업 콘텐츠와 공유를 유도하는 저장형 콘텐츠를 늘리세요",
+        "effect": "+{impact:.1f}%p 팔로워 증가율"
+    },
+    {
+        "id": "reach_below_target",
+        "area": "도달 확대",
+        "inputs": ("도달률", "목표_도달률"),
+        "when": lambda m: m["도달률"] < m["목표_도달률"],
+        "impact": _shortfall("도달률"),
+        "priority": _gap_priority("도달률"),
+        "message": "일평균 도달률이 {도달률:.1f}%로 목표 {목표_도달률:.0f}%에 못 미칩니다. 팔로워 활동이 많은 시간대에 게시하고 해시태그 조합을 주기적으로 점검하세요",
+        "effect": "+{impact:.0f}% 도달률"
+    },
+    {
+        "id": "low_click_through",
+        "area": "트래픽 전환",
+        "inputs": ("클릭률",),
+        "when": lambda m: m["클릭률"] < 1.0,
+        "impact": lambda m: min((1.0 - m["클릭률"]) / max(m["클릭률"], 0.05) * 100, 300.0),
+        "priority": lambda m: "중간",
+        "message": "도달 대비 웹사이트 클릭률이 {클릭률:.2f}%입니다. 스토리 링크 스티커와 하이라이트 링크를 활용하고 바이오 링크를 최적화하세요",
+        "effect": "+{impact:.0f}% 웹사이트 클릭"
+    },
+    {
+        "id": "all_targets_met",
+        "area": "전략 유지",
+        "inputs": ("참여율", "목표_참여율", "팔로워_증가율", "목표_팔로워_증가율"),
+        "when": lambda m: m["참여율"] >= m["목표_참여율"] and m["팔로워_증가율"] >= m["목표_팔로워_증가율"],
+        "impact": lambda m: 0.0,
+        "priority": lambda m: "낮음",
+        "message": "참여율과 팔로워 증가율 목표를 모두 달성했습니다. 현재 콘텐츠 믹스를 유지하면서 다음 분기 목표 상향을 검토하세요",
+        "effect": "현재 성과 유지"
+    }
+]
+
+def _mix_rules(media_type: str) -> List[Dict]:
+    """콘텐츠 타입별 믹스 규칙: 성과가 좋은데 계획보다 적게 올리면 확대, 성과가 낮은데 많이 올리면 축소"""
+    share, plan, rate = f"비중_{media_type}", f"계획_{media_type}", f"참여율_{media_type}"
+    inputs = (share, plan, rate, "참여율_전체")
+    return [
+        {
+            "id": f"increase_{media_type}",
+            "area": "콘텐츠 최적화",
+            "inputs": inputs,
+            "when": lambda m: m[plan] - m[share] >= MIX_GAP_POINTS and m[rate] >= m["참여율_전체"],
+            # 늘린 비중만큼 전체 참여율이 해당 타입 참여율 쪽으로 이동한다고 가정
+            "impact": lambda m: (m[plan] - m[share]) / 100 * (m[rate] - m["참여율_전체"]) / max(m["참여율_전체"], 0.01) * 100,
+            "priority": lambda m: "높음" if m[plan] - m[share] >= 2 * MIX_GAP_POINTS else "중간",
+            "message": f"{media_type} 참여율({{{rate}:.1f}}%)이 평균보다 높지만 비중이 {{{share}:.0f}}%로 계획한 {{{plan}:.0f}}%보다 낮습니다. {media_type} 비중을 {{{plan}:.0f}}%로 확대하세요",
+            "effect": "+{impact:.0f}% 참여율"
+        },
+        {
+            "id": f"reduce_{media_type}",
+            "area": "콘텐츠 최적화",
+            "inputs": inputs,
+            "when": lambda m: m[share] - m[plan] >= MIX_GAP_POINTS and m[rate] < m["참여율_전체"],
+            "impact": lambda m: (m[share] - m[plan]) / 100 * (m["참여율_전체"] - m[rate]) / max(m["참여율_전체"], 0.01) * 100,
+            "priority": lambda m: "중간",
+            "message": f"{media_type} 비중이 {{{share}:.0f}}%로 계획({{{plan}:.0f}}%)보다 높지만 참여율은 {{{rate}:.1f}}%로 평균보다 낮습니다. 줄인 만큼 성과가 좋은 포맷에 배분하세요",
+            "effect": "+{impact:.0f}% 참여율"
+        }
+    ]
+
+def compile_rules(definitions: List[Dict]) -> Tuple[Tuple[Rule, ...], Mapping[str, Tuple[int, ...]]]:
+    """규칙 정의를 Rule 튜플과 지표 -> 규칙 인덱스 의존성 색인으로 컴파일"""
+    rules = tuple(Rule(**definition) for definition in definitions)
+    dependents: Dict[str, List[int]] = {}
+    for i, rule in enumerate(rules):
+        for name in rule.inputs:
+            dependents.setdefault(name, []).append(i)
+    return rules, {name: tuple(indices) for name, indices in dependents.items()}
+
+RULES, RULE_DEPENDENTS = compile_rules(
+    _RULE_DEFINITIONS + [rule for media_type in MEDIA_TYPES for rule in _mix_rules(media_type)]
+)
+
+def rank(recommendations) -> List[Recommendation]:
+    """우선순위(높음 → 낮음), 같은 우선순위 안에서는 예상 효과가 큰 순"""
+    return sorted(recommendations, key=lambda r: (PRIORITIES.index(r.priority), -r.impact, r.rule_id))
+
+class RecommendationEngine:
+    """계정별 직전 입력과 결과를 기억해 바뀐 지표에 의존하는 규칙만 재평가 (세션 간 공유)"""
+
+    def __init__(self, rules: Tuple[Rule, ...] = RULES, dependents: Mapping[str, Tuple[int, ...]] = RULE_DEPENDENTS):
+        self.rules = rules
+        self.dependents = dependents
+        self._state: Dict[str, Tuple[Dict[str, float], Dict[int, Optional[Recommendation]]]] = {}
+        self._lock = threading.Lock()
+        self.evaluations = 0
+
+    def recommend(self, account: str, metrics: Mapping[str, float]) -> List[Recommendation]:
+        with self._lock:
+            previous, results = self._state.get(account, ({}, {}))
+            changed = [name for name in metrics.keys() | previous.keys() if metrics.get(name) != previous.get(name)]
+            stale = {i for name in changed for i in self.dependents.get(name, ())}
+            results = dict(results)
+            for i in stale:
+                results[i] = self.rules[i].evaluate(metrics)
+            self.evaluations += len(stale)
+            self._state[account] = (dict(metrics), results)
+        return rank(r for r in results.values() if r is not None)
+
+def content_metrics(posts: pd.DataFrame, days: int = RECENT_POST_DAYS) -> Dict[str, float]:
+    """최근 게시물의 콘텐츠 타입별 비중과 참여율 (%)"""
+    if posts is None or not len(posts):
+        return {}
+    recent = posts[posts["published_at"] > posts["published_at"].max() - pd.Timedelta(days=days)]
+    engagement = recent[["likes", "comments", "saves", "shares"]].sum(axis=1).to_numpy(dtype=np.float64)
+    reach = recent["reach"].to_numpy(dtype=np.float64)
+    codes = recent["media_type"].cat.codes.to_numpy()
+    metrics = {}
+    if reach.sum() > 0:
+        metrics["참여율_전체"] = engagement.sum() / reach.sum() * 100
+    counts = np.bincount(codes[codes >= 0], minlength=len(MEDIA_TYPES))
+    engagement_by_type = np.bincount(codes[codes >= 0], weights=engagement[codes >= 0], minlength=len(MEDIA_TYPES))
+    reach_by_type = np.bincount(codes[codes >= 0], weights=reach[codes >= 0], minlength=len(MEDIA_TYPES))
+    for code, media_type in enumerate(MEDIA_TYPES):
+        metrics[f"비중_{media_type}"] = counts[code] / max(counts.sum(), 1) * 100
+        if reach_by_type[code] > 0:
+            metrics[f"참여율_{media_type}"] = engagement_by_type[code] / reach_by_type[code] * 100
+    return metrics
+
+def account_metrics(month_series: Optional[pd.DataFrame], posts: Optional[pd.DataFrame],
+                    strategy: BrandStrategy) -> Dict[str, float]:
+    """규칙 엔진 입력 지표 (월별 롤업 + 게시물 + 전략 목표/콘텐츠 믹스)"""
+    metrics = {f"목표_{name}": float(value) for name, value in strategy.kpi_targets.items()}
+    # 전략에 없는 타입은 계획 비중 0% (많이 올리면서 성과가 낮으면 축소 권장 대상)
+    metrics.update({f"계획_{media_type}": float(strategy.content_mix.get(media_type, 0)) for media_type in MEDIA_TYPES})
+    if month_series is not None and len(month_series):
+        metrics.update(metrics_from_rollup(month_series))
+        # KPI 지표와 같은 달(마지막 완료 월) 기준
+        current = completed_months(month_series).iloc[-1]
+        if current["reach"] > 0:
+            metrics["클릭률"] = float(current["website_clicks"]) / float(current["reach"]) * 100
+    content = content_metrics(posts)
+    metrics.update(content)
+    # 일별 계정 내보내기에 좋아요/댓글 등이 없으면 게시물 기준 참여율을 사용
+    if not metrics.get("참여율") and "참여율_전체" in content:
+        metrics["참여율"] = content["참여율_전체"]
+    # 부동소수 오차로 값이 바뀐 것처럼 보이지 않도록 반올림 (재평가 판단 기준)
+    return {name: round(float(value), 4) for name, value in metrics.items()}
@@ -0,0 +1,302 @@
+"""버전이 붙은 참조 데이터 팩 (data/reference.json)
+
+설문 선택지, 전략 정의, 성과 등급 기준, 리소스 센터 콘텐츠(도구, 가이드, 템플릿), 벤치마크 수치를
+코드 대신 JSON 파일 하나에 두고, 프로세스당 한 번 파싱/검증해 읽기 전용 객체(MappingProxyType, 튜플)로
+모든 세션이 공유합니다.
+
+파일이 바뀌면(mtime/크기) 다음 조회 때 새 팩을 완전히 파싱하고 검증한 뒤 참조 하나를 바꿔 끼우므로,
+읽는 쪽은 항상 이전 팩 또는 새 팩 전체를 봅니다. 검증에 실패하면 이전 팩을 계속 사용하고 오류를 기록합니다.
+파일 상태 확인은 CHECK_INTERVAL 초에 한 번이라 리런마다 드는 비용은 없습니다.
+
+- resources / benchmarks 는 페이지가 current() 로 매번 조회하므로 재배포 없이 바로 반영됩니다.
+- survey / strategies / performance 는 core 가 임포트 시점의 팩으로 전략 테이블과 점수 행렬을 컴파일하고
+  저장된 프로필도 이 코드값을 참조하므로, 바뀐 값은 프로세스를 재시작할 때 적용됩니다 (restart_required).
+
+경로는 BRANDING_REFERENCE_PATH 로 바꿀 수 있습니다. 파일을 고칠 때는 검증부터 하세요:
+    python reference.py check data/reference.json
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional
+
+SCHEMA_VERSION = 1
+DEFAULT_PATH = os.environ.get(
+    "BRANDING_REFERENCE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference.json")
+)
+CHECK_INTERVAL = 1.0
+
+SURVEY_CHOICES = ("business_stages", "business_types", "instagram_statuses", "age_groups", "primary_goals",
+                  "brand_archetypes")
+SURVEY_OPTIONS = ("gender_options", "differentiation_options", "time_options", "budget_options", "tool_options")
+STRATEGY_FIELDS = ("brand_type", "strategy_name", "content_pillars", "posting_frequency", "content_mix",
+                   "recommended_tools", "kpi_targets")
+# 재시작해야 반영되는 섹션
+ENGINE_SECTIONS = ("survey", "strategies", "performance")
+
+class ReferencePackError(ValueError):
+    """참조 데이터 팩을 읽을 수 없거나 검증에 실패함"""
+
+def freeze(value):
+    """세션 간에 공유해도 안전하도록 dict/list 를 읽기 전용 타입으로 변환"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+@dataclass(frozen=True)
+class ReferencePack:
+    schema: int
+    version: str
+    digest: str  # 파일 내용 해시 (캐시 키로 사용)
+    survey: Mapping[str, Any]
+    strategies: Mapping[str, Any]
+    performance: Mapping[str, Any]
+    resources: Mapping[str, Any]
+    benchmarks: Mapping[str, Any]
+
+# --- 검증 ---
+
+def _check(condition: bool, path: str, message: str, errors: List[str]) -> bool:
+    if not condition:
+        errors.append(f"{path}: {message}")
+    return condition
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _check_mapping(value, path: str, errors: List[str], values=None) -> bool:
+    """문자열 키의 비어 있지 않은 객체인지 (values 가 있으면 값 검사 함수)"""
+    if not _check(isinstance(value, dict) and len(value) > 0, path, "비어 있지 않은 객체여야 합니다", errors):
+        return False
+    for key, item in value.items():
+        if values is not None:
+            values(item, f"{path}.{key}")
+    return True
+
+def _check_strings(value, path: str, errors: List[str]) -> bool:
+    return _check(
+        isinstance(value, list) and len(value) > 0 and all(isinstance(item, str) and item for item in value),
+        path, "비어 있지 않은 문자열 배열이어야 합니다", errors
+    )
+
+def _validate_survey(survey, errors: List[str]):
+    if not _check_mapping(survey, "survey", errors):
+        return
+    for name in SURVEY_CHOICES:
+        _check_mapping(survey.get(name), f"survey.{name}", errors,
+                       lambda item, path: _check(isinstance(item, str) and item, path, "라벨 문자열이 필요합니다", errors))
+    for name in SURVEY_OPTIONS:
+        _check_strings(survey.get(name), f"survey.{name}", errors)
+
+def _validate_strategies(strategies, survey, errors: List[str]):
+    if not _check_mapping(strategies, "strategies", errors):
+        return
+    definitions = strategies.get("definitions")
+    if _check_mapping(definitions, "strategies.definitions", errors):
+        for key, definition in definitions.items():
+            path = f"strategies.definitions.{key}"
+            if not _check(isinstance(definition, dict), path, "객체여야 합니다", errors):
+                continue
+            missing = [field for field in STRATEGY_FIELDS if field not in definition]
+            if not _check(not missing, path, f"필드 누락: {', '.join(missing)}", errors):
+                continue
+            _check_strings(definition["content_pillars"], f"{path}.content_pillars", errors)
+            _check_strings(definition["recommended_tools"], f"{path}.recommended_tools", errors)
+            for field in ("posting_frequency", "content_mix"):
+                _check_mapping(definition[field], f"{path}.{field}", errors, lambda item, p: _check(
+                    isinstance(item, int) and not isinstance(item, bool) and item >= 0, p, "0 이상의 정수여야 합니다", errors
+                ))
+            _check("총_게시물" in definition["posting_frequency"], f"{path}.posting_frequency", "총_게시물 항목이 필요합니다", errors)
+            if isinstance(definition["content_mix"], dict):
+                _check(sum(definition["content_mix"].values()) == 100, f"{path}.content_mix", "비율 합계가 100 이어야 합니다", errors)
+            _check_mapping(definition["kpi_targets"], f"{path}.kpi_targets", errors,
+                           lambda item, p: _check(_is_number(item), p, "숫자여야 합니다", errors))
+    else:
+        definitions = {}
+
+    goals = survey.get("primary_goals", {}) if isinstance(survey, dict) else {}
+    types = survey.get("business_types", {}) if isinstance(survey, dict) else {}
+    routes = strategies.get("goal_routes")
+    if _check_mapping(routes, "strategies.goal_routes", errors):
+        _check(set(routes) == set(goals), "strategies.goal_routes", "survey.primary_goals 의 모든 목표를 빠짐없이 연결해야 합니다", errors)
+        for goal, key in routes.items():
+            _check(key in definitions, f"strategies.goal_routes.{goal}", f"없는 전략 '{key}'", errors)
+    overrides = strategies.get("business_overrides", [])
+    if _check(isinstance(overrides, list), "strategies.business_overrides", "배열이어야 합니다", errors):
+        for i, override in enumerate(overrides):
+            path = f"strategies.business_overrides[{i}]"
+            if not _check(isinstance(override, dict), path, "객체여야 합니다", errors):
+                continue
+            _check(override.get("business_type") in types, path, "없는 business_type", errors)
+            _check(override.get("goal") in goals, path, "없는 goal", errors)
+            _check(override.get("strategy") in definitions, path, "없는 strategy", errors)
+    _check(strategies.get("default") in definitions, "strategies.default", "정의된 전략 키여야 합니다", errors)
+
+def _validate_performance(performance, errors: List[str]):
+    if not _check_mapping(performance, "performance", errors):
+        return
+    tiers, labels = performance.get("tiers"), performance.get("tier_labels")
+    if not (_check_strings(tiers, "performance.tiers", errors) and _check_strings(labels, "performance.tier_labels", errors)):
+        return
+    # 성과 기준표(core.performance_standards_rows)가 4단계 (하한값 3개) 를 전제로 함
+    _check(len(tiers) == 4, "performance.tiers", "등급은 4개여야 합니다", errors)
+    _check(len(tiers) == len(labels), "performance.tier_labels", "tiers 와 개수가 같아야 합니다", errors)
+
+    def check_bounds(bounds, path):
+        _check(
+            isinstance(bounds, list) and len(bounds) == len(tiers) - 1 and all(map(_is_number, bounds))
+            and list(bounds) == sorted(bounds),
+            path, f"오름차순 숫자 {len(tiers) - 1}개여야 합니다 (평균, 양호, 우수 하한값)", errors
+        )
+    _check_mapping(performance.get("thresholds"), "performance.thresholds", errors, check_bounds)
+    decimals = performance.get("decimals", {})
+    _check(isinstance(decimals, dict) and all(isinstance(v, int) and v >= 0 for v in decimals.values()),
+           "performance.decimals", "지표별 0 이상의 정수여야 합니다", errors)
+
+def _validate_table(table, path: str, errors: List[str]):
+    """열 이름 -> 같은 길이의 배열"""
+    if not _check_mapping(table, path, errors):
+        return
+    lengths = {len(column) if isinstance(column, list) else -1 for column in table.values()}
+    _check(len(lengths) == 1 and -1 not in lengths and 0 not in lengths, path, "열마다 같은 길이의 비어 있지 않은 배열이어야 합니다", errors)
+
+def _validate_content(resources, benchmarks, errors: List[str]):
+    if _check_mapping(resources, "resources", errors):
+        _check_mapping(resources.get("tools"), "resources.tools", errors, lambda tools, path: _check(
+            isinstance(tools, list) and all(isinstance(t, dict) and {"이름", "용도", "가격", "추천도"} <= set(t) for t in tools),
+            path, "이름/용도/가격/추천도 를 가진 객체 배열이어야 합니다", errors
+        ))
+        guides = resources.get("guides")
+        _check(
+            isinstance(guides, list) and len(guides) > 0
+            and all(isinstance(g, dict) and {"제목", "설명", "난이도", "소요시간"} <= set(g) for g in guides),
+            "resources.guides", "제목/설명/난이도/소요시간 을 가진 객체 배열이어야 합니다", errors
+        )
+        _check_mapping(resources.get("templates"), "resources.templates", errors,
+                       lambda templates, path: _check_strings(templates, path, errors))
+    if _check_mapping(benchmarks, "benchmarks", errors):
+        _validate_table(benchmarks.get("format_engagement"), "benchmarks.format_engagement", errors)
+        _validate_table(benchmarks.get("industries"), "benchmarks.industries", errors)
+
+def validate(data) -> List[str]:
+    """팩 내용의 오류 목록 (비어 있으면 유효)"""
+    errors: List[str] = []
+    if not _check(isinstance(data, dict), "$", "최상위는 객체여야 합니다", errors):
+        return errors
+    if not _check(data.get("schema") == SCHEMA_VERSION, "schema", f"지원하는 스키마 버전은 {SCHEMA_VERSION} 입니다", errors):
+        return errors
+    _check(isinstance(data.get("version"), str) and data["version"], "version", "버전 문자열이 필요합니다", errors)
+    survey = data.get("survey")
+    _validate_survey(survey, errors)
+    _validate_strategies(data.get("strategies"), survey, errors)
+    _validate_performance(data.get("performance"), errors)
+    _validate_content(data.get("resources"), data.get("benchmarks"), errors)
+    return errors
+
+def parse_pack(raw: bytes) -> ReferencePack:
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ReferencePackError(f"JSON 을 읽을 수 없습니다: {e}") from e
+    errors = validate(data)
+    if errors:
+        raise ReferencePackError("참조 데이터 검증 실패:\n" + "\n".join(f"  - {error}" for error in errors))
+    return ReferencePack(
+        schema=data["schema"],
+        version=data["version"],
+        digest=hashlib.sha256(raw).hexdigest()[:12],
+        **{section: freeze(data[section]) for section in ("survey", "strategies", "performance", "resources", "benchmarks")}
+    )
+
+def load_pack(path: str = DEFAULT_PATH) -> ReferencePack:
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise ReferencePackError(f"참조 데이터 파일을 열 수 없습니다: {e}") from e
+    return parse_pack(raw)
+
+# --- 공유 로더 ---
+
+class ReferenceLoader:
+    """파일이 바뀌면 새 팩으로 원자적으로 교체하는 프로세스 전역 로더"""
+
+    def __init__(self, path: str = DEFAULT_PATH, check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._pack = load_pack(path)
+        self._checked = time.monotonic()
+        self.initial = self._pack
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self) -> ReferencePack:
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return self._pack
+        # 한 스레드만 파일 상태를 확인/재적재하고, 나머지는 기존 팩을 그대로 사용
+        if not self._lock.acquire(blocking=False):
+            return self._pack
+        try:
+            self._checked = now
+            signature = self._stat()
+            if signature is not None and signature != self._signature:
+                self._signature = signature
+                try:
+                    pack = load_pack(self.path)
+                except ReferencePackError as e:
+                    # 쓰는 중이거나 잘못된 파일: 이전 팩 유지 (다음 변경 때 다시 시도)
+                    self.last_error = str(e)
+                else:
+                    self._pack = pack
+                    self.last_error = None
+                    self.reloads += 1
+        finally:
+            self._lock.release()
+        return self._pack
+
+    def restart_required(self) -> bool:
+        """재시작해야 반영되는 섹션(설문, 전략, 성과 기준)이 시작 시점과 달라졌는지"""
+        pack = self._pack
+        return any(getattr(pack, section) != getattr(self.initial, section) for section in ENGINE_SECTIONS)
+
+LOADER = ReferenceLoader()
+
+def current() -> ReferencePack:
+    """현재 참조 데이터 팩 (파일이 바뀌었으면 새로 읽은 팩)"""
+    return LOADER.current()
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="참조 데이터 팩 검증")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="파일을 파싱하고 검증")
+    check.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        pack = load_pack(args.path)
+    except ReferencePackError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"유효함: 스키마 {pack.schema}, 버전 {pack.version}, 내용 해시 {pack.digest}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
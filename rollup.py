@@ -0,0 +1,211 @@
+"""팔로워/참여 지표의 일·주·월 단위 증분 롤업 엔진
+
+계정마다 해상도별 버킷(버킷 시작일 순으로 정렬된 열 배열)을 유지하고,
+인사이트 저장소에 새로 수집된 파티션만 읽어 버킷을 갱신합니다. 과거 이력은 다시 읽지 않습니다.
+- 합계 지표(도달, 노출, 클릭, 좋아요 등)는 버킷별 합계
+- 팔로워 수는 버킷 안에서 가장 최근 날짜의 값
+같은 날짜가 다시 수집되면 일 단위 버킷의 이전 값과의 차이만 주/월 버킷에 반영합니다.
+
+롤업 상태는 <인사이트 루트>/<계정>/rollup.npz 에 저장되며, 조회는 이진 탐색으로 구간을 잘라 반환합니다.
+"""
+import os
+import tempfile
+import threading
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from insights import InsightsStore
+
+RESOLUTIONS = {"day": "일별", "week": "주별", "month": "월별"}
+SUM_COLUMNS = ["reach", "impressions", "profile_views", "website_clicks", "likes", "comments", "saves", "shares"]
+ENGAGEMENT_COLUMNS = ["likes", "comments", "saves", "shares"]
+
+_NO_DATE = np.datetime64("NaT", "D")
+
+def bucket_start(dates: np.ndarray, resolution: str) -> np.ndarray:
+    """날짜(datetime64[D]) 배열을 해상도별 버킷 시작일로 변환 (주는 월요일 시작)"""
+    if resolution == "day":
+        return dates
+    if resolution == "week":
+        # 1970-01-01 은 목요일이므로 +3 하면 월요일 기준 요일 오프셋이 된다
+        days = dates.astype(np.int64)
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    if resolution == "month":
+        return dates.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"알 수 없는 해상도: {resolution}")
+
+class Rollup:
+    """한 계정, 한 해상도의 버킷 집합"""
+
+    def __init__(self, resolution: str):
+        self.resolution = resolution
+        self.keys = np.array([], dtype="datetime64[D]")
+        self.sums = {column: np.array([], dtype=np.int64) for column in SUM_COLUMNS}
+        self.followers = np.array([], dtype=np.int64)
+        self.followers_date = np.array([], dtype="datetime64[D]")
+        self.days = np.array([], dtype=np.int32)
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        """버킷 키의 위치를 반환하고, 없는 키는 정렬 순서를 유지하며 삽입"""
+        missing = np.setdiff1d(keys, self.keys, assume_unique=True)
+        if len(missing):
+            at = np.searchsorted(self.keys, missing)
+            self.keys = np.insert(self.keys, at, missing)
+            for column in SUM_COLUMNS:
+                self.sums[column] = np.insert(self.sums[column], at, 0)
+            self.followers = np.insert(self.followers, at, 0)
+            self.followers_date = np.insert(self.followers_date, at, _NO_DATE)
+            self.days = np.insert(self.days, at, 0)
+        return np.searchsorted(self.keys, keys)
+
+    def add(self, dates: np.ndarray, deltas: Dict[str, np.ndarray], new_day: np.ndarray, followers: np.ndarray):
+        """일 단위 변경분(날짜별 합계 차이, 새 날짜 여부, 팔로워 수)을 버킷에 반영"""
+        buckets = bucket_start(dates, self.resolution)
+        unique, inverse = np.unique(buckets, return_inverse=True)
+        rows = self._positions(unique)[inverse]
+
+        for column in SUM_COLUMNS:
+            np.add.at(self.sums[column], rows, deltas[column])
+        np.add.at(self.days, rows, new_day.astype(np.int32))
+
+        # 버킷별로 이번 변경분 중 가장 최근 날짜의 팔로워 수가 기존 값보다 새로우면 교체
+        order = np.lexsort((dates, inverse))
+        last = order[np.r_[np.flatnonzero(np.diff(inverse[order])), len(order) - 1]]
+        target = rows[last]
+        current = self.followers_date[target]
+        newer = np.isnat(current) | (dates[last] >= current)
+        self.followers[target[newer]] = followers[last][newer]
+        self.followers_date[target[newer]] = dates[last][newer]
+
+    def query(self, start: str = None, end: str = None) -> Dict[str, np.ndarray]:
+        lo = np.searchsorted(self.keys, np.datetime64(start, "D")) if start else 0
+        hi = np.searchsorted(self.keys, np.datetime64(end, "D"), side="right") if end else len(self.keys)
+        result = {"bucket": self.keys[lo:hi], "followers": self.followers[lo:hi], "days": self.days[lo:hi]}
+        result.update({column: values[lo:hi] for column, values in self.sums.items()})
+        return result
+
+    def state(self) -> Dict[str, np.ndarray]:
+        prefix = f"{self.resolution}__"
+        arrays = {
+            f"{prefix}keys": self.keys,
+            f"{prefix}followers": self.followers,
+            f"{prefix}followers_date": self.followers_date,
+            f"{prefix}days": self.days
+        }
+        arrays.update({f"{prefix}{column}": values for column, values in self.sums.items()})
+        return arrays
+
+    @classmethod
+    def from_state(cls, resolution: str, arrays) -> "Rollup":
+        rollup = cls(resolution)
+        prefix = f"{resolution}__"
+        rollup.keys = arrays[f"{prefix}keys"]
+        rollup.followers = arrays[f"{prefix}followers"]
+        rollup.followers_date = arrays[f"{prefix}followers_date"]
+        rollup.days = arrays[f"{prefix}days"]
+        rollup.sums = {column: arrays[f"{prefix}{column}"] for column in SUM_COLUMNS}
+        return rollup
+
+class AccountRollups:
+    """한 계정의 해상도별 롤업과 처리한 파티션 수"""
+
+    def __init__(self):
+        self.parts_processed = 0
+        self.rollups = {resolution: Rollup(resolution) for resolution in RESOLUTIONS}
+
+    def apply(self, part: Dict[str, np.ndarray]):
+        """일별 파티션 하나를 모든 해상도에 반영"""
+        dates = part["date"].astype("datetime64[D]")
+        if not len(dates):
+            return
+        # 파티션 안에서 같은 날짜가 반복되면 마지막 행만 사용
+        _, last = np.unique(dates[::-1], return_index=True)
+        keep = np.sort(len(dates) - 1 - last)
+        dates = dates[keep]
+
+        # 이미 반영된 날짜는 일 단위 버킷의 이전 값과의 차이만 더한다
+        day = self.rollups["day"]
+        idx = np.searchsorted(day.keys, dates)
+        clipped = np.minimum(idx, max(len(day.keys) - 1, 0))
+        exists = (idx < len(day.keys)) & (day.keys[clipped] == dates) if len(day.keys) else np.zeros(len(dates), bool)
+        deltas = {}
+        for column in SUM_COLUMNS:
+            values = part[column][keep].astype(np.int64)
+            previous = np.where(exists, day.sums[column][clipped], 0) if len(day.keys) else 0
+            deltas[column] = values - previous
+        followers = part["followers"][keep].astype(np.int64)
+
+        for rollup in self.rollups.values():
+            rollup.add(dates, deltas, ~exists, followers)
+
+class RollupEngine:
+    """계정별 롤업을 메모리에 유지하며 새 파티션만 반영하는 엔진 (세션 간 공유)"""
+
+    def __init__(self, insights: InsightsStore):
+        self.insights = insights
+        self._accounts: Dict[str, AccountRollups] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, account: str) -> str:
+        return os.path.join(self.insights.account_dir(account), "rollup.npz")
+
+    def _load(self, account: str) -> AccountRollups:
+        account_rollups = AccountRollups()
+        path = self._path(account)
+        if os.path.exists(path):
+            with np.load(path) as arrays:
+                account_rollups.parts_processed = int(arrays["parts_processed"])
+                account_rollups.rollups = {
+                    resolution: Rollup.from_state(resolution, arrays) for resolution in RESOLUTIONS
+                }
+        return account_rollups
+
+    def _save(self, account: str, account_rollups: AccountRollups):
+        arrays = {"parts_processed": np.array(account_rollups.parts_processed)}
+        for rollup in account_rollups.rollups.values():
+            arrays.update(rollup.state())
+        directory = self.insights.account_dir(account)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self._path(account))
+
+    def refresh(self, account: str) -> AccountRollups:
+        """아직 반영하지 않은 일별 파티션만 읽어 롤업을 갱신"""
+        with self._lock:
+            account_rollups = self._accounts.get(account)
+            if account_rollups is None:
+                account_rollups = self._accounts[account] = self._load(account)
+            total = len(self.insights.manifest(account, "daily")["parts"])
+            if total > account_rollups.parts_processed:
+                for part in self.insights.iter_parts(account, "daily", account_rollups.parts_processed):
+                    account_rollups.apply(part)
+                account_rollups.parts_processed = total
+                self._save(account, account_rollups)
+            return account_rollups
+
+    def date_range(self, account: str):
+        """롤업에 반영된 첫 날짜와 마지막 날짜 (데이터가 없으면 None)"""
+        keys = self.refresh(account).rollups["day"].keys
+        if not len(keys):
+            return None
+        return keys[0].astype(object), keys[-1].astype(object)
+
+    def series(self, account: str, resolution: str = "week", start: str = None, end: str = None) -> pd.DataFrame:
+        """해상도별 버킷 시계열 (bucket, followers, days, 합계 지표, engagement_rate)"""
+        arrays = self.refresh(account).rollups[resolution].query(start, end)
+        frame = pd.DataFrame(arrays)
+        engagement = frame[ENGAGEMENT_COLUMNS].sum(axis=1).to_numpy(dtype=np.float64)
+        reach = frame["reach"].to_numpy()
+        frame["engagement_rate"] = np.divide(engagement * 100, reach, out=np.zeros(len(frame)), where=reach > 0)
+        return frame
+
+def rebuild(insights: InsightsStore, account: str) -> AccountRollups:
+    """전체 이력으로 롤업을 새로 계산 (검증/복구용)"""
+    account_rollups = AccountRollups()
+    for part in insights.iter_parts(account, "daily"):
+        account_rollups.apply(part)
+    account_rollups.parts_processed = len(insights.manifest(account, "daily")["parts"])
+    return account_rollups
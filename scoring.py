@@ -0,0 +1,154 @@
+"""프로필 x 전략 다요인 적합도 점수 엔진
+
+프로필을 수치 행렬(범주형 원-핫 + 주요 목표 순위 가중치 + 톤앤보이스 슬라이더 4개)로
+인코딩한 뒤, 전략별 가중치 행렬과의 행렬곱 한 번으로 모든 프로필의 모든 전략 점수를 계산합니다.
+인코딩 결과를 재사용하면 가중치만 바꿔 전체 고객을 즉시 재순위화할 수 있습니다.
+"""
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from core import (
+    BUDGET_OPTIONS, GENDER_OPTIONS, STRATEGY_DEFINITIONS, SURVEY_DATA, TIME_OPTIONS, TONE_KEYS,
+    UserProfile
+)
+
+# (프로필 필드, 선택지) — 한 값만 선택되는 항목은 원-핫으로 인코딩
+CATEGORICAL_FIELDS = [
+    ("business_stage", list(SURVEY_DATA["business_stages"])),
+    ("business_type", list(SURVEY_DATA["business_types"])),
+    ("instagram_status", list(SURVEY_DATA["instagram_statuses"])),
+    ("target_age_group", list(SURVEY_DATA["age_groups"])),
+    ("target_gender", GENDER_OPTIONS),
+    ("brand_archetype", list(SURVEY_DATA["brand_archetypes"])),
+    ("time_available", TIME_OPTIONS),
+    ("budget", BUDGET_OPTIONS)
+]
+
+# 주요 목표는 선택 순서(우선순위)에 따라 가중치를 달리한다
+GOAL_RANK_WEIGHTS = [1.0, 0.6, 0.3]
+
+# 전략별 특성 가중치 (지정하지 않은 특성은 0)
+# 특성 이름: "필드=값", "primary_goals=값", "tone:슬라이더" (슬라이더는 -1(1점) ~ +1(10점)으로 정규화)
+DEFAULT_STRATEGY_WEIGHTS = {
+    "product_awareness": {
+        "primary_goals=awareness": 1.0, "primary_goals=traffic": 1.0, "primary_goals=sales": 1.0,
+        "business_type=product": 0.8, "business_type=digital": 0.5,
+        "brand_archetype=explorer": 0.3, "brand_archetype=magician": 0.3,
+        "brand_archetype=creator": 0.3, "brand_archetype=innocent": 0.2,
+        "budget=30-50만원": 0.2, "budget=50-100만원": 0.3, "budget=100만원 이상": 0.3,
+        "tone:polite_bold": 0.15
+    },
+    "service_expertise": {
+        "primary_goals=leads": 1.0, "primary_goals=expertise": 1.0,
+        "business_type=service": 0.8, "business_type=b2b": 0.8,
+        "brand_archetype=sage": 0.4, "brand_archetype=ruler": 0.4, "brand_archetype=hero": 0.2,
+        "business_stage=growth": 0.1, "business_stage=mature": 0.2,
+        "tone:formal_casual": -0.2, "tone:factual_passionate": -0.2
+    },
+    "creator_community": {
+        "primary_goals=community": 1.0, "primary_goals=partnerships": 1.0,
+        "business_type=creator": 0.8,
+        "brand_archetype=everyman": 0.3, "brand_archetype=jester": 0.3,
+        "brand_archetype=lover": 0.3, "brand_archetype=caregiver": 0.3,
+        "time_available=10-20시간": 0.2, "time_available=20시간 이상": 0.3,
+        "time_available=2시간 미만": -0.3,
+        "tone:formal_casual": 0.2, "tone:serious_fun": 0.2
+    }
+}
+
+class ProfileEncoder:
+    """UserProfile 목록을 (프로필 수, 특성 수) float32 행렬로 변환"""
+
+    def __init__(self):
+        self.feature_names: List[str] = []
+        self._offsets: Dict[str, Tuple[int, Dict[str, int]]] = {}
+        for field, options in CATEGORICAL_FIELDS + [("primary_goals", list(SURVEY_DATA["primary_goals"]))]:
+            self._offsets[field] = (len(self.feature_names), {value: i for i, value in enumerate(options)})
+            self.feature_names.extend(f"{field}={value}" for value in options)
+        self._tone_offset = len(self.feature_names)
+        self.feature_names.extend(f"tone:{key}" for key in TONE_KEYS)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    def _column_indices(self, field: str, values) -> np.ndarray:
+        offset, lookup = self._offsets[field]
+        idx = np.fromiter((lookup.get(value, -1) for value in values), dtype=np.int64)
+        return np.where(idx >= 0, idx + offset, -1)
+
+    def encode(self, profiles: Sequence[UserProfile]) -> np.ndarray:
+        n = len(profiles)
+        X = np.zeros((n, self.n_features), dtype=np.float32)
+        rows = np.arange(n)
+
+        # 선택지에 없는 값(-1)은 해당 특성을 0으로 둔다
+        for field, _ in CATEGORICAL_FIELDS:
+            cols = self._column_indices(field, (getattr(p, field) for p in profiles))
+            valid = cols >= 0
+            X[rows[valid], cols[valid]] = 1.0
+
+        for rank, weight in enumerate(GOAL_RANK_WEIGHTS):
+            cols = self._column_indices(
+                "primary_goals",
+                (p.primary_goals[rank] if len(p.primary_goals) > rank else None for p in profiles)
+            )
+            valid = cols >= 0
+            X[rows[valid], cols[valid]] += weight
+
+        tones = np.array(
+            [[p.tone_scores.get(key, 5) for key in TONE_KEYS] for p in profiles],
+            dtype=np.float32
+        ).reshape(n, len(TONE_KEYS))
+        X[:, self._tone_offset:] = (tones - 5.5) / 4.5
+        return X
+
+class StrategyScorer:
+    """인코딩된 프로필 행렬과 전략 가중치 행렬의 곱으로 적합도를 계산"""
+
+    def __init__(self, weights: Mapping[str, Mapping[str, float]] = None):
+        self.encoder = ProfileEncoder()
+        self.strategy_keys: List[str] = list(STRATEGY_DEFINITIONS)
+        self.set_weights(weights or DEFAULT_STRATEGY_WEIGHTS)
+
+    def set_weights(self, weights: Mapping[str, Mapping[str, float]]):
+        """전략별 가중치를 (특성 수, 전략 수) 행렬로 컴파일"""
+        W = np.zeros((self.encoder.n_features, len(self.strategy_keys)), dtype=np.float32)
+        for strategy_key, features in weights.items():
+            if strategy_key not in STRATEGY_DEFINITIONS:
+                raise ValueError(f"알 수 없는 전략: {strategy_key}")
+            column = self.strategy_keys.index(strategy_key)
+            for feature, weight in features.items():
+                if feature not in self.encoder.feature_index:
+                    raise ValueError(f"알 수 없는 특성: {feature}")
+                W[self.encoder.feature_index[feature], column] = weight
+        self.weights = W
+
+    def encode(self, profiles: Sequence[UserProfile]) -> np.ndarray:
+        return self.encoder.encode(profiles)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """(프로필 수, 전략 수) 점수 행렬"""
+        return X @ self.weights
+
+    def top_k(self, X: np.ndarray, k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """프로필별 상위 k개 전략의 (열 인덱스, 점수), 점수 내림차순"""
+        scores = self.score(X)
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def rank(self, profiles: Sequence[UserProfile], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """프로필별 [(전략 키, 점수), ...] 상위 k개"""
+        indices, scores = self.top_k(self.encode(profiles), k)
+        return [
+            [(self.strategy_keys[i], float(s)) for i, s in zip(row_indices, row_scores)]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
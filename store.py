@@ -0,0 +1,412 @@
+"""UserProfile / BrandStrategy 영구 저장소 (SQLite, WAL 모드)
+
+세션 상태는 새로고침이나 서버 재시작 시 사라지므로, 설문 제출 결과를 이 저장소에 기록하고
+결과 페이지는 저장소에서 바로 다시 불러옵니다.
+연결은 스레드마다 하나씩 열고, 쓰기는 트랜잭션 단위로 묶어서 처리합니다.
+작성 중인 설문(초안)도 같은 저장소의 drafts 테이블에 DraftAutosaver 가 모아서 기록합니다.
+account_metrics 테이블에는 고객별 최근 성과 요약(portfolio.py)을 두고, 포트폴리오 화면의
+집계/정렬/필터/페이지 나누기는 모두 SQL 로 처리합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import BrandStrategy, UserProfile, profile_from_dict, profile_to_dict, strategy_from_dict, strategy_to_dict
+
+DEFAULT_DB_PATH = os.environ.get("BRANDING_DB_PATH", "branding.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    business_stage TEXT NOT NULL,
+    business_type TEXT NOT NULL,
+    brand_archetype TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS strategies (
+    profile_id TEXT PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    strategy_name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_business_type ON profiles(business_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_profiles_brand_archetype ON profiles(brand_archetype, created_at);
+CREATE INDEX IF NOT EXISTS idx_profiles_created_at ON profiles(created_at, id);
+CREATE TABLE IF NOT EXISTS drafts (
+    id TEXT PRIMARY KEY,
+    step INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drafts_updated_at ON drafts(updated_at);
+CREATE TABLE IF NOT EXISTS account_metrics (
+    profile_id TEXT PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    updated_at TEXT NOT NULL,
+    followers INTEGER,
+    follower_growth REAL,
+    engagement_rate REAL,
+    reach_rate REAL,
+    attainment REAL,
+    tier INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_strategies_name ON strategies(strategy_name);
+CREATE INDEX IF NOT EXISTS idx_account_metrics_attainment ON account_metrics(attainment);
+CREATE INDEX IF NOT EXISTS idx_account_metrics_growth ON account_metrics(follower_growth);
+CREATE INDEX IF NOT EXISTS idx_account_metrics_followers ON account_metrics(followers);
+CREATE INDEX IF NOT EXISTS idx_account_metrics_tier ON account_metrics(tier);
+"""
+
+# 성과 요약 열 (account_metrics 테이블 순서)
+ACCOUNT_METRIC_COLUMNS = ("followers", "follower_growth", "engagement_rate", "reach_rate", "attainment", "tier")
+
+# 포트폴리오 정렬 기준 -> SQL 식 (사용자 입력을 SQL 에 직접 넣지 않도록 허용 목록으로만 선택)
+PORTFOLIO_SORTS = {
+    "created_at": "p.created_at",
+    "followers": "m.followers",
+    "follower_growth": "m.follower_growth",
+    "engagement_rate": "m.engagement_rate",
+    "attainment": "m.attainment"
+}
+
+_PORTFOLIO_FROM = """profiles p
+    LEFT JOIN strategies s ON s.profile_id = p.id
+    LEFT JOIN account_metrics m ON m.profile_id = p.id"""
+
+def _to_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+class ProfileStore:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않는다 (Streamlit 은 세션마다 스레드가 다름)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def save(self, profile: UserProfile, strategy: BrandStrategy):
+        self.save_many([(profile, strategy)])
+
+    def save_many(self, items: Iterable[Tuple[UserProfile, BrandStrategy]]) -> int:
+        """여러 제출 결과를 한 트랜잭션으로 기록 (같은 ID 는 덮어씀)"""
+        profile_rows, strategy_rows = [], []
+        for profile, strategy in items:
+            profile_rows.append((
+                profile.id, profile.business_stage, profile.business_type, profile.brand_archetype,
+                profile.created_at, _to_json(profile_to_dict(profile))
+            ))
+            strategy_rows.append((profile.id, strategy.strategy_name, _to_json(strategy_to_dict(strategy))))
+
+        # INSERT OR REPLACE 는 기존 행을 지운 뒤 넣으므로 ON DELETE CASCADE 로 성과 요약(account_metrics)까지 지워짐
+        # -> 부모 행은 지우지 않고 갱신
+        with self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO profiles VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       business_stage = excluded.business_stage, business_type = excluded.business_type,
+                       brand_archetype = excluded.brand_archetype, created_at = excluded.created_at,
+                       data = excluded.data""",
+                profile_rows
+            )
+            conn.executemany(
+                """INSERT INTO strategies VALUES (?, ?, ?)
+                   ON CONFLICT(profile_id) DO UPDATE SET
+                       strategy_name = excluded.strategy_name, data = excluded.data""",
+                strategy_rows
+            )
+        return len(profile_rows)
+
+    def get(self, profile_id: str) -> Optional[Tuple[UserProfile, Optional[BrandStrategy]]]:
+        row = self._connect().execute(
+            "SELECT p.data, s.data FROM profiles p LEFT JOIN strategies s ON s.profile_id = p.id WHERE p.id = ?",
+            (profile_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._decode(row)
+
+    def _where(self, business_type: str = None, brand_archetype: str = None) -> Tuple[str, list]:
+        clauses, params = [], []
+        if business_type:
+            clauses.append("p.business_type = ?")
+            params.append(business_type)
+        if brand_archetype:
+            clauses.append("p.brand_archetype = ?")
+            params.append(brand_archetype)
+        return (" AND ".join(clauses) or "1"), params
+
+    def count(self, business_type: str = None, brand_archetype: str = None) -> int:
+        where, params = self._where(business_type, brand_archetype)
+        return self._connect().execute(f"SELECT COUNT(*) FROM profiles p WHERE {where}", params).fetchone()[0]
+
+    def list_page(self, limit: int = 20, cursor: Tuple[str, str] = None, business_type: str = None,
+                  brand_archetype: str = None) -> Tuple[List[Tuple[UserProfile, Optional[BrandStrategy]]], Optional[Tuple[str, str]]]:
+        """최신순 페이지 조회
+
+        OFFSET 대신 (created_at, id) 커서를 사용하므로 뒤쪽 페이지도 인덱스만 따라 읽습니다.
+        반환값의 두 번째 항목을 다음 호출의 cursor 로 넘기면 다음 페이지를 가져오며, 마지막 페이지면 None 입니다.
+        """
+        where, params = self._where(business_type, brand_archetype)
+        if cursor is not None:
+            where += " AND (p.created_at, p.id) < (?, ?)"
+            params.extend(cursor)
+        rows = self._connect().execute(
+            f"""SELECT p.data, s.data, p.created_at, p.id
+                FROM profiles p LEFT JOIN strategies s ON s.profile_id = p.id
+                WHERE {where}
+                ORDER BY p.created_at DESC, p.id DESC
+                LIMIT ?""",
+            params + [limit + 1]
+        ).fetchall()
+        next_cursor = (rows[limit - 1][2], rows[limit - 1][3]) if len(rows) > limit else None
+        return [self._decode(row) for row in rows[:limit]], next_cursor
+
+    def save_account_metrics(self, rows: Iterable[Tuple[str, Dict]]) -> int:
+        """(프로필 ID, 성과 요약) 여러 개를 한 트랜잭션으로 기록 (없는 항목은 NULL)"""
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        values = [
+            (profile_id, updated_at) + tuple(metrics.get(column) for column in ACCOUNT_METRIC_COLUMNS)
+            for profile_id, metrics in rows
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO account_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+        return len(values)
+
+    def _portfolio_where(self, business_type: str = None, strategy_name: str = None,
+                         tier: int = None) -> Tuple[str, list]:
+        where, params = self._where(business_type)
+        if strategy_name:
+            where += " AND s.strategy_name = ?"
+            params.append(strategy_name)
+        if tier is not None:
+            where += " AND m.tier = ?"
+            params.append(tier)
+        return where, params
+
+    def portfolio_summary(self, business_type: str = None, strategy_name: str = None, tier: int = None) -> Dict:
+        """필터에 맞는 전체 고객 집계 (고객 수, 성과 데이터가 있는 고객 수, 평균 달성률/증가율, 총 팔로워)"""
+        where, params = self._portfolio_where(business_type, strategy_name, tier)
+        row = self._connect().execute(
+            f"""SELECT COUNT(*), COUNT(m.profile_id), AVG(m.attainment), AVG(m.follower_growth), SUM(m.followers)
+                FROM {_PORTFOLIO_FROM} WHERE {where}""",
+            params
+        ).fetchone()
+        return dict(zip(("clients", "tracked", "avg_attainment", "avg_growth", "total_followers"), row))
+
+    def portfolio_breakdown(self, business_type: str = None, strategy_name: str = None,
+                            tier: int = None) -> List[Dict]:
+        """전략별 고객 수와 평균 성과 (고객 수 내림차순)"""
+        where, params = self._portfolio_where(business_type, strategy_name, tier)
+        rows = self._connect().execute(
+            f"""SELECT s.strategy_name, COUNT(*), COUNT(m.profile_id), AVG(m.attainment), AVG(m.follower_growth)
+                FROM {_PORTFOLIO_FROM} WHERE {where}
+                GROUP BY s.strategy_name
+                ORDER BY COUNT(*) DESC, s.strategy_name""",
+            params
+        ).fetchall()
+        return [dict(zip(("strategy_name", "clients", "tracked", "avg_attainment", "avg_growth"), row)) for row in rows]
+
+    def portfolio_page(self, limit: int = 25, offset: int = 0, sort: str = "created_at", descending: bool = True,
+                       business_type: str = None, strategy_name: str = None, tier: int = None) -> List[Dict]:
+        """정렬/필터된 고객 목록의 한 페이지 (성과 데이터가 없는 고객은 정렬 방향과 관계없이 뒤쪽)
+
+        요약 열만 읽고 프로필/전략 JSON 은 디코딩하지 않습니다. 정렬 기준이 여러 가지라
+        list_page 의 커서 대신 LIMIT/OFFSET 을 쓰며, 정렬 열마다 인덱스가 있어 1만 명 규모에서도 충분히 빠릅니다.
+        """
+        where, params = self._portfolio_where(business_type, strategy_name, tier)
+        order = f"{PORTFOLIO_SORTS[sort]} {'DESC' if descending else 'ASC'} NULLS LAST, p.id"
+        rows = self._connect().execute(
+            f"""SELECT p.id, p.business_type, p.brand_archetype, p.created_at, s.strategy_name,
+                       m.updated_at, {", ".join(f"m.{column}" for column in ACCOUNT_METRIC_COLUMNS)}
+                FROM {_PORTFOLIO_FROM} WHERE {where}
+                ORDER BY {order}
+                LIMIT ? OFFSET ?""",
+            params + [limit, offset]
+        ).fetchall()
+        columns = ("id", "business_type", "brand_archetype", "created_at", "strategy_name", "metrics_updated_at") \
+            + ACCOUNT_METRIC_COLUMNS
+        return [dict(zip(columns, row)) for row in rows]
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterable[str]:
+        """저장된 모든 프로필 ID (키 순서로 나눠 읽음)"""
+        last = ""
+        while True:
+            rows = self._connect().execute(
+                "SELECT id FROM profiles WHERE id > ? ORDER BY id LIMIT ?", (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield from (row[0] for row in rows)
+            last = rows[-1][0]
+
+    def iter_profiles(self, batch_size: int = 1000) -> Iterable[List[UserProfile]]:
+        """저장된 모든 프로필을 묶음 단위로 (키 순서, 전략 JSON 은 읽지 않음)"""
+        last = ""
+        while True:
+            rows = self._connect().execute(
+                "SELECT id, data FROM profiles WHERE id > ? ORDER BY id LIMIT ?", (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield [profile_from_dict(json.loads(row[1])) for row in rows]
+            last = rows[-1][0]
+
+    def iter_guide_sources(self, profile_ids: Iterable[str] = None, batch_size: int = 500,
+                           business_type: str = None, strategy_name: str = None,
+                           tier: int = None) -> Iterable[List[Tuple[str, str, Optional[str]]]]:
+        """가이드 내보내기용 (ID, 프로필 JSON, 전략 JSON) 묶음 (키 순서, JSON 디코딩은 받는 쪽에서)
+
+        profile_ids 를 주면 해당 고객만(없는 ID 는 빠짐), 아니면 포트폴리오 필터에 맞는 전체 고객을 읽습니다.
+        """
+        columns = f"SELECT p.id, p.data, s.data FROM {_PORTFOLIO_FROM}"
+        if profile_ids is not None:
+            ids = sorted(set(profile_ids))
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                rows = self._connect().execute(
+                    f"{columns} WHERE p.id IN ({', '.join('?' * len(batch))}) ORDER BY p.id", batch
+                ).fetchall()
+                if rows:
+                    yield rows
+            return
+
+        where, params = self._portfolio_where(business_type, strategy_name, tier)
+        last = ""
+        while True:
+            rows = self._connect().execute(
+                f"{columns} WHERE {where} AND p.id > ? ORDER BY p.id LIMIT ?", params + [last, batch_size]
+            ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+
+    def profile_outcomes(self, profile_ids: List[str]) -> Dict[str, Dict]:
+        """프로필 ID -> 요약 열(비즈니스 유형/단계, 아키타입, 받은 전략, 성과 요약) (없는 ID 는 빠짐)"""
+        if not profile_ids:
+            return {}
+        placeholders = ", ".join("?" * len(profile_ids))
+        rows = self._connect().execute(
+            f"""SELECT p.id, p.business_type, p.business_stage, p.brand_archetype, s.strategy_name,
+                       {", ".join(f"m.{column}" for column in ACCOUNT_METRIC_COLUMNS)}
+                FROM {_PORTFOLIO_FROM} WHERE p.id IN ({placeholders})""",
+            list(profile_ids)
+        ).fetchall()
+        columns = ("id", "business_type", "business_stage", "brand_archetype", "strategy_name") + ACCOUNT_METRIC_COLUMNS
+        return {row[0]: dict(zip(columns, row)) for row in rows}
+
+    @staticmethod
+    def _decode(row) -> Tuple[UserProfile, Optional[BrandStrategy]]:
+        profile = profile_from_dict(json.loads(row[0]))
+        strategy = strategy_from_dict(json.loads(row[1])) if row[1] else None
+        return profile, strategy
+
+    def save_drafts(self, items: Iterable[Tuple[str, int, Dict]]) -> int:
+        """설문 초안 (초안 ID, 현재 단계, 응답) 여러 개를 한 트랜잭션으로 기록"""
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        rows = [(draft_id, step, updated_at, _to_json(data)) for draft_id, step, data in items]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO drafts VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def get_draft(self, draft_id: str) -> Optional[Tuple[int, Dict]]:
+        row = self._connect().execute("SELECT step, data FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def delete_draft(self, draft_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM drafts WHERE id = ?", (draft_id,))
+
+    def purge_drafts(self, max_age_days: int = 30) -> int:
+        """max_age_days 일 넘게 수정되지 않은 초안 삭제"""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM drafts WHERE updated_at < ?", (cutoff,)).rowcount
+
+class DraftAutosaver:
+    """설문 초안 자동 저장 (디바운스 + 일괄 기록)
+
+    put() 은 메모리의 대기열만 갱신하고 바로 돌아가므로 리런 비용에 쓰기 시간이 들어가지 않습니다.
+    백그라운드 스레드가 interval 초마다 모든 세션의 대기 중인 초안을 한 트랜잭션으로 기록하며,
+    그 사이 같은 초안이 여러 번 바뀌면 마지막 상태만 한 번 기록됩니다.
+    대기열이 비면 스레드는 종료되고 다음 put() 에서 다시 시작됩니다.
+    flush() 의 기록과 discard() 의 삭제는 _write_lock 으로 순서를 정해, 제출로 지운 초안이
+    그 직전에 대기열에서 꺼낸 기록(또는 실패 후 재시도)으로 되살아나지 않게 합니다.
+    """
+
+    def __init__(self, store: ProfileStore, interval: float = 2.0):
+        self.store = store
+        self.interval = interval
+        self._pending: Dict[str, Tuple[int, Dict]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, draft_id: str, step: int, data: Dict):
+        with self._lock:
+            self._pending[draft_id] = (step, data)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="draft-autosave", daemon=True)
+                self._thread.start()
+
+    def get(self, draft_id: str) -> Optional[Tuple[int, Dict]]:
+        """아직 기록되지 않은 변경까지 반영한 초안"""
+        with self._lock:
+            pending = self._pending.get(draft_id)
+        return pending if pending is not None else self.store.get_draft(draft_id)
+
+    def discard(self, draft_id: str):
+        """제출이 끝난 초안을 대기열과 저장소에서 제거"""
+        with self._write_lock:
+            with self._lock:
+                self._pending.pop(draft_id, None)
+            self.store.delete_draft(draft_id)
+
+    def flush(self) -> int:
+        """대기 중인 초안을 지금 기록하고 기록한 개수를 반환"""
+        # put() 은 _lock 만 잡으므로 기록 중에도 막히지 않음
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                return self.store.save_drafts((draft_id, step, data) for draft_id, (step, data) in pending.items())
+            except sqlite3.Error:
+                # 기록하지 못한 초안은 그 사이 더 새로운 값이 들어오지 않았다면 다음 주기에 다시 시도
+                with self._lock:
+                    for draft_id, item in pending.items():
+                        self._pending.setdefault(draft_id, item)
+                return 0
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    break
+        # 이 스레드용으로 열린 연결 정리
+        self.store.close()
@@ -0,0 +1,153 @@
+"""리런 구간 타이밍 계측 (프로세스 전역 히스토그램)
+
+BRANDING_TELEMETRY=1 일 때만 켜집니다. 꺼져 있으면
+- timed() 데코레이터는 함수를 그대로 돌려주고
+- span() 은 미리 만들어 둔 빈 컨텍스트 매니저를 돌려주므로
+계측 지점의 추가 비용은 함수 호출 한 번 수준입니다 (benchmarks/bench_telemetry.py).
+
+구간별 소요 시간은 로그 간격 버킷(2^(1/8) 배, 약 9%)의 히스토그램에 누적하고,
+p50/p95/p99 는 버킷 경계로부터 추정합니다. 측정값 개수와 무관하게 구간당 메모리는 고정입니다.
+
+    with span("chart.followers"):
+        fig = px.line(...)
+
+    @timed("page.show_home")
+    def show_home(): ...
+"""
+import bisect
+import functools
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List
+
+ENABLED = os.environ.get("BRANDING_TELEMETRY", "").lower() in ("1", "true", "yes", "on")
+DEFAULT_METRICS_PATH = os.environ.get("BRANDING_TELEMETRY_FILE", "telemetry.prom")
+
+# 버킷 상한값 (초): 0.1µs ~ 약 107초
+BUCKET_BOUNDS = tuple(1e-7 * 2 ** (i / 8) for i in range(8 * 30 + 1))
+QUANTILES = (0.5, 0.95, 0.99)
+
+_DISABLED_SPAN = nullcontext()
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """q 분위수 추정값 (해당 버킷 안에서 선형 보간, 최댓값을 넘지 않음)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKET_BOUNDS[i - 1] if i > 0 else 0.0
+                upper = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+class Registry:
+    """구간 이름별 히스토그램 (세션/스레드 간 공유)"""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> List[Dict]:
+        """구간별 요약 (ms 단위, 총 소요 시간 내림차순)"""
+        with self._lock:
+            rows = [
+                {
+                    "span": name,
+                    "count": h.count,
+                    "total_ms": h.total * 1000,
+                    "mean_ms": h.total / h.count * 1000,
+                    **{f"p{round(q * 100)}_ms": h.quantile(q) * 1000 for q in QUANTILES},
+                    "max_ms": h.max * 1000
+                }
+                for name, h in self._histograms.items() if h.count
+            ]
+        return sorted(rows, key=lambda row: -row["total_ms"])
+
+    def export_text(self) -> str:
+        """Prometheus 텍스트 형식의 요약(summary) 지표"""
+        lines = [
+            "# HELP branding_span_seconds Streamlit rerun span durations",
+            "# TYPE branding_span_seconds summary"
+        ]
+        for row in sorted(self.snapshot(), key=lambda row: row["span"]):
+            label = row["span"].replace("\\", "\\\\").replace('"', '\\"')
+            for q in QUANTILES:
+                lines.append(f'branding_span_seconds{{span="{label}",quantile="{q}"}} {row[f"p{round(q * 100)}_ms"] / 1000:.6f}')
+            lines.append(f'branding_span_seconds_sum{{span="{label}"}} {row["total_ms"] / 1000:.6f}')
+            lines.append(f'branding_span_seconds_count{{span="{label}"}} {row["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path: str = DEFAULT_METRICS_PATH) -> str:
+        """지표 텍스트를 파일로 기록 (수집기가 반쯤 쓴 파일을 읽지 않도록 원자적 교체)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.export_text())
+        os.replace(tmp_path, path)
+        return path
+
+REGISTRY = Registry()
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+def span(name: str):
+    """이름 붙은 계측 구간 (with 문). 꺼져 있으면 아무 일도 하지 않음"""
+    return _Span(name) if ENABLED else _DISABLED_SPAN
+
+def timed(name: str):
+    """함수 전체를 계측하는 데코레이터. 꺼져 있으면 원래 함수를 그대로 반환"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator